@@ -0,0 +1,169 @@
+from __future__ import annotations
+
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from pathlib import Path
+from typing import Callable, Dict, List, Optional
+
+from framework.core.session_cache import AuthSessionCache
+from framework.utils.excel_loader import load_excel_sheets_kv
+from framework.utils.locator_loader import load_locators
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+
+def resolve_config_paths(cfg: dict) -> dict:
+    """Author: taobo.zhou
+    将配置中 paths 下的相对路径转换为基于项目根目录的绝对路径。
+    
+        cfg: 配置字典。
+    """
+
+    project_root = Path(cfg.get("_project_root", "."))
+    if "paths" in cfg and isinstance(cfg["paths"], dict):
+        for k, v in list(cfg["paths"].items()):
+            if isinstance(v, str) and v and not Path(v).is_absolute():
+                cfg["paths"][k] = str((project_root / v).resolve())
+    return cfg
+
+
+class SessionBootstrap:
+    """Author: taobo.zhou
+    会话启动引导，在后台线程并行执行浏览器启动、Excel 加载、定位器编译与 PingID 预热，fixture 只等待结果。
+    Session bootstrap that overlaps browser launch, workbook load, locator compilation and PingID warm-up.
+    """
+
+    def __init__(self, cfg: dict, sheet_names: Optional[List[str]] = None):
+        """Author: taobo.zhou
+        初始化启动引导。
+        
+            cfg: 已解析路径的配置字典。
+            sheet_names: 需要预加载的 sheet，为空表示全部。
+        """
+
+        self.config = cfg
+        self._sheet_names = sheet_names
+        self._executor = ThreadPoolExecutor(max_workers=4, thread_name_prefix="pw-boot")
+        self._futures: Dict[str, Future] = {}
+        self._durations: Dict[str, float] = {}
+        self._finished: Dict[str, float] = {}
+        self._lock = threading.Lock()
+        self._started = time.perf_counter()
+
+    def _submit(self, name: str, fn: Callable[[], object]) -> None:
+        """Author: taobo.zhou
+        提交后台任务并记录耗时。
+        
+            name: 任务名称。
+            fn: 任务函数。
+        """
+
+        def run():
+            """Author: taobo.zhou
+            执行任务并记录耗时。
+             无。
+            """
+
+            started = time.perf_counter()
+            try:
+                return fn()
+            finally:
+                with self._lock:
+                    self._durations[name] = time.perf_counter() - started
+                    self._finished[name] = time.perf_counter() - self._started
+
+        self._futures[name] = self._executor.submit(run)
+
+    def start(self, driver_pool=None, warm_pingid: bool = False) -> "SessionBootstrap":
+        """Author: taobo.zhou
+        启动后台任务。
+        
+            driver_pool: 驱动池，不为空时预先启动一个浏览器。
+            warm_pingid: 是否预先启动 PingID。
+        """
+
+        paths = self.config.get("paths", {}) or {}
+        self._submit("locators", lambda: load_locators(paths["locator"]))
+        self._submit("excel", lambda: load_excel_sheets_kv(paths["data"], self._sheet_names))
+        if driver_pool is not None:
+            self._submit("driver", lambda: self._prewarm_driver(driver_pool))
+        if warm_pingid:
+            self._submit("pingid", self._warm_pingid)
+        return self
+
+    @staticmethod
+    def _prewarm_driver(driver_pool) -> None:
+        """Author: taobo.zhou
+        池中还没有浏览器时预先创建一个（常驻 worker 复用的浏览器不重复借还）。
+        
+            driver_pool: 驱动池。
+        """
+
+        if driver_pool.stats()["created"] == 0:
+            driver_pool.prewarm(1)
+
+    def _warm_pingid(self) -> bool:
+        """Author: taobo.zhou
+        预先启动 PingID；本会话所有 sheet 的登录态缓存均有效时跳过，返回是否执行了预热。
+         无。
+        """
+
+        from framework.pingid_reader import PingIDOtpManager
+
+        sheets = self.wait("excel")
+        cache = AuthSessionCache.from_config(self.config)
+        urls = (self.config.get("project", {}) or {}).get("urls") or {}
+        if cache is not None and sheets:
+            cached = all(
+                cache.load(urls.get(sheet, ""), str(data.get("login.username", ""))) is not None
+                for sheet, data in sheets.items()
+            )
+            if cached:
+                log.info("[PW][BOOT] login sessions cached, skip PingID warm-up")
+                return False
+        PingIDOtpManager.get().warm_up()
+        return True
+
+    def wait(self, name: str, timeout: Optional[float] = None):
+        """Author: taobo.zhou
+        等待后台任务完成并返回结果，任务失败时抛出原异常，任务不存在时返回 None。
+        
+            name: 任务名称。
+            timeout: 最长等待时间（秒）。
+        """
+
+        future = self._futures.get(name)
+        if future is None:
+            return None
+        if not future.done():
+            started = time.perf_counter()
+            result = future.result(timeout)
+            log.info("[PW][BOOT] waited %s %.2fs", name, time.perf_counter() - started)
+            return result
+        return future.result()
+
+    def summary(self) -> dict:
+        """Author: taobo.zhou
+        返回各任务耗时，以及从启动到最后一个任务完成的耗时 ready（秒）。
+         无。
+        """
+
+        with self._lock:
+            summary = {name: round(seconds, 3) for name, seconds in self._durations.items()}
+            summary["ready"] = round(max(self._finished.values(), default=0.0), 3)
+        return summary
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        等待后台任务结束并输出耗时，未被 fixture 取用的任务失败只记录日志。
+         无。
+        """
+
+        self._executor.shutdown(wait=True)
+        for name, future in self._futures.items():
+            exc = future.exception()
+            if exc is not None:
+                log.warning("[PW][BOOT] %s failed: %s", name, exc)
+        log.info("[PW][BOOT] %s", " ".join(f"{k}={v:.2f}s" for k, v in self.summary().items()))
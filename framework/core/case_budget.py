@@ -0,0 +1,196 @@
+from __future__ import annotations
+
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from typing import Dict, Optional
+
+from selenium.common.exceptions import TimeoutException
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_CURRENT_BUDGET: ContextVar[Optional["CaseBudget"]] = ContextVar("CURRENT_BUDGET", default=None)
+
+
+class CaseBudgetExceeded(TimeoutError):
+    """Author: taobo.zhou
+    用例时间预算耗尽。
+    Raised when a case has used up its time budget.
+    """
+
+
+class CaseBudget:
+    """Author: taobo.zhou
+    用例级时间预算，各等待步骤的超时取自身超时与剩余预算的较小值，并记录每个步骤消耗的预算。
+    Case-level deadline budget clamping every wait and recording how much budget each step used.
+    """
+
+    def __init__(self, seconds: float, name: str = "-"):
+        """Author: taobo.zhou
+        初始化预算并开始计时。
+        
+            seconds: 预算（秒）。
+            name: 用例名称，用于日志。
+        """
+
+        self.seconds = float(seconds)
+        self.name = name
+        self._started = time.time()
+        self._steps: Dict[str, list] = {}
+        self._depth = 0
+
+    @classmethod
+    def from_config(cls, cfg: dict, sheet_name: str, name: str = "-") -> Optional["CaseBudget"]:
+        """Author: taobo.zhou
+        按配置（runner.case_budget）创建预算，sheets 中的值优先于 default，未开启或 <=0 时返回 None。
+        
+            cls: 类对象。
+            cfg: 配置字典。
+            sheet_name: sheet 名称。
+            name: 用例名称，用于日志。
+        """
+
+        budget_cfg = (cfg.get("runner", {}) or {}).get("case_budget", {}) or {}
+        if not budget_cfg.get("enable", False):
+            return None
+        seconds = (budget_cfg.get("sheets", {}) or {}).get(sheet_name, budget_cfg.get("default", 0))
+        if not seconds or float(seconds) <= 0:
+            return None
+        return cls(float(seconds), name)
+
+    def elapsed(self) -> float:
+        """Author: taobo.zhou
+        返回已使用的时间（秒）。
+         无。
+        """
+
+        return time.time() - self._started
+
+    def remaining(self) -> float:
+        """Author: taobo.zhou
+        返回剩余预算（秒），不小于 0。
+         无。
+        """
+
+        return max(0.0, self.seconds - self.elapsed())
+
+    def clamp(self, timeout: float, step: str = "-") -> float:
+        """Author: taobo.zhou
+        返回 min(timeout, 剩余预算)，预算已耗尽时抛出 CaseBudgetExceeded。
+        
+            timeout: 步骤自身的超时（秒）。
+            step: 步骤名称。
+        """
+
+        remaining = self.remaining()
+        if remaining <= 0:
+            raise CaseBudgetExceeded(f"case budget {self.seconds:.0f}s exhausted before {step}")
+        return min(float(timeout), remaining)
+
+    @contextmanager
+    def step(self, step: str, timeout: float):
+        """Author: taobo.zhou
+        执行一个受预算约束的步骤，返回截断后的超时并记录耗时。超时因预算被截断且步骤结束时预算已耗尽，
+        无论等待抛出 TimeoutException 还是返回 False/None，都抛出 CaseBudgetExceeded。
+        预算按用例在单个线程内使用，嵌套步骤只截断超时不单独记录。
+        
+            step: 步骤名称。
+            timeout: 步骤自身的超时（秒）。
+        """
+
+        clamped = self.clamp(timeout, step)
+        if self._depth:
+            # 嵌套步骤（例如 wait_for_element_disabled_to_be_removed 内部的等待）只截断超时，耗时记在外层步骤
+            yield clamped
+            self._raise_if_exhausted(step, timeout, clamped)
+            return
+        started = time.time()
+        self._depth += 1
+        try:
+            yield clamped
+        except TimeoutException as exc:
+            self._raise_if_exhausted(step, timeout, clamped, exc)
+            raise
+        finally:
+            self._depth -= 1
+            entry = self._steps.setdefault(step, [0, 0.0, False])
+            entry[0] += 1
+            entry[1] += time.time() - started
+            if clamped < float(timeout):
+                entry[2] = True
+                log.warning("[PW][BUDGET] %s timeout %ss cut to %.1fs (case %s)", step, timeout, clamped, self.name)
+        self._raise_if_exhausted(step, timeout, clamped)
+
+    def _raise_if_exhausted(self, step: str, timeout: float, clamped: float, cause: Optional[BaseException] = None) -> None:
+        """Author: taobo.zhou
+        步骤超时被预算截断且预算已耗尽时抛出 CaseBudgetExceeded。
+        
+            step: 步骤名称。
+            timeout: 步骤自身的超时（秒）。
+            clamped: 截断后的超时（秒）。
+            cause: 原始异常，可为空。
+        """
+
+        if clamped < float(timeout) and self.remaining() <= 0:
+            raise CaseBudgetExceeded(
+                f"case budget {self.seconds:.0f}s exhausted in {step} (timeout {timeout}s cut to {clamped:.1f}s)"
+            ) from cause
+
+    def summary(self) -> dict:
+        """Author: taobo.zhou
+        返回预算、已用时间与各步骤的次数、耗时、占预算比例及是否被截断。
+         无。
+        """
+
+        return {
+            "budget": self.seconds,
+            "used": round(self.elapsed(), 3),
+            "steps": [
+                {
+                    "step": step,
+                    "count": count,
+                    "seconds": round(seconds, 3),
+                    "percent": round(seconds / self.seconds * 100, 1),
+                    "clamped": clamped,
+                }
+                for step, (count, seconds, clamped) in self._steps.items()
+            ],
+        }
+
+
+def current_budget() -> Optional[CaseBudget]:
+    """Author: taobo.zhou
+    返回当前用例的时间预算，未设置时返回 None。
+     无。
+    """
+
+    return _CURRENT_BUDGET.get()
+
+
+def set_current_budget(budget: Optional[CaseBudget]) -> None:
+    """Author: taobo.zhou
+    设置当前用例的时间预算。
+    
+        budget: 时间预算，None 表示清除。
+    """
+
+    _CURRENT_BUDGET.set(budget)
+
+
+@contextmanager
+def budgeted(step: str, timeout: float):
+    """Author: taobo.zhou
+    在当前用例预算下执行步骤并返回实际可用的超时，没有预算时原样返回 timeout。
+    
+        step: 步骤名称。
+        timeout: 步骤自身的超时（秒）。
+    """
+
+    budget = current_budget()
+    if budget is None:
+        yield timeout
+        return
+    with budget.step(step, timeout) as clamped:
+        yield clamped
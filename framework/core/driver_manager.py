@@ -1,37 +1,246 @@
+import threading
+from contextlib import contextmanager
+
+from framework.driver.command_profiler import CommandProfiler
 from framework.driver.driver_factory import create_driver
+from framework.driver.driver_pool import DriverPool
+from framework.driver.health_monitor import DriverHealthMonitor
+from framework.driver.session_reset import driver_memory_mb, reset_session
+from framework.utils.config_loader import load_config
 
 
 class DriverManager:
     """Author: taobo.zhou
-    驱动管理器，统一创建与释放浏览器驱动。
-    Driver manager that creates and disposes browser drivers.
+    驱动管理器，统一创建与释放浏览器驱动，底层使用线程安全的驱动池。
+    Driver manager that creates and disposes browser drivers through a thread-safe pool.
     """
 
     _driver = None
+    _pool = None
+    _monitor = None
+    _lock = threading.Lock()
+    _monitor_lock = threading.Lock()
+
+    @classmethod
+    def _build_pool(cls, size=None, acquire_timeout=None, factory=None):
+        """Author: taobo.zhou
+        按参数或配置（selenium.pool_size / selenium.pool_acquire_timeout）创建驱动池。
+        
+            cls: 类对象。
+            size: 池容量，为空时读取配置。
+            acquire_timeout: 借出驱动的默认最长等待时间（秒），为空时读取配置。
+            factory: 创建 WebDriver 的回调，为空时使用 create_driver。
+        """
+
+        selenium_cfg = load_config().get("selenium", {}) or {}
+        if size is None:
+            size = selenium_cfg.get("pool_size", 1)
+        if acquire_timeout is None:
+            acquire_timeout = selenium_cfg.get("pool_acquire_timeout")
+        reuse_cfg = selenium_cfg.get("reuse", {}) or {}
+        reuse = bool(reuse_cfg.get("enable", False))
+        reset_timeout = float(reuse_cfg.get("reset_timeout", 5))
+        factory = factory or create_driver
+        if cls.profiler_enabled():
+            factory = cls._profiled_factory(factory)
+        monitor = cls.health_monitor()
+        if monitor is not None:
+            factory = cls._monitored_factory(factory, monitor)
+        return DriverPool(
+            factory=factory,
+            size=int(size),
+            acquire_timeout=float(acquire_timeout) if acquire_timeout is not None else None,
+            reset=(lambda driver: reset_session(driver, reset_timeout)) if reuse else None,
+            max_uses=int(reuse_cfg.get("recycle_after_cases", 0)) if reuse else 0,
+            max_memory_mb=float(reuse_cfg.get("max_memory_mb", 0)) if reuse else 0,
+            memory_probe=driver_memory_mb,
+            health=monitor.recycle_reason if monitor is not None else None,
+            on_evict=monitor.unwatch if monitor is not None else None,
+        )
+
+    @staticmethod
+    def _profiled_factory(factory):
+        """Author: taobo.zhou
+        包装驱动创建回调，为新建的驱动安装命令耗时统计。
+        
+            factory: 创建 WebDriver 的回调。
+        """
+
+        def create():
+            """Author: taobo.zhou
+            创建驱动并安装命令耗时统计。
+             无。
+            """
+
+            return CommandProfiler.get().install(factory())
+
+        return create
+
+    @staticmethod
+    def _monitored_factory(factory, monitor):
+        """Author: taobo.zhou
+        包装驱动创建回调，将新建的驱动加入健康监控。
+        
+            factory: 创建 WebDriver 的回调。
+            monitor: 驱动健康监控。
+        """
+
+        def create():
+            """Author: taobo.zhou
+            创建驱动并加入健康监控。
+             无。
+            """
+
+            return monitor.watch(factory())
+
+        return create
+
+    @classmethod
+    def health_monitor(cls):
+        """Author: taobo.zhou
+        获取驱动健康监控，配置未开启（selenium.health_monitor.enable）时返回 None。
+        
+            cls: 类对象。
+        """
+
+        selenium_cfg = load_config().get("selenium", {}) or {}
+        monitor_cfg = selenium_cfg.get("health_monitor", {}) or {}
+        if not monitor_cfg.get("enable", False):
+            return None
+        with cls._monitor_lock:
+            if cls._monitor is None:
+                cls._monitor = DriverHealthMonitor(
+                    interval=float(monitor_cfg.get("interval", 5)),
+                    max_rss_mb=float(monitor_cfg.get("max_rss_mb", 0)),
+                    max_cpu_percent=float(monitor_cfg.get("max_cpu_percent", 0)),
+                    cpu_sustain_samples=int(monitor_cfg.get("cpu_sustain_samples", 6)),
+                    max_latency_ms=float(monitor_cfg.get("max_latency_ms", 0)),
+                    latency_window=int(monitor_cfg.get("latency_window", 50)),
+                )
+            return cls._monitor
+
+    @classmethod
+    def profiler_enabled(cls):
+        """Author: taobo.zhou
+        返回配置中是否开启 WebDriver 命令耗时统计（selenium.command_profiler.enable）。
+        
+            cls: 类对象。
+        """
+
+        selenium_cfg = load_config().get("selenium", {}) or {}
+        return bool((selenium_cfg.get("command_profiler", {}) or {}).get("enable", False))
+
+    @classmethod
+    def reuse_enabled(cls):
+        """Author: taobo.zhou
+        返回配置中是否开启浏览器复用模式（selenium.reuse.enable）。
+        
+            cls: 类对象。
+        """
+
+        selenium_cfg = load_config().get("selenium", {}) or {}
+        return bool((selenium_cfg.get("reuse", {}) or {}).get("enable", False))
+
+    @classmethod
+    def configure(cls, size=None, acquire_timeout=None, factory=None):
+        """Author: taobo.zhou
+        重建驱动池，旧池中的驱动全部退出。
+        
+            cls: 类对象。
+            size: 池容量，为空时读取配置。
+            acquire_timeout: 借出驱动的默认最长等待时间（秒），为空时读取配置。
+            factory: 创建 WebDriver 的回调，为空时使用 create_driver。
+        """
+
+        pool = cls._build_pool(size, acquire_timeout, factory)
+        with cls._lock:
+            old, cls._pool, cls._driver = cls._pool, pool, None
+        if old is not None:
+            old.close()
+        return pool
+
+    @classmethod
+    def pool(cls):
+        """Author: taobo.zhou
+        获取驱动池，不存在则按配置创建。
+        
+            cls: 类对象。
+        """
+
+        with cls._lock:
+            if cls._pool is None:
+                cls._pool = cls._build_pool()
+            return cls._pool
+
+    @classmethod
+    def acquire(cls, timeout=None):
+        """Author: taobo.zhou
+        从驱动池借出一个可用驱动。
+        
+            cls: 类对象。
+            timeout: 最长等待时间（秒），为空时使用池的默认值。
+        """
+
+        return cls.pool().acquire(timeout)
+
+    @classmethod
+    def release(cls, driver, broken=False):
+        """Author: taobo.zhou
+        将驱动归还驱动池。
+        
+            cls: 类对象。
+            driver: WebDriver 实例。
+            broken: 驱动是否已不可用，为 True 时直接淘汰。
+        """
+
+        if driver is cls._driver:
+            cls._driver = None
+        cls.pool().release(driver, broken=broken)
+
+    @classmethod
+    @contextmanager
+    def lease(cls, timeout=None):
+        """Author: taobo.zhou
+        以上下文管理器方式借出驱动，退出时自动归还。
+        
+            cls: 类对象。
+            timeout: 最长等待时间（秒），为空时使用池的默认值。
+        """
+
+        driver = cls.acquire(timeout)
+        try:
+            yield driver
+        finally:
+            cls.release(driver)
 
     @classmethod
     def get_driver(cls):
         """Author: taobo.zhou
-        获取单例 WebDriver 实例，不存在则创建。
+        兼容旧接口，获取进程内共享的默认驱动，不存在则从驱动池借出。
         
             cls: 类对象。
         """
 
         if cls._driver is None:
-            cls._driver = create_driver()
+            cls._driver = cls.acquire()
         return cls._driver
 
     @classmethod
     def quit(cls):
         """Author: taobo.zhou
-        关闭并清理 WebDriver 实例。
+        关闭驱动池、退出所有 WebDriver 实例并停止健康监控。
         
             cls: 类对象。
         """
 
-        if cls._driver:
-            cls._driver.quit()
-            cls._driver = None
+        with cls._lock:
+            pool, cls._pool, cls._driver = cls._pool, None, None
+        if pool is not None:
+            pool.close()
+        with cls._monitor_lock:
+            monitor, cls._monitor = cls._monitor, None
+        if monitor is not None:
+            monitor.close()
 
     @classmethod
     def quit_driver(cls):
@@ -0,0 +1,236 @@
+from __future__ import annotations
+
+import hashlib
+import json
+import os
+import time
+from contextlib import contextmanager
+from pathlib import Path
+from typing import Optional
+from urllib.parse import urlsplit
+
+from framework.utils.file_lock import file_lock
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_DUMP_STORAGE_JS = """
+function dump(s) { var o = {}; if (!s) return o; for (var i = 0; i < s.length; i++) { var k = s.key(i); o[k] = s.getItem(k); } return o; }
+return {local: dump(window.localStorage), session: dump(window.sessionStorage)};
+"""
+
+_LOAD_STORAGE_JS = """
+var data = arguments[0] || {};
+var local = data.local || {}, session = data.session || {};
+Object.keys(local).forEach(function (k) { window.localStorage.setItem(k, local[k]); });
+Object.keys(session).forEach(function (k) { window.sessionStorage.setItem(k, session[k]); });
+return true;
+"""
+
+_CDP_COOKIE_KEYS = ("name", "value", "domain", "path", "secure", "httpOnly", "sameSite", "expires")
+
+
+def _default_cache_dir() -> Path:
+    """Author: taobo.zhou
+    返回当前用户目录下的缓存目录：Windows 为 %LOCALAPPDATA%\\robot_test\\session_cache（默认 ACL 仅本人、SYSTEM 与管理员可访问），
+    其他平台为 ~/.cache/robot_test/session_cache。
+     无。
+    """
+
+    if os.name == "nt":
+        base = Path(os.environ.get("LOCALAPPDATA") or Path.home() / "AppData" / "Local")
+    else:
+        base = Path(os.environ.get("XDG_CACHE_HOME") or Path.home() / ".cache")
+    return base / "robot_test" / "session_cache"
+
+
+def _origin(url: str) -> str:
+    """Author: taobo.zhou
+    返回 URL 的源（scheme://host[:port]）。
+    
+        url: 页面地址。
+    """
+
+    parts = urlsplit(url)
+    return f"{parts.scheme}://{parts.netloc}"
+
+
+class AuthSessionCache:
+    """Author: taobo.zhou
+    登录态缓存，登录成功后保存 cookie 与存储，按基础 URL 与用户名复用，跨用例、跨 worker 跳过重复登录与 PingID。
+    Authenticated-session cache keyed by base URL and username, shared across cases and workers.
+    """
+
+    def __init__(self, cache_dir: Path, ttl_seconds: float = 1800, probe_timeout: float = 20):
+        """Author: taobo.zhou
+        初始化登录态缓存。
+        
+            cache_dir: 缓存目录。
+            ttl_seconds: 缓存有效期（秒）。
+            probe_timeout: 注入缓存后等待已登录标志出现的最长时间（秒）。
+        """
+
+        self._dir = Path(cache_dir)
+        self._ttl = float(ttl_seconds)
+        self.probe_timeout = float(probe_timeout)
+
+    @classmethod
+    def from_config(cls, cfg: dict) -> Optional["AuthSessionCache"]:
+        """Author: taobo.zhou
+        按配置 session_cache 创建缓存，未开启时返回 None。
+        
+            cls: 类对象。
+            cfg: 配置字典。
+        """
+
+        cache_cfg = cfg.get("session_cache", {}) or {}
+        if not cache_cfg.get("enable", False):
+            return None
+        cache_dir = Path(cache_cfg["dir"]) if cache_cfg.get("dir") else _default_cache_dir()
+        if not cache_dir.is_absolute():
+            cache_dir = Path(cfg.get("_project_root", ".")) / cache_dir
+        return cls(
+            cache_dir,
+            ttl_seconds=float(cache_cfg.get("ttl_seconds", 1800)),
+            probe_timeout=float(cache_cfg.get("probe_timeout", 20)),
+        )
+
+    def _path(self, base_url: str, username: str) -> Path:
+        """Author: taobo.zhou
+        返回缓存文件路径。
+        
+            base_url: 基础 URL。
+            username: 登录用户名。
+        """
+
+        key = hashlib.sha1(f"{_origin(base_url)}\n{username}".encode("utf-8")).hexdigest()[:16]
+        return self._dir / f"{key}.json"
+
+    @contextmanager
+    def login_lock(self, base_url: str, username: str):
+        """Author: taobo.zhou
+        同一基础 URL 与用户名的跨进程登录锁，保证只有一个 worker 执行完整登录。
+        
+            base_url: 基础 URL。
+            username: 登录用户名。
+        """
+
+        with file_lock(self._path(base_url, username).with_suffix(".lock")):
+            yield
+
+    def load(self, base_url: str, username: str) -> Optional[dict]:
+        """Author: taobo.zhou
+        读取未过期的缓存条目，不存在或已过期时返回 None。
+        
+            base_url: 基础 URL。
+            username: 登录用户名。
+        """
+
+        path = self._path(base_url, username)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                entry = json.load(f)
+        except Exception as exc:
+            log.warning("[PW][SESSION] bad cache %s: %s", path, exc)
+            return None
+        age = time.time() - float(entry.get("saved_at", 0))
+        if age > self._ttl:
+            log.info("[PW][SESSION] cache expired age=%.0fs user=%s", age, username)
+            return None
+        return entry
+
+    def invalidate(self, base_url: str, username: str) -> None:
+        """Author: taobo.zhou
+        删除缓存条目（例如探测发现会话已失效）。
+        
+            base_url: 基础 URL。
+            username: 登录用户名。
+        """
+
+        try:
+            self._path(base_url, username).unlink()
+        except FileNotFoundError:
+            pass
+
+    def save(self, driver, base_url: str, username: str) -> None:
+        """Author: taobo.zhou
+        保存当前浏览器的 cookie 与当前源的 localStorage/sessionStorage。
+        
+            driver: WebDriver 实例。
+            base_url: 基础 URL。
+            username: 登录用户名。
+        """
+
+        cookie_format = "webdriver"
+        cookies = None
+        if hasattr(driver, "execute_cdp_cmd"):
+            try:
+                cookies = driver.execute_cdp_cmd("Network.getAllCookies", {}).get("cookies", [])
+                cookie_format = "cdp"
+            except Exception as exc:
+                log.debug("[PW][SESSION] cdp getAllCookies failed, fallback: %s", exc)
+        if cookies is None:
+            cookies = driver.get_cookies()
+
+        storage = {}
+        if _origin(driver.current_url or "") == _origin(base_url):
+            try:
+                storage = driver.execute_script(_DUMP_STORAGE_JS) or {}
+            except Exception as exc:
+                log.warning("[PW][SESSION] dump storage failed: %s", exc)
+
+        entry = {
+            "saved_at": time.time(),
+            "origin": _origin(base_url),
+            "username": username,
+            "cookie_format": cookie_format,
+            "cookies": cookies,
+            "storage": storage,
+        }
+        path = self._path(base_url, username)
+        path.parent.mkdir(mode=0o700, parents=True, exist_ok=True)
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        # POSIX 上创建时即为 600；Windows 忽略 mode，访问控制依赖所在目录（用户目录）继承的 ACL
+        fd = os.open(tmp_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        with os.fdopen(fd, "w", encoding="utf-8") as f:
+            json.dump(entry, f, ensure_ascii=False)
+        os.replace(tmp_path, path)
+        log.info("[PW][SESSION] saved session user=%s cookies=%s -> %s", username, len(cookies), path)
+
+    def restore(self, driver, base_url: str, username: str) -> bool:
+        """Author: taobo.zhou
+        注入缓存的 cookie 与存储并打开基础 URL，缓存不存在或已过期时返回 False。
+        
+            driver: WebDriver 实例。
+            base_url: 基础 URL。
+            username: 登录用户名。
+        """
+
+        entry = self.load(base_url, username)
+        if entry is None:
+            return False
+
+        cookies = entry.get("cookies") or []
+        if entry.get("cookie_format") == "cdp" and hasattr(driver, "execute_cdp_cmd"):
+            params = []
+            for cookie in cookies:
+                param = {k: cookie[k] for k in _CDP_COOKIE_KEYS if k in cookie}
+                if cookie.get("session") or float(param.get("expires", -1)) < 0:
+                    param.pop("expires", None)
+                params.append(param)
+            driver.execute_cdp_cmd("Network.setCookies", {"cookies": params})
+            driver.get(entry["origin"])
+        else:
+            driver.get(entry["origin"])
+            for cookie in cookies:
+                try:
+                    driver.add_cookie(cookie)
+                except Exception:
+                    continue
+
+        if entry.get("storage"):
+            driver.execute_script(_LOAD_STORAGE_JS, entry["storage"])
+        driver.get(base_url)
+        return True
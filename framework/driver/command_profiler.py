@@ -0,0 +1,229 @@
+from __future__ import annotations
+
+import math
+import os
+import sys
+import threading
+import time
+from collections import defaultdict
+from typing import Dict, List, Optional
+
+import selenium
+
+from framework.utils.config_loader import PROJECT_ROOT
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_SELENIUM_DIR = os.path.dirname(os.path.abspath(selenium.__file__))
+_THIS_FILE = os.path.abspath(__file__)
+# 交互混入与页面基类只是转发，调用位置取其外层的页面对象或用例代码
+_FRAMEWORK_DIRS = tuple(
+    str(PROJECT_ROOT / "framework" / name) for name in ("interactions", "core", "driver")
+)
+_SLOWEST_LIMIT = 5
+_TOP_LIMIT = 10
+
+
+def _percentile(sorted_values: List[float], pct: float) -> float:
+    """Author: taobo.zhou
+    按最近秩法计算百分位数。
+    
+        sorted_values: 已排序的数值列表。
+        pct: 百分位（0-100）。
+    """
+
+    if not sorted_values:
+        return 0.0
+    rank = math.ceil(pct / 100.0 * len(sorted_values))
+    return sorted_values[max(0, min(len(sorted_values), rank) - 1)]
+
+
+def _attribution():
+    """Author: taobo.zhou
+    沿调用栈查找命令的调用位置、页面名与定位器名。
+     无。
+    """
+
+    page = locator = caller = None
+    frame = sys._getframe(2)
+    while frame is not None:
+        filename = os.path.abspath(frame.f_code.co_filename)
+        if filename != _THIS_FILE and not filename.startswith(_SELENIUM_DIR):
+            f_locals = frame.f_locals
+            owner = f_locals.get("self")
+            if page is None and owner is not None and hasattr(owner, "_page_name"):
+                page = owner._page_name or type(owner).__name__
+                name = f_locals.get("name", f_locals.get("locator_name"))
+                locator = name if isinstance(name, str) else None
+            if not filename.startswith(_FRAMEWORK_DIRS):
+                try:
+                    rel = os.path.relpath(filename, PROJECT_ROOT)
+                except ValueError:
+                    rel = filename
+                caller = f"{rel}:{frame.f_lineno} {frame.f_code.co_name}"
+                break
+        frame = frame.f_back
+    return caller, page, locator
+
+
+class CommandProfiler:
+    """Author: taobo.zhou
+    WebDriver 命令耗时统计，按用例记录每类命令的次数、总耗时与 p50/p95，并归属到调用位置、页面与定位器。
+    WebDriver command latency profiler aggregating per-case timings by command, caller, page and locator.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        """Author: taobo.zhou
+        初始化统计状态。
+         无。
+        """
+
+        self._lock = threading.Lock()
+        self._case: Optional[str] = None
+        self._reset()
+
+    @classmethod
+    def get(cls):
+        """Author: taobo.zhou
+        获取进程内单例。
+        
+            cls: 类对象。
+        """
+
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = CommandProfiler()
+            return cls._instance
+
+    def _reset(self) -> None:
+        """Author: taobo.zhou
+        清空当前用例的统计数据。
+         无。
+        """
+
+        self._durations: Dict[str, List[float]] = defaultdict(list)
+        self._targets: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._callers: Dict[str, List[float]] = defaultdict(lambda: [0, 0.0])
+        self._slowest: List[dict] = []
+
+    def install(self, driver):
+        """Author: taobo.zhou
+        替换驱动实例的 execute 方法以记录每条命令耗时（元素命令同样经过 driver.execute），重复调用无副作用。
+        
+            driver: WebDriver 实例。
+        """
+
+        if getattr(driver, "_pw_profiled", False):
+            return driver
+        original = driver.execute
+        profiler = self
+
+        def execute(driver_command, params=None):
+            """Author: taobo.zhou
+            执行命令并记录耗时。
+            
+                driver_command: W3C 命令名称。
+                params: 命令参数。
+            """
+
+            started = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                profiler.record(driver_command, time.perf_counter() - started)
+
+        driver.execute = execute
+        driver._pw_profiled = True
+        return driver
+
+    def begin_case(self, case_id: str) -> None:
+        """Author: taobo.zhou
+        开始统计一个用例。
+        
+            case_id: 用例标识（nodeid）。
+        """
+
+        with self._lock:
+            self._case = case_id
+            self._reset()
+
+    def record(self, command: str, seconds: float) -> None:
+        """Author: taobo.zhou
+        记录一条命令耗时，用例之外（例如预热）的命令不统计。
+        
+            command: W3C 命令名称。
+            seconds: 耗时（秒）。
+        """
+
+        if self._case is None:
+            return
+        caller, page, locator = _attribution()
+        with self._lock:
+            if self._case is None:
+                return
+            self._durations[command].append(seconds)
+            if page is not None:
+                target = self._targets[f"{page}.{locator}" if locator else page]
+                target[0] += 1
+                target[1] += seconds
+            if caller is not None:
+                entry = self._callers[caller]
+                entry[0] += 1
+                entry[1] += seconds
+            if len(self._slowest) < _SLOWEST_LIMIT or seconds > self._slowest[-1]["seconds"]:
+                self._slowest.append({
+                    "command": command,
+                    "seconds": round(seconds, 4),
+                    "caller": caller,
+                    "page": page,
+                    "locator": locator,
+                })
+                self._slowest.sort(key=lambda r: r["seconds"], reverse=True)
+                del self._slowest[_SLOWEST_LIMIT:]
+
+    def end_case(self) -> Optional[dict]:
+        """Author: taobo.zhou
+        结束当前用例并返回汇总：总次数、总耗时、按命令的 count/total/p50/p95/max、耗时最多的定位器与调用位置、最慢的几条命令。
+         无。
+        """
+
+        with self._lock:
+            if self._case is None:
+                return None
+            durations, targets, callers, slowest = self._durations, self._targets, self._callers, self._slowest
+            self._case = None
+            self._reset()
+
+        commands = {}
+        for command, values in durations.items():
+            values.sort()
+            commands[command] = {
+                "count": len(values),
+                "total": round(sum(values), 4),
+                "p50": round(_percentile(values, 50), 4),
+                "p95": round(_percentile(values, 95), 4),
+                "max": round(values[-1], 4),
+            }
+
+        def top(entries):
+            """Author: taobo.zhou
+            返回按总耗时排序的前若干项。
+            
+                entries: 名称到 [次数, 总耗时] 的映射。
+            """
+
+            ranked = sorted(entries.items(), key=lambda kv: kv[1][1], reverse=True)[:_TOP_LIMIT]
+            return [{"name": name, "count": int(v[0]), "total": round(v[1], 4)} for name, v in ranked]
+
+        return {
+            "count": sum(c["count"] for c in commands.values()),
+            "total": round(sum(c["total"] for c in commands.values()), 4),
+            "commands": dict(sorted(commands.items(), key=lambda kv: kv[1]["total"], reverse=True)),
+            "targets": top(targets),
+            "callers": top(callers),
+            "slowest": slowest,
+        }
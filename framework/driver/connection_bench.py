@@ -0,0 +1,220 @@
+from __future__ import annotations
+
+import json
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Optional
+
+from selenium.webdriver.remote.client_config import ClientConfig
+from selenium.webdriver.remote.remote_connection import RemoteConnection
+
+from framework.driver.command_profiler import _percentile
+from framework.driver.remote_connection import connection_settings, tune_connection
+
+_FAKE_SESSION = "pw-bench"
+
+
+class _FakeW3CHandler(BaseHTTPRequestHandler):
+    """Author: taobo.zhou
+    本地假 W3C 端点，任何命令都立即返回空值，只用于测量命令通道本身的开销。
+    Local fake W3C endpoint answering every command immediately, used to measure channel overhead only.
+    """
+
+    protocol_version = "HTTP/1.1"
+    # 与 chromedriver 一样关闭 Nagle，否则响应头与响应体分两次写出时会撞上客户端的延迟确认（约 40ms）
+    disable_nagle_algorithm = True
+
+    def setup(self) -> None:
+        """Author: taobo.zhou
+        统计新建的 TCP 连接。
+         无。
+        """
+
+        self.server.pw_owner.count_connection()
+        super().setup()
+
+    def _reply(self) -> None:
+        """Author: taobo.zhou
+        读取请求体并返回 {"value": null}。
+         无。
+        """
+
+        length = int(self.headers.get("Content-Length") or 0)
+        if length:
+            self.rfile.read(length)
+        body = json.dumps({"value": None}).encode("utf-8")
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json; charset=utf-8")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    do_GET = do_POST = do_DELETE = _reply
+
+    def log_message(self, format, *args) -> None:
+        """Author: taobo.zhou
+        关闭访问日志。
+        
+            format: 日志格式。
+            args: 日志参数。
+        """
+
+
+class FakeW3CServer:
+    """Author: taobo.zhou
+    在后台线程运行的假 W3C 端点，记录建立的 TCP 连接数。
+    Fake W3C endpoint served from a background thread, counting accepted TCP connections.
+    """
+
+    def __init__(self):
+        """Author: taobo.zhou
+        在 127.0.0.1 的随机端口上启动服务。
+         无。
+        """
+
+        self.connections = 0
+        self._lock = threading.Lock()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", 0), _FakeW3CHandler)
+        self._httpd.pw_owner = self
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self._thread = threading.Thread(target=self._httpd.serve_forever, name="pw-fake-w3c", daemon=True)
+        self._thread.start()
+
+    def count_connection(self) -> None:
+        """Author: taobo.zhou
+        新建连接计数加一。
+         无。
+        """
+
+        with self._lock:
+            self.connections += 1
+
+    @property
+    def url(self) -> str:
+        """Author: taobo.zhou
+        返回与驱动服务相同形式（localhost）的地址。
+         无。
+        """
+
+        return f"http://localhost:{self.port}"
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        停止服务。
+         无。
+        """
+
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+
+def _measure(executor, session_id: str, requests: int, threads: int) -> List[float]:
+    """Author: taobo.zhou
+    从多个线程发送轻量命令（getTitle），返回每条命令的往返耗时（秒）。
+    
+        executor: RemoteConnection 实例。
+        session_id: 会话 ID。
+        requests: 命令总数。
+        threads: 并发线程数。
+    """
+
+    def run(count: int) -> List[float]:
+        """Author: taobo.zhou
+        顺序发送若干条命令。
+        
+            count: 命令数。
+        """
+
+        durations = []
+        for _ in range(count):
+            started = time.perf_counter()
+            executor.execute("getTitle", {"sessionId": session_id})
+            durations.append(time.perf_counter() - started)
+        return durations
+
+    threads = max(1, int(threads))
+    counts = [requests // threads + (1 if i < requests % threads else 0) for i in range(threads)]
+    with ThreadPoolExecutor(max_workers=threads) as pool:
+        return [d for chunk in pool.map(run, counts) for d in chunk]
+
+
+def benchmark_connection(
+    url: str,
+    settings: dict,
+    session_id: str = _FAKE_SESSION,
+    requests: int = 500,
+    threads: int = 1,
+    server: Optional[FakeW3CServer] = None,
+) -> Dict[str, dict]:
+    """Author: taobo.zhou
+    分别用不保持连接、Selenium 默认连接与调优后的连接发送相同数量的命令，返回各自的 mean/p50/p95（毫秒）与新建连接数。
+    
+        url: 驱动服务地址。
+        settings: connection_settings 返回的配置。
+        session_id: 会话 ID，真实驱动时为已创建会话的 ID。
+        requests: 每种连接发送的命令数。
+        threads: 并发线程数。
+        server: 假 W3C 端点，用于统计新建连接数。
+    """
+
+    variants = {
+        "no-keepalive": lambda: RemoteConnection(client_config=ClientConfig(url, keep_alive=False)),
+        "default": lambda: RemoteConnection(client_config=ClientConfig(url)),
+        "tuned": lambda: _tuned(RemoteConnection(client_config=ClientConfig(url)), settings),
+    }
+    results: Dict[str, dict] = {}
+    for name, build in variants.items():
+        executor = build()
+        _measure(executor, session_id, min(20, requests), threads)
+        connections = server.connections if server is not None else None
+        durations = sorted(_measure(executor, session_id, requests, threads))
+        results[name] = {
+            "requests": len(durations),
+            "mean_ms": round(sum(durations) / len(durations) * 1000, 3),
+            "p50_ms": round(_percentile(durations, 50) * 1000, 3),
+            "p95_ms": round(_percentile(durations, 95) * 1000, 3),
+            "connections": server.connections - connections if server is not None else None,
+        }
+        executor.close()
+    return results
+
+
+def _tuned(executor, settings: dict):
+    """Author: taobo.zhou
+    调整连接并返回。
+    
+        executor: RemoteConnection 实例。
+        settings: connection_settings 返回的配置。
+    """
+
+    tune_connection(executor, {**settings, "enable": True})
+    return executor
+
+
+def run_benchmark(cfg: dict, requests: int = 500, threads: int = 1, browser: Optional[str] = None) -> Dict[str, dict]:
+    """Author: taobo.zhou
+    执行命令通道基准测试：指定浏览器时对真实驱动会话测量，否则对本地假 W3C 端点测量。
+    
+        cfg: 配置字典。
+        requests: 每种连接发送的命令数。
+        threads: 并发线程数。
+        browser: 浏览器类型，为空时使用假端点。
+    """
+
+    settings = connection_settings(cfg)
+    if browser:
+        from framework.driver.driver_factory import create_driver
+
+        driver = create_driver(browser)
+        try:
+            return benchmark_connection(driver.service.service_url, settings, driver.session_id, requests, threads)
+        finally:
+            driver.quit()
+    server = FakeW3CServer()
+    try:
+        return benchmark_connection(server.url, settings, requests=requests, threads=threads, server=server)
+    finally:
+        server.close()
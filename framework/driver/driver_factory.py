@@ -1,36 +1,620 @@
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import re
+import shutil
+import tempfile
+import threading
+import time
+from pathlib import Path
+from typing import Optional
+
+import psutil
 from selenium import webdriver
+from selenium.common.exceptions import SessionNotCreatedException
 from selenium.webdriver.chrome.options import Options as ChromeOptions
+from selenium.webdriver.chrome.service import Service as ChromeService
 from selenium.webdriver.edge.options import Options as EdgeOptions
+from selenium.webdriver.edge.service import Service as EdgeService
 from selenium.webdriver.firefox.options import Options as FirefoxOptions
+from selenium.webdriver.firefox.service import Service as FirefoxService
+
+from framework.driver.profile_template import ProfileTemplates
+from framework.driver.remote_connection import connection_settings, tune_connection
+from framework.utils.config_loader import PROJECT_ROOT, load_config
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_FONT_URL_PATTERNS = ["*.woff", "*.woff2", "*.ttf", "*.otf", "*.eot"]
+_scratch_dirs: list[str] = []
+_swept_roots: set[str] = set()
+_scratch_lock = threading.Lock()
+_SCRATCH_NAME = re.compile(r"^(?:chrome|edge|firefox)-(\d+)-")
+_SERVICE_CLASSES = {"chrome": ChromeService, "edge": EdgeService, "firefox": FirefoxService}
+_DRIVER_CLASSES = {"chrome": webdriver.Chrome, "edge": webdriver.Edge, "firefox": webdriver.Firefox}
+_driver_paths: dict[str, dict] = {}
+_services: dict[str, object] = {}
+_services_lock = threading.Lock()
+
+
+def _cleanup_scratch_dirs() -> None:
+    """Author: taobo.zhou
+    进程退出时删除本进程创建且仍未删除的临时 user-data-dir。
+     无。
+    """
+
+    for path in list(_scratch_dirs):
+        _remove_scratch_dir(path)
+
+
+atexit.register(_cleanup_scratch_dirs)
+
+
+def _remove_scratch_dir(path: str) -> None:
+    """Author: taobo.zhou
+    删除临时 user-data-dir 并移出清理列表；浏览器尚未释放的文件删不掉时留给下次启动的残留清理。
+    
+        path: 目录路径。
+    """
+
+    shutil.rmtree(path, ignore_errors=True)
+    with _scratch_lock:
+        if path in _scratch_dirs:
+            _scratch_dirs.remove(path)
+
+
+def _sweep_dead_scratch_dirs(root: Path) -> None:
+    """Author: taobo.zhou
+    删除 root 下由已退出进程创建的 <browser>-<pid>-* 目录（被看门狗强制结束的 worker 来不及执行 atexit）。
+    
+        root: 临时目录所在目录。
+    """
+
+    for path in root.iterdir():
+        match = _SCRATCH_NAME.match(path.name)
+        if not match or not path.is_dir() or psutil.pid_exists(int(match.group(1))):
+            continue
+        shutil.rmtree(path, ignore_errors=True)
+        log.info("[PW][DRIVER] removed stale profile dir %s", path)
+
+
+def _scratch_root() -> Path:
+    """Author: taobo.zhou
+    返回临时 user-data-dir 的根目录，优先使用 tmpfs（/dev/shm）。
+     无。
+    """
+
+    shm = Path("/dev/shm")
+    base = shm if shm.is_dir() and os.access(shm, os.W_OK) else Path(tempfile.gettempdir())
+    run_id = Path(os.environ.get("PW_RUN_DIR", "")).parent.name or "local"
+    root = base / "pw-profiles" / run_id
+    root.mkdir(parents=True, exist_ok=True)
+    return root
+
+
+def _scratch_user_data_dir(browser: str, root: Optional[Path] = None) -> str:
+    """Author: taobo.zhou
+    为本次启动创建独立的临时 user-data-dir，驱动退出时删除（进程退出时兜底删除）；
+    每个目录首次使用时先清理已退出进程留下的残留。
+    
+        browser: 浏览器类型。
+        root: 所在目录，为空时使用 _scratch_root()。
+    """
+
+    root = root or _scratch_root()
+    with _scratch_lock:
+        sweep = str(root) not in _swept_roots
+        _swept_roots.add(str(root))
+    if sweep:
+        _sweep_dead_scratch_dirs(root)
+        if root.parent.name == "pw-profiles":
+            # 同一台主机上其他运行（run_id）的残留也一并清理，清空后删除该运行目录
+            for other in root.parent.iterdir():
+                if other == root or not other.is_dir():
+                    continue
+                _sweep_dead_scratch_dirs(other)
+                try:
+                    other.rmdir()
+                except OSError:
+                    pass
+    path = tempfile.mkdtemp(prefix=f"{browser}-{os.getpid()}-", dir=str(root))
+    with _scratch_lock:
+        _scratch_dirs.append(path)
+    return path
+
+
+def _remove_dir_on_quit(driver, path: str) -> None:
+    """Author: taobo.zhou
+    包装驱动的 quit，浏览器退出后删除其临时 user-data-dir；驱动池淘汰或回收驱动时同样经过 quit。
+    
+        driver: WebDriver 实例。
+        path: user-data-dir 路径。
+    """
+
+    quit_driver = driver.quit
+
+    def quit() -> None:
+        """Author: taobo.zhou
+        退出浏览器并删除临时 user-data-dir。
+         无。
+        """
+
+        try:
+            quit_driver()
+        finally:
+            _remove_scratch_dir(path)
+
+    driver.quit = quit
+
+
+def resolve_launch_profile(name: str | None = None, cfg: dict | None = None) -> tuple[str, dict]:
+    """Author: taobo.zhou
+    解析启动配置名称与内容，优先级：参数 > 环境变量 PW_LAUNCH_PROFILE > selenium.launch_profile。
+    
+        name: 启动配置名称，可为空。
+        cfg: 配置字典，可为空。
+    """
+
+    cfg = cfg if cfg is not None else load_config()
+    selenium_cfg = cfg.get("selenium", {}) or {}
+    name = name or os.environ.get("PW_LAUNCH_PROFILE") or selenium_cfg.get("launch_profile") or "default"
+    profiles = selenium_cfg.get("launch_profiles", {}) or {}
+    if name not in profiles and name != "default":
+        raise ValueError(f"Unknown launch profile: {name}")
+    return name, dict(profiles.get(name) or {"maximized": True})
+
+
+def _chromium_options(options, profile: dict, user_data_dir: Optional[str]):
+    """Author: taobo.zhou
+    按启动配置设置 Chrome/Edge 选项。
+    
+        options: ChromeOptions 或 EdgeOptions 实例。
+        profile: 启动配置字典。
+        user_data_dir: 浏览器 user-data-dir，为空时由驱动创建临时目录。
+    """
+
+    if profile.get("headless"):
+        options.add_argument("--headless=new")
+    if profile.get("window_size"):
+        width, height = str(profile["window_size"]).lower().split("x", 1)
+        options.add_argument(f"--window-size={int(width)},{int(height)}")
+    elif profile.get("maximized", not profile.get("headless")):
+        options.add_argument("--start-maximized")
+    if profile.get("disable_extensions"):
+        options.add_argument("--disable-extensions")
+    if profile.get("disable_background_throttling"):
+        options.add_argument("--disable-background-timer-throttling")
+        options.add_argument("--disable-backgrounding-occluded-windows")
+        options.add_argument("--disable-renderer-backgrounding")
+    if profile.get("block_images"):
+        options.add_experimental_option("prefs", {"profile.managed_default_content_settings.images": 2})
+    if user_data_dir:
+        options.add_argument(f"--user-data-dir={user_data_dir}")
+    for arg in profile.get("extra_args") or []:
+        options.add_argument(str(arg))
+    return options
+
+
+def _firefox_options(options, profile: dict, user_data_dir: Optional[str]):
+    """Author: taobo.zhou
+    按启动配置设置 Firefox 选项。
+    
+        options: FirefoxOptions 实例。
+        profile: 启动配置字典。
+        user_data_dir: 浏览器 profile 目录，为空时由驱动创建临时目录。
+    """
+
+    if profile.get("headless"):
+        options.add_argument("-headless")
+    if profile.get("window_size"):
+        width, height = str(profile["window_size"]).lower().split("x", 1)
+        options.add_argument(f"--width={int(width)}")
+        options.add_argument(f"--height={int(height)}")
+    if profile.get("block_images"):
+        options.set_preference("permissions.default.image", 2)
+    if profile.get("block_fonts"):
+        options.set_preference("browser.display.use_document_fonts", 0)
+    if user_data_dir:
+        options.add_argument("-profile")
+        options.add_argument(user_data_dir)
+    for arg in profile.get("extra_args") or []:
+        options.add_argument(str(arg))
+    return options
+
+
+def _build_options(browser: str, profile: dict, user_data_dir: Optional[str]):
+    """Author: taobo.zhou
+    按浏览器类型与启动配置创建浏览器选项。
+    
+        browser: 浏览器类型。
+        profile: 启动配置字典。
+        user_data_dir: 浏览器 user-data-dir，可为空。
+    """
+
+    if browser == "chrome":
+        options = _chromium_options(ChromeOptions(), profile, user_data_dir)
+    elif browser == "edge":
+        options = _chromium_options(EdgeOptions(), profile, user_data_dir)
+    elif browser == "firefox":
+        options = _firefox_options(FirefoxOptions(), profile, user_data_dir)
+    else:
+        raise ValueError(f"Unsupported browser: {browser}")
+    options.page_load_strategy = profile.get("page_load_strategy", "normal")
+    return options
+
+
+def _record_startup(browser: str, profile_name: str, seconds: float) -> None:
+    """Author: taobo.zhou
+    记录浏览器启动耗时：写日志，并在运行目录中追加 reports/driver_startup.jsonl。
+    
+        browser: 浏览器类型。
+        profile_name: 启动配置名称。
+        seconds: 启动耗时（秒）。
+    """
+
+    log.info("[PW][DRIVER] launch browser=%s profile=%s startup=%.2fs", browser, profile_name, seconds)
+    run_dir = os.environ.get("PW_RUN_DIR")
+    if not run_dir:
+        return
+    path = Path(run_dir) / "reports" / "driver_startup.jsonl"
+    try:
+        path.parent.mkdir(parents=True, exist_ok=True)
+        record = {
+            "ts": time.strftime("%Y-%m-%d %H:%M:%S"),
+            "pid": os.getpid(),
+            "browser": browser,
+            "profile": profile_name,
+            "startup": round(seconds, 3),
+        }
+        with path.open("a", encoding="utf-8") as f:
+            f.write(json.dumps(record, ensure_ascii=False) + "\n")
+    except OSError as exc:
+        log.warning("[PW][DRIVER] record startup failed: %s", exc)
+
+
+class _SharedServiceMixin:
+    """Author: taobo.zhou
+    常驻驱动服务：会话 quit 时不停止驱动进程，由 shutdown_services 统一停止。
+    Driver service kept alive across sessions; stopped only by shutdown_services.
+    """
+
+    _start_lock = threading.Lock()
+
+    def start(self) -> None:
+        """Author: taobo.zhou
+        驱动进程未运行时启动，已运行时直接复用。
+         无。
+        """
+
+        with self._start_lock:
+            process = getattr(self, "process", None)
+            if process is not None and process.poll() is None:
+                return
+            super().start()
+
+    def stop(self) -> None:
+        """Author: taobo.zhou
+        会话结束时调用，保持驱动进程运行。
+         无。
+        """
+
+        return
 
-from framework.utils.config_loader import load_config
+    def shutdown(self) -> None:
+        """Author: taobo.zhou
+        真正停止驱动进程。
+         无。
+        """
 
+        if getattr(self, "process", None) is not None:
+            super().stop()
 
-def create_driver(browser: str | None = None):
+
+class _SharedChromeService(_SharedServiceMixin, ChromeService):
+    """Author: taobo.zhou
+    跨会话复用的 chromedriver 服务。
+    Shared chromedriver service.
+    """
+
+
+class _SharedEdgeService(_SharedServiceMixin, EdgeService):
+    """Author: taobo.zhou
+    跨会话复用的 msedgedriver 服务。
+    Shared msedgedriver service.
+    """
+
+
+_SHARED_SERVICE_CLASSES = {"chrome": _SharedChromeService, "edge": _SharedEdgeService}
+
+
+def _driver_cache_path(cfg: dict) -> Path:
     """Author: taobo.zhou
-    根据配置创建并返回浏览器驱动。
+    返回驱动路径缓存文件（selenium.driver_cache）。
+    
+        cfg: 配置字典。
+    """
+
+    path = Path((cfg.get("selenium", {}) or {}).get("driver_cache", "output/driver_cache.json"))
+    return path if path.is_absolute() else PROJECT_ROOT / path
+
+
+def _selenium_manager_paths(browser: str, options) -> dict:
+    """Author: taobo.zhou
+    调用 Selenium Manager 解析驱动与浏览器路径，失败时返回空字典。
+    
+        browser: 浏览器类型。
+        options: 浏览器选项。
+    """
+
+    from selenium.webdriver.common.driver_finder import DriverFinder
+
+    service = _SERVICE_CLASSES[browser]()
+    try:
+        if hasattr(DriverFinder, "get_driver_path"):
+            finder = DriverFinder(service, options)
+            return {"driver_path": finder.get_driver_path(), "browser_path": finder.get_browser_path()}
+        return {"driver_path": DriverFinder.get_path(service, options), "browser_path": ""}
+    except Exception as exc:
+        log.warning("[PW][DRIVER] selenium manager failed for %s: %s", browser, exc)
+        return {}
+
+
+def _resolve_driver_paths(browser: str, options, cfg: dict, refresh: bool = False) -> dict:
+    """Author: taobo.zhou
+    返回驱动与浏览器路径：selenium.driver_paths 配置优先，其次进程内与跨运行缓存，最后调用 Selenium Manager。
+    
+        browser: 浏览器类型。
+        options: 浏览器选项。
+        cfg: 配置字典。
+        refresh: 是否忽略缓存重新解析。
+    """
+
+    configured = ((cfg.get("selenium", {}) or {}).get("driver_paths", {}) or {}).get(browser)
+    if configured:
+        return {"driver_path": str(configured), "browser_path": ""}
+
+    cache_path = _driver_cache_path(cfg)
+    if not refresh:
+        entry = _driver_paths.get(browser)
+        if entry is None and cache_path.exists():
+            try:
+                with cache_path.open("r", encoding="utf-8") as f:
+                    entry = (json.load(f) or {}).get(browser)
+            except Exception as exc:
+                log.warning("[PW][DRIVER] bad driver cache %s: %s", cache_path, exc)
+        if entry and Path(entry.get("driver_path", "")).is_file():
+            _driver_paths[browser] = entry
+            return entry
+
+    started = time.perf_counter()
+    entry = _selenium_manager_paths(browser, options)
+    if not entry.get("driver_path"):
+        return {}
+    log.info("[PW][DRIVER] resolved %s driver %s in %.2fs", browser, entry["driver_path"], time.perf_counter() - started)
+    _driver_paths[browser] = entry
+    try:
+        cache = {}
+        if cache_path.exists():
+            with cache_path.open("r", encoding="utf-8") as f:
+                cache = json.load(f) or {}
+        cache[browser] = entry
+        cache_path.parent.mkdir(parents=True, exist_ok=True)
+        tmp_path = cache_path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump(cache, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, cache_path)
+    except Exception as exc:
+        log.warning("[PW][DRIVER] write driver cache failed: %s", exc)
+    return entry
+
+
+def _service_for(browser: str, driver_path: Optional[str], shared: bool):
+    """Author: taobo.zhou
+    返回驱动服务：Chrome/Edge 共享时复用本进程常驻的服务，否则每个会话新建。
+    
+        browser: 浏览器类型。
+        driver_path: 驱动可执行文件路径，为空时由 Selenium 解析。
+        shared: 是否使用常驻服务。
+    """
+
+    if not shared or browser not in _SHARED_SERVICE_CLASSES:
+        return _SERVICE_CLASSES[browser](executable_path=driver_path)
+    with _services_lock:
+        service = _services.get(browser)
+        if service is None or (driver_path and getattr(service, "path", None) != driver_path):
+            if service is not None:
+                _stop_service(service)
+            service = _SHARED_SERVICE_CLASSES[browser](executable_path=driver_path)
+            _services[browser] = service
+        return service
+
+
+def _stop_service(service) -> None:
+    """Author: taobo.zhou
+    停止驱动服务，忽略异常。
+    
+        service: 驱动服务实例。
+    """
+
+    try:
+        service.shutdown() if hasattr(service, "shutdown") else service.stop()
+    except Exception as exc:
+        log.warning("[PW][DRIVER] stop service failed: %s", exc)
+
+
+def shutdown_services() -> None:
+    """Author: taobo.zhou
+    停止本进程持有的所有常驻驱动服务。
+     无。
+    """
+
+    with _services_lock:
+        services = list(_services.values())
+        _services.clear()
+    for service in services:
+        _stop_service(service)
+
+
+atexit.register(shutdown_services)
+
+
+def _new_session(browser: str, options, cfg: dict):
+    """Author: taobo.zhou
+    通过（常驻）驱动服务创建浏览器会话并调整命令通道，缓存的驱动与浏览器版本不匹配时重新解析后重试一次。
+    
+        browser: 浏览器类型。
+        options: 浏览器选项。
+        cfg: 配置字典。
+    """
+
+    shared = bool((cfg.get("selenium", {}) or {}).get("shared_service", True))
+    for refresh in (False, True):
+        paths = _resolve_driver_paths(browser, options, cfg, refresh=refresh)
+        if paths.get("browser_path"):
+            options.binary_location = paths["browser_path"]
+        service = _service_for(browser, paths.get("driver_path"), shared)
+        try:
+            driver = _DRIVER_CLASSES[browser](options=options, service=service)
+        except SessionNotCreatedException as exc:
+            if refresh or not paths:
+                raise
+            log.warning("[PW][DRIVER] session not created with cached driver, re-resolving: %s", exc)
+            with _services_lock:
+                if _services.get(browser) is service:
+                    _services.pop(browser)
+            _stop_service(service)
+            continue
+        tune_connection(driver.command_executor, connection_settings(cfg))
+        return driver
+
+
+def _profile_templates(cfg: dict) -> ProfileTemplates:
+    """Author: taobo.zhou
+    返回 profile 模板管理器（selenium.profile_template_dir）。
+    
+        cfg: 配置字典。
+    """
+
+    root = Path((cfg.get("selenium", {}) or {}).get("profile_template_dir", "output/profile_templates"))
+    return ProfileTemplates(root if root.is_absolute() else PROJECT_ROOT / root)
+
+
+def _build_template(browser: str, profile: dict, cfg: dict, dest: Path) -> str:
+    """Author: taobo.zhou
+    以 dest 为 user-data-dir 启动浏览器，依次访问 project.urls 填充缓存后正常退出，返回浏览器版本。
+    
+        browser: 浏览器类型。
+        profile: 启动配置字典。
+        cfg: 配置字典。
+        dest: 模板暂存目录。
+    """
+
+    # 构建时不屏蔽图片/字体，保证静态资源都进入缓存
+    build_keys = ("headless", "window_size", "disable_extensions", "extra_args")
+    build_profile = {k: v for k, v in profile.items() if k in build_keys}
+    dest.mkdir(parents=True, exist_ok=True)
+    driver = _new_session(browser, _build_options(browser, build_profile, str(dest)), cfg)
+    try:
+        page_load_timeout = (cfg.get("selenium", {}) or {}).get("page_load_timeout")
+        if page_load_timeout:
+            driver.set_page_load_timeout(float(page_load_timeout))
+        urls = (cfg.get("project", {}) or {}).get("urls") or {}
+        for url in dict.fromkeys(urls.values() if isinstance(urls, dict) else urls):
+            try:
+                driver.get(url)
+            except Exception as exc:
+                log.warning("[PW][DRIVER] template warm-up failed for %s: %s", url, exc)
+        return str((driver.capabilities or {}).get("browserVersion") or "unknown")
+    finally:
+        driver.quit()
+
+
+def build_profile_template(browser: str | None = None, profile: str | None = None, rebuild: bool = True) -> dict:
+    """Author: taobo.zhou
+    构建（或复用）当前浏览器版本的预热 profile 模板，返回模板信息。
+    
+        browser: 浏览器类型，未传则读取配置。
+        profile: 启动配置名称，未传则读取环境变量或配置。
+        rebuild: 是否强制重新构建。
+    """
+
+    cfg = load_config()
+    browser = (browser or cfg.get("project", {}).get("browser", "chrome")).lower()
+    _, launch = resolve_launch_profile(profile, cfg)
+    templates = _profile_templates(cfg)
+    return templates.ensure(browser, lambda dest: _build_template(browser, launch, cfg, dest), rebuild=rebuild)
+
+
+def _prepare_user_data_dir(browser: str, launch: dict, cfg: dict) -> tuple[Optional[str], Optional[dict]]:
+    """Author: taobo.zhou
+    按启动配置准备 user-data-dir：profile_template 时复制预热模板，scratch_profile 时创建空目录。
+    
+        browser: 浏览器类型。
+        launch: 启动配置字典。
+        cfg: 配置字典。
+    """
+
+    if launch.get("profile_template"):
+        templates = _profile_templates(cfg)
+        try:
+            info = templates.ensure(browser, lambda dest: _build_template(browser, launch, cfg, dest))
+            user_data_dir = _scratch_user_data_dir(browser, templates.clone_dir(browser))
+            try:
+                templates.clone(info, Path(user_data_dir))
+            except Exception:
+                _remove_scratch_dir(user_data_dir)
+                raise
+            return user_data_dir, info
+        except Exception as exc:
+            log.warning("[PW][DRIVER] profile template unavailable, use empty profile: %s", exc)
+            return _scratch_user_data_dir(browser), None
+    if launch.get("scratch_profile"):
+        return _scratch_user_data_dir(browser), None
+    return None, None
+
+
+def create_driver(browser: str | None = None, profile: str | None = None):
+    """Author: taobo.zhou
+    根据配置与启动配置（launch profile）创建并返回浏览器驱动。
     
         browser: 浏览器类型，可为 chrome、edge、firefox，未传则读取配置。
+        profile: 启动配置名称，未传则读取环境变量或配置。
     """
 
+    cfg = load_config()
     if browser is None:
-        cfg = load_config()
         browser = cfg.get("project", {}).get("browser", "chrome")
-
     browser = browser.lower()
+    if browser not in _DRIVER_CLASSES:
+        raise ValueError(f"Unsupported browser: {browser}")
+    profile_name, launch = resolve_launch_profile(profile, cfg)
 
-    if browser == "chrome":
-        options = ChromeOptions()
-        options.add_argument("--start-maximized")
-        return webdriver.Chrome(options=options)
+    started = time.perf_counter()
+    user_data_dir, template = _prepare_user_data_dir(browser, launch, cfg)
+    try:
+        driver = _new_session(browser, _build_options(browser, launch, user_data_dir), cfg)
+    except Exception:
+        if user_data_dir:
+            _remove_scratch_dir(user_data_dir)
+        raise
+    if user_data_dir:
+        _remove_dir_on_quit(driver, user_data_dir)
 
-    if browser == "edge":
-        options = EdgeOptions()
-        options.add_argument("--start-maximized")
-        return webdriver.Edge(options=options)
+    if template is not None:
+        version = str((driver.capabilities or {}).get("browserVersion") or "unknown")
+        if version != template.get("version"):
+            log.info("[PW][DRIVER] browser %s -> %s, profile template will be rebuilt", template.get("version"), version)
+            _profile_templates(cfg).invalidate(browser)
 
-    if browser == "firefox":
-        options = FirefoxOptions()
-        return webdriver.Firefox(options=options)
+    if launch.get("block_fonts") and hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Network.enable", {})
+            driver.execute_cdp_cmd("Network.setBlockedURLs", {"urls": _FONT_URL_PATTERNS})
+        except Exception as exc:
+            log.warning("[PW][DRIVER] block fonts failed: %s", exc)
 
-    raise ValueError(f"Unsupported browser: {browser}")
+    _record_startup(browser, profile_name, time.perf_counter() - started)
+    return driver
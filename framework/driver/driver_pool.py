@@ -0,0 +1,282 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Callable, Deque, Dict, List, Optional
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+
+def is_driver_alive(driver) -> bool:
+    """Author: taobo.zhou
+    检查浏览器会话是否仍可用（会话存在且当前窗口可访问）。
+    
+        driver: WebDriver 实例。
+    """
+
+    try:
+        if not getattr(driver, "session_id", None):
+            return False
+        _ = driver.current_window_handle
+        return True
+    except Exception:
+        return False
+
+
+class DriverPool:
+    """Author: taobo.zhou
+    线程安全的 WebDriver 池，按需创建、借出时做健康检查并淘汰失效会话。
+    Thread-safe WebDriver pool with lazy creation, health check on checkout and eviction of broken sessions.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[[], object],
+        size: int = 1,
+        acquire_timeout: Optional[float] = None,
+        health_check: Callable[[object], bool] = is_driver_alive,
+        reset: Optional[Callable[[object], None]] = None,
+        max_uses: int = 0,
+        max_memory_mb: float = 0,
+        memory_probe: Optional[Callable[[object], float]] = None,
+        health: Optional[Callable[[object], Optional[str]]] = None,
+        on_evict: Optional[Callable[[object], None]] = None,
+    ):
+        """Author: taobo.zhou
+        初始化驱动池。
+        
+            factory: 创建 WebDriver 的回调。
+            size: 池中最多同时存在的驱动数量。
+            acquire_timeout: 借出驱动的默认最长等待时间（秒），为空表示一直等待。
+            health_check: 借出前检查驱动是否可用的回调。
+            reset: 复用模式下归还时原地重置驱动的回调，为空表示归还时不重置。
+            max_uses: 复用模式下驱动被借出多少次后回收重建，<=0 表示不限制。
+            max_memory_mb: 复用模式下驱动内存超过该值（MB）时回收重建，<=0 表示不限制。
+            memory_probe: 返回驱动内存占用（MB）的回调。
+            health: 归还时返回驱动被健康监控标记回收原因的回调，未标记时返回 None。
+            on_evict: 驱动被淘汰后的回调。
+        """
+
+        self._factory = factory
+        self._size = max(1, int(size))
+        self._acquire_timeout = acquire_timeout
+        self._health_check = health_check
+        self._reset = reset
+        self._max_uses = int(max_uses or 0)
+        self._max_memory_mb = float(max_memory_mb or 0)
+        self._memory_probe = memory_probe
+        self._health = health
+        self._on_evict = on_evict
+        self._uses: Dict[int, int] = {}
+        self._idle: Deque[object] = deque()
+        self._drivers: List[object] = []
+        self._creating = 0
+        self._closed = False
+        self._cond = threading.Condition()
+
+    @property
+    def size(self) -> int:
+        """Author: taobo.zhou
+        返回池容量。
+         无。
+        """
+
+        return self._size
+
+    def acquire(self, timeout: Optional[float] = None):
+        """Author: taobo.zhou
+        借出一个可用驱动，池中无空闲且已满时等待归还。
+        
+            timeout: 最长等待时间（秒），为空时使用默认值。
+        """
+
+        timeout = self._acquire_timeout if timeout is None else timeout
+        deadline = None if timeout is None else time.time() + float(timeout)
+        while True:
+            with self._cond:
+                while True:
+                    if self._closed:
+                        raise RuntimeError("driver pool is closed")
+                    if self._idle:
+                        driver = self._idle.pop()
+                        create = False
+                        break
+                    if len(self._drivers) + self._creating < self._size:
+                        self._creating += 1
+                        driver = None
+                        create = True
+                        break
+                    remaining = None if deadline is None else deadline - time.time()
+                    if remaining is not None and remaining <= 0:
+                        raise TimeoutError(f"no driver available in pool (size={self._size})")
+                    self._cond.wait(remaining)
+
+            if create:
+                try:
+                    driver = self._factory()
+                except Exception:
+                    with self._cond:
+                        self._creating -= 1
+                        self._cond.notify()
+                    raise
+                with self._cond:
+                    self._creating -= 1
+                    self._drivers.append(driver)
+                log.info("[PW][DRIVER] created driver %s/%s", len(self._drivers), self._size)
+                return driver
+
+            if self._health_check(driver):
+                return driver
+            log.warning("[PW][DRIVER] evict broken driver on checkout")
+            self._evict(driver)
+
+    def release(self, driver, broken: bool = False) -> None:
+        """Author: taobo.zhou
+        归还驱动，损坏或池已关闭时直接淘汰；被健康监控标记时回收；复用模式下原地重置，达到次数或内存上限时回收。
+        
+            driver: WebDriver 实例。
+            broken: 调用方是否已确认驱动不可用。
+        """
+
+        if driver is None:
+            return
+        with self._cond:
+            owned = driver in self._drivers
+            keep = owned and not broken and not self._closed
+            uses = self._uses.get(id(driver), 0) + 1
+            if owned:
+                self._uses[id(driver)] = uses
+            health_reason = self._health(driver) if keep and self._health is not None else None
+            if keep and self._reset is None and health_reason is None:
+                self._idle.append(driver)
+                self._cond.notify()
+                return
+        if not owned:
+            return
+        if keep:
+            reason = health_reason or self._recycle_reason(driver, uses)
+            if reason is None:
+                try:
+                    self._reset(driver)
+                except Exception as exc:
+                    reason = f"reset failed: {exc}"
+            if reason is None:
+                with self._cond:
+                    if not self._closed:
+                        self._idle.append(driver)
+                        self._cond.notify()
+                        return
+            else:
+                log.info("[PW][DRIVER] recycle driver after %s uses (%s)", uses, reason)
+        self._evict(driver)
+
+    def _recycle_reason(self, driver, uses: int) -> Optional[str]:
+        """Author: taobo.zhou
+        判断复用中的驱动是否达到回收条件，返回原因或 None。
+        
+            driver: WebDriver 实例。
+            uses: 该驱动已被借出的次数。
+        """
+
+        if self._max_uses > 0 and uses >= self._max_uses:
+            return f"uses>={self._max_uses}"
+        if self._max_memory_mb > 0 and self._memory_probe is not None:
+            memory = self._memory_probe(driver)
+            if memory > self._max_memory_mb:
+                return f"memory={memory:.0f}MB>{self._max_memory_mb:.0f}MB"
+        return None
+
+    def for_each_idle(self, action: Callable[[object], None]) -> None:
+        """Author: taobo.zhou
+        对每个空闲驱动执行操作（例如清理会话状态），执行失败的驱动被淘汰。
+        
+            action: 以驱动为参数的回调。
+        """
+
+        with self._cond:
+            drivers = list(self._idle)
+            self._idle.clear()
+        for driver in drivers:
+            try:
+                action(driver)
+            except Exception as exc:
+                log.warning("[PW][DRIVER] idle driver action failed, evict: %s", exc)
+                self._evict(driver)
+                continue
+            with self._cond:
+                self._idle.append(driver)
+                self._cond.notify()
+
+    def prewarm(self, count: int = 1) -> None:
+        """Author: taobo.zhou
+        预先创建驱动放入空闲队列。
+        
+            count: 预创建数量，不超过池容量。
+        """
+
+        drivers = []
+        try:
+            for _ in range(min(int(count), self._size)):
+                drivers.append(self.acquire())
+        finally:
+            for driver in drivers:
+                self.release(driver)
+
+    def _evict(self, driver) -> None:
+        """Author: taobo.zhou
+        从池中移除驱动并尝试关闭浏览器。
+        
+            driver: WebDriver 实例。
+        """
+
+        with self._cond:
+            if driver in self._drivers:
+                self._drivers.remove(driver)
+            if driver in self._idle:
+                self._idle.remove(driver)
+            self._uses.pop(id(driver), None)
+            self._cond.notify()
+        try:
+            driver.quit()
+        except Exception:
+            pass
+        if self._on_evict is not None:
+            self._on_evict(driver)
+
+    def stats(self) -> dict:
+        """Author: taobo.zhou
+        返回池的当前状态。
+         无。
+        """
+
+        with self._cond:
+            return {
+                "size": self._size,
+                "created": len(self._drivers),
+                "idle": len(self._idle),
+                "in_use": len(self._drivers) - len(self._idle),
+            }
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        关闭池并退出所有驱动（包括借出中的驱动）。
+         无。
+        """
+
+        with self._cond:
+            self._closed = True
+            drivers = list(self._drivers)
+            self._drivers.clear()
+            self._idle.clear()
+            self._uses.clear()
+            self._cond.notify_all()
+        for driver in drivers:
+            try:
+                driver.quit()
+            except Exception as exc:
+                log.warning("[PW][DRIVER] quit failed: %s", exc)
+            if self._on_evict is not None:
+                self._on_evict(driver)
@@ -0,0 +1,306 @@
+from __future__ import annotations
+
+import threading
+import time
+from collections import deque
+from typing import Deque, Dict, List, Optional
+
+import psutil
+
+from framework.driver.command_profiler import _percentile
+from framework.driver.session_reset import _browser_processes
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+# 只用轻量命令衡量往返延迟，页面加载、脚本执行等本身耗时的命令不计入
+_LATENCY_COMMANDS = frozenset({
+    "findElement",
+    "findElements",
+    "findChildElement",
+    "findChildElements",
+    "getElementAttribute",
+    "getElementProperty",
+    "getElementText",
+    "getElementTagName",
+    "isElementDisplayed",
+    "isElementEnabled",
+    "isElementSelected",
+    "getTitle",
+    "getCurrentUrl",
+    "getWindowHandles",
+    "w3cGetCurrentWindowHandle",
+})
+_MAX_CASE_SAMPLES = 720
+
+
+class _Watched:
+    """Author: taobo.zhou
+    单个受监控驱动的状态。
+    State of a single monitored driver.
+    """
+
+    def __init__(self, driver, latency_window: int):
+        """Author: taobo.zhou
+        初始化监控状态。
+        
+            driver: WebDriver 实例。
+            latency_window: 参与延迟统计的最近命令数。
+        """
+
+        self.driver = driver
+        self.latencies: Deque[float] = deque(maxlen=latency_window)
+        self.procs: Dict[int, psutil.Process] = {}
+        self.samples: List[list] = []
+        self.cpu_high = 0
+        self.recycle: Optional[str] = None
+
+
+class DriverHealthMonitor:
+    """Author: taobo.zhou
+    驱动健康监控，后台采样浏览器/驱动进程树的内存与 CPU 以及最近命令延迟，超过阈值时标记在下一个用例边界回收。
+    Driver health monitor that samples RSS, CPU and recent command latency and marks degraded drivers for recycle.
+    """
+
+    def __init__(
+        self,
+        interval: float = 5.0,
+        max_rss_mb: float = 0,
+        max_cpu_percent: float = 0,
+        cpu_sustain_samples: int = 6,
+        max_latency_ms: float = 0,
+        latency_window: int = 50,
+    ):
+        """Author: taobo.zhou
+        初始化健康监控。
+        
+            interval: 采样间隔（秒）。
+            max_rss_mb: 进程树常驻内存上限（MB），<=0 表示不限制。
+            max_cpu_percent: CPU 占用上限（占整机百分比），<=0 表示不限制。
+            cpu_sustain_samples: CPU 连续超过上限多少次采样才判定为退化。
+            max_latency_ms: 最近轻量命令 p95 延迟上限（毫秒），<=0 表示不限制。
+            latency_window: 参与延迟统计的最近命令数。
+        """
+
+        self._interval = max(0.5, float(interval))
+        self._max_rss_mb = float(max_rss_mb or 0)
+        self._max_cpu = float(max_cpu_percent or 0)
+        self._cpu_sustain = max(1, int(cpu_sustain_samples))
+        self._max_latency = float(max_latency_ms or 0) / 1000.0
+        self._latency_window = max(5, int(latency_window))
+        self._cpu_count = psutil.cpu_count() or 1
+        self._watched: Dict[int, _Watched] = {}
+        # 用例进行中被淘汰的驱动，其采样保留到用例结束
+        self._retired: List[_Watched] = []
+        self._case_started: Optional[float] = None
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def watch(self, driver):
+        """Author: taobo.zhou
+        开始监控驱动：记录轻量命令延迟，并确保采样线程已启动。
+        
+            driver: WebDriver 实例。
+        """
+
+        state = _Watched(driver, self._latency_window)
+        original = driver.execute
+
+        def execute(driver_command, params=None):
+            """Author: taobo.zhou
+            执行命令并记录轻量命令的延迟。
+            
+                driver_command: W3C 命令名称。
+                params: 命令参数。
+            """
+
+            if driver_command not in _LATENCY_COMMANDS:
+                return original(driver_command, params)
+            started = time.perf_counter()
+            try:
+                return original(driver_command, params)
+            finally:
+                state.latencies.append(time.perf_counter() - started)
+
+        driver.execute = execute
+        with self._lock:
+            self._watched[id(driver)] = state
+            if self._thread is None:
+                self._stop.clear()
+                self._thread = threading.Thread(target=self._run, name="pw-driver-health", daemon=True)
+                self._thread.start()
+        return driver
+
+    def unwatch(self, driver) -> None:
+        """Author: taobo.zhou
+        停止监控驱动（驱动被淘汰时调用）。
+        
+            driver: WebDriver 实例。
+        """
+
+        with self._lock:
+            state = self._watched.pop(id(driver), None)
+            if state is not None and self._case_started is not None and state.samples:
+                self._retired.append(state)
+
+    def recycle_reason(self, driver) -> Optional[str]:
+        """Author: taobo.zhou
+        返回驱动被标记回收的原因，未标记时返回 None。
+        
+            driver: WebDriver 实例。
+        """
+
+        with self._lock:
+            state = self._watched.get(id(driver))
+            return state.recycle if state is not None else None
+
+    def begin_case(self) -> None:
+        """Author: taobo.zhou
+        开始一个用例的采样记录。
+         无。
+        """
+
+        with self._lock:
+            self._case_started = time.time()
+            self._retired = []
+            for state in self._watched.values():
+                state.samples = []
+        self._sample_all()
+
+    def end_case(self) -> Optional[dict]:
+        """Author: taobo.zhou
+        结束用例采样，返回资源曲线（[秒, RSS MB, CPU %, p95 延迟 ms]）与峰值，没有受监控驱动时返回 None。
+         无。
+        """
+
+        self._sample_all()
+        with self._lock:
+            if self._case_started is None:
+                return None
+            self._case_started = None
+            samples: List[list] = []
+            recycle = None
+            states, self._retired = self._retired + list(self._watched.values()), []
+            for state in states:
+                samples.extend(state.samples)
+                state.samples = []
+                recycle = recycle or state.recycle
+        if not samples:
+            return None
+        samples.sort(key=lambda s: s[0])
+        return {
+            "interval": self._interval,
+            "samples": samples,
+            "peak_rss_mb": max(s[1] for s in samples),
+            "max_cpu_percent": max(s[2] for s in samples),
+            "max_latency_ms": max(s[3] for s in samples),
+            "recycle": recycle,
+        }
+
+    def _run(self) -> None:
+        """Author: taobo.zhou
+        采样线程主循环。
+         无。
+        """
+
+        while not self._stop.wait(self._interval):
+            try:
+                self._sample_all()
+            except Exception as exc:
+                log.warning("[PW][HEALTH] sample failed: %s", exc)
+
+    def _sample_all(self) -> None:
+        """Author: taobo.zhou
+        对所有受监控驱动采样一次并检查阈值。
+         无。
+        """
+
+        with self._lock:
+            states = list(self._watched.values())
+            case_started = self._case_started
+        for state in states:
+            sample = self._sample(state)
+            if sample is None:
+                continue
+            rss_mb, cpu, latency = sample
+            reason = self._check(state, rss_mb, cpu, latency)
+            with self._lock:
+                if case_started is not None and len(state.samples) < _MAX_CASE_SAMPLES:
+                    state.samples.append([
+                        round(time.time() - case_started, 1),
+                        round(rss_mb, 1),
+                        round(cpu, 1),
+                        round(latency * 1000, 1),
+                    ])
+                if reason and state.recycle is None:
+                    state.recycle = reason
+                    log.warning("[PW][HEALTH] driver marked for recycle: %s", reason)
+
+    def _sample(self, state: _Watched):
+        """Author: taobo.zhou
+        采样驱动进程树的 RSS（MB）、CPU（占整机百分比）与最近轻量命令的 p95 延迟（秒）。
+        
+            state: 受监控驱动的状态。
+        """
+
+        process = getattr(getattr(state.driver, "service", None), "process", None)
+        pid = getattr(process, "pid", None)
+        if not pid:
+            return None
+        try:
+            current = _browser_processes(state.driver, psutil.Process(pid))
+        except psutil.Error:
+            return None
+
+        rss = 0
+        cpu = 0.0
+        alive: Dict[int, psutil.Process] = {}
+        for proc in current:
+            # 复用 Process 对象，cpu_percent 才能得到两次采样之间的占用
+            proc = state.procs.get(proc.pid, proc)
+            try:
+                rss += proc.memory_info().rss
+                cpu += proc.cpu_percent(None)
+            except psutil.Error:
+                continue
+            alive[proc.pid] = proc
+        state.procs = alive
+
+        latency = _percentile(sorted(state.latencies), 95)
+        return rss / (1024 * 1024), cpu / self._cpu_count, latency
+
+    def _check(self, state: _Watched, rss_mb: float, cpu: float, latency: float) -> Optional[str]:
+        """Author: taobo.zhou
+        检查采样是否超过阈值，返回回收原因或 None。
+        
+            state: 受监控驱动的状态。
+            rss_mb: 进程树常驻内存（MB）。
+            cpu: CPU 占用（占整机百分比）。
+            latency: 最近轻量命令的 p95 延迟（秒）。
+        """
+
+        if self._max_rss_mb > 0 and rss_mb > self._max_rss_mb:
+            return f"rss={rss_mb:.0f}MB>{self._max_rss_mb:.0f}MB"
+        if self._max_cpu > 0:
+            state.cpu_high = state.cpu_high + 1 if cpu > self._max_cpu else 0
+            if state.cpu_high >= self._cpu_sustain:
+                return f"cpu={cpu:.0f}%>{self._max_cpu:.0f}% x{state.cpu_high}"
+        if self._max_latency > 0 and len(state.latencies) >= state.latencies.maxlen // 2 and latency > self._max_latency:
+            return f"p95 latency={latency * 1000:.0f}ms>{self._max_latency * 1000:.0f}ms"
+        return None
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        停止采样线程并清空监控列表，进行中用例的采样保留到 end_case。
+         无。
+        """
+
+        self._stop.set()
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if self._case_started is not None:
+                self._retired.extend(s for s in self._watched.values() if s.samples)
+            self._watched.clear()
+        if thread is not None:
+            thread.join(timeout=self._interval + 1)
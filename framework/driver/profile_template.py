@@ -0,0 +1,237 @@
+from __future__ import annotations
+
+import fnmatch
+import json
+import os
+import shutil
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Optional
+
+from framework.utils.file_lock import file_lock
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+# 锁文件、崩溃转储等运行时文件不进入模板，也不复制到副本
+_EXCLUDE_PATTERNS = (
+    "Singleton*",
+    "lockfile",
+    "LOCK",
+    "parent.lock",
+    ".parentlock",
+    "lock",
+    "Crashpad",
+    "Crash Reports",
+    "BrowserMetrics*",
+    "*.tmp",
+)
+_FICLONE = 0x40049409
+
+
+def _excluded(name: str) -> bool:
+    """Author: taobo.zhou
+    判断文件或目录是否属于运行时文件。
+    
+        name: 文件或目录名。
+    """
+
+    return any(fnmatch.fnmatch(name, pattern) for pattern in _EXCLUDE_PATTERNS)
+
+
+def _reflink(src: Path, dst: Path) -> None:
+    """Author: taobo.zhou
+    以写时复制（reflink）方式复制文件，文件系统不支持时抛出 OSError。
+    
+        src: 源文件。
+        dst: 目标文件。
+    """
+
+    if not sys.platform.startswith("linux"):
+        raise OSError("reflink is not supported on this platform")
+    import fcntl
+
+    with src.open("rb") as fsrc, dst.open("wb") as fdst:
+        try:
+            fcntl.ioctl(fdst.fileno(), _FICLONE, fsrc.fileno())
+        except OSError:
+            fdst.close()
+            dst.unlink()
+            raise
+    shutil.copystat(src, dst)
+
+
+def clone_profile(template: Path, dest: Path) -> dict:
+    """Author: taobo.zhou
+    将模板目录复制为浏览器可写的独立副本，优先 reflink，不支持时普通复制，返回各方式的文件数。
+    不使用硬链接：Chrome simple cache 与 Firefox cache2 会原地改写缓存条目和索引，共享 inode 会同时改坏模板与其他副本。
+    
+        template: 模板目录。
+        dest: 目标目录。
+    """
+
+    counts = {"reflink": 0, "copy": 0}
+    reflink_ok = True
+    dest.mkdir(parents=True, exist_ok=True)
+    for root, dirs, files in os.walk(template):
+        dirs[:] = [d for d in dirs if not _excluded(d)]
+        rel = Path(root).relative_to(template)
+        target_dir = dest / rel
+        target_dir.mkdir(parents=True, exist_ok=True)
+        for name in files:
+            if _excluded(name):
+                continue
+            src, dst = Path(root) / name, target_dir / name
+            if reflink_ok:
+                try:
+                    _reflink(src, dst)
+                    counts["reflink"] += 1
+                    continue
+                except OSError:
+                    reflink_ok = False
+            shutil.copy2(src, dst)
+            counts["copy"] += 1
+    return counts
+
+
+class ProfileTemplates:
+    """Author: taobo.zhou
+    预热浏览器 profile 模板，按浏览器版本构建一次，每次启动复制一份独立副本。
+    Pre-warmed browser profile templates built once per browser version and cloned per launch.
+    """
+
+    def __init__(self, root: Path):
+        """Author: taobo.zhou
+        初始化模板目录。
+        
+            root: 模板根目录。
+        """
+
+        self._root = Path(root)
+
+    def _current_file(self, browser: str) -> Path:
+        """Author: taobo.zhou
+        返回记录当前模板的文件路径。
+        
+            browser: 浏览器类型。
+        """
+
+        return self._root / browser / "current.json"
+
+    def current(self, browser: str) -> Optional[dict]:
+        """Author: taobo.zhou
+        返回当前模板信息（version/path/built_at），不存在时返回 None。
+        
+            browser: 浏览器类型。
+        """
+
+        path = self._current_file(browser)
+        if not path.exists():
+            return None
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                info = json.load(f)
+        except Exception as exc:
+            log.warning("[PW][DRIVER] bad profile template info %s: %s", path, exc)
+            return None
+        return info if Path(info.get("path", "")).is_dir() else None
+
+    def invalidate(self, browser: str) -> None:
+        """Author: taobo.zhou
+        标记当前模板失效（例如浏览器已升级），下次使用时重新构建。
+        
+            browser: 浏览器类型。
+        """
+
+        try:
+            self._current_file(browser).unlink()
+        except FileNotFoundError:
+            pass
+
+    def ensure(self, browser: str, build: Callable[[Path], str], rebuild: bool = False) -> dict:
+        """Author: taobo.zhou
+        返回当前模板，不存在时加跨进程锁构建，只有一个 worker 执行构建。
+        
+            browser: 浏览器类型。
+            build: 以暂存目录为参数构建模板并返回浏览器版本的回调。
+            rebuild: 是否强制重新构建。
+        """
+
+        if not rebuild:
+            info = self.current(browser)
+            if info is not None:
+                return info
+        browser_dir = self._root / browser
+        browser_dir.mkdir(parents=True, exist_ok=True)
+        with file_lock(browser_dir / "build.lock"):
+            info = None if rebuild else self.current(browser)
+            if info is not None:
+                return info
+            staging = browser_dir / f"staging-{os.getpid()}"
+            shutil.rmtree(staging, ignore_errors=True)
+            started = time.perf_counter()
+            try:
+                version = build(staging) or "unknown"
+            except Exception:
+                shutil.rmtree(staging, ignore_errors=True)
+                raise
+            for root, dirs, files in os.walk(staging, topdown=False):
+                for name in files + dirs:
+                    path = Path(root) / name
+                    if not _excluded(name):
+                        continue
+                    if path.is_dir() and not path.is_symlink():
+                        shutil.rmtree(path, ignore_errors=True)
+                    elif path.exists() or path.is_symlink():
+                        path.unlink()
+            previous = self.current(browser)
+            final = browser_dir / f"{version}-{time.strftime('%Y%m%d%H%M%S')}"
+            os.replace(staging, final)
+            info = {"browser": browser, "version": version, "path": str(final), "built_at": time.time()}
+            tmp_path = self._current_file(browser).with_suffix(f".{os.getpid()}.tmp")
+            with tmp_path.open("w", encoding="utf-8") as f:
+                json.dump(info, f, ensure_ascii=False, indent=2)
+            os.replace(tmp_path, self._current_file(browser))
+            keep = {final.name, "clones", Path(previous["path"]).name if previous else ""}
+            for path in browser_dir.iterdir():
+                if path.is_dir() and path.name not in keep and not path.name.startswith("staging-"):
+                    shutil.rmtree(path, ignore_errors=True)
+            log.info(
+                "[PW][DRIVER] built profile template browser=%s version=%s in %.1fs -> %s",
+                browser,
+                version,
+                time.perf_counter() - started,
+                final,
+            )
+            return info
+
+    def clone_dir(self, browser: str) -> Path:
+        """Author: taobo.zhou
+        返回副本存放目录，与模板位于同一文件系统以便使用 reflink；副本随驱动退出删除，
+        已退出进程留下的副本由 driver_factory 按 PID 清理。
+        
+            browser: 浏览器类型。
+        """
+
+        path = self._root / browser / "clones"
+        path.mkdir(parents=True, exist_ok=True)
+        return path
+
+    def clone(self, info: dict, dest: Path) -> None:
+        """Author: taobo.zhou
+        将模板复制到目标目录并记录耗时。
+        
+            info: 模板信息。
+            dest: 目标目录。
+        """
+
+        started = time.perf_counter()
+        counts = clone_profile(Path(info["path"]), dest)
+        log.info(
+            "[PW][DRIVER] cloned profile template version=%s reflink=%s copy=%s in %.2fs",
+            info.get("version"),
+            counts["reflink"],
+            counts["copy"],
+            time.perf_counter() - started,
+        )
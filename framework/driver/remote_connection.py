@@ -0,0 +1,90 @@
+from __future__ import annotations
+
+from urllib.parse import urlparse, urlunparse
+
+import urllib3
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_DEFAULTS = {
+    "enable": True,
+    "host": "127.0.0.1",
+    "pool_maxsize": 4,
+    "connect_timeout": 5,
+    "read_timeout": 180,
+    "retries": 1,
+    "ignore_proxy": True,
+}
+
+
+def connection_settings(cfg: dict) -> dict:
+    """Author: taobo.zhou
+    返回命令通道配置（selenium.remote_connection），未配置的项使用默认值。
+    
+        cfg: 配置字典。
+    """
+
+    settings = dict(_DEFAULTS)
+    settings.update((cfg.get("selenium", {}) or {}).get("remote_connection", {}) or {})
+    return settings
+
+
+def _rewrite_host(url: str, host: str) -> str:
+    """Author: taobo.zhou
+    将驱动服务地址中的 localhost 替换为指定地址（Windows 上 localhost 先解析到 ::1，每次新建连接都会多等一轮）。
+    
+        url: 驱动服务地址。
+        host: 替换后的主机地址。
+    """
+
+    parsed = urlparse(url)
+    if not host or parsed.hostname != "localhost":
+        return url
+    netloc = f"{host}:{parsed.port}" if parsed.port else host
+    return urlunparse(parsed._replace(netloc=netloc))
+
+
+def tune_connection(executor, settings: dict) -> bool:
+    """Author: taobo.zhou
+    调整 WebDriver 命令通道：保持长连接、连接池容量、连接/读取超时、失败重试与本地代理，返回是否已调整。
+    
+        executor: 驱动的 command_executor（RemoteConnection）。
+        settings: connection_settings 返回的配置。
+    """
+
+    if not settings.get("enable", True):
+        return False
+    client_config = getattr(executor, "_client_config", None)
+    if client_config is None:
+        log.warning("[PW][DRIVER] selenium has no ClientConfig, keep default remote connection")
+        return False
+
+    client_config.remote_server_addr = _rewrite_host(client_config.remote_server_addr, settings.get("host"))
+    client_config.keep_alive = True
+    client_config.timeout = urllib3.Timeout(
+        connect=float(settings["connect_timeout"]),
+        read=float(settings["read_timeout"]),
+    )
+    # 驱动在本机，命令不应经过 HTTP_PROXY；调用方线程（健康监控、截图等）并发时连接池容量不足会反复新建连接
+    if settings.get("ignore_proxy", True):
+        executor._proxy_url = None
+    client_config.init_args_for_pool_manager = {
+        "init_args_for_pool_manager": {
+            "num_pools": 1,
+            "maxsize": max(1, int(settings["pool_maxsize"])),
+            "block": False,
+            "retries": urllib3.Retry(
+                total=int(settings["retries"]),
+                connect=int(settings["retries"]),
+                read=False,
+                redirect=False,
+            ),
+        }
+    }
+    previous = getattr(executor, "_conn", None)
+    executor._conn = executor._get_connection_manager()
+    if previous is not None:
+        previous.clear()
+    return True
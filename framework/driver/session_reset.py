@@ -0,0 +1,132 @@
+from __future__ import annotations
+
+import psutil
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_CLEAR_STORAGE_JS = """
+var done = arguments[arguments.length - 1];
+try { window.localStorage && window.localStorage.clear(); } catch (e) {}
+try { window.sessionStorage && window.sessionStorage.clear(); } catch (e) {}
+if (!window.indexedDB || !window.indexedDB.databases) { done(true); return; }
+window.indexedDB.databases().then(function (dbs) {
+  return Promise.all(dbs.map(function (db) {
+    return new Promise(function (resolve) {
+      var req = window.indexedDB.deleteDatabase(db.name);
+      req.onsuccess = req.onerror = req.onblocked = function () { resolve(); };
+    });
+  }));
+}).then(function () { done(true); }, function () { done(false); });
+"""
+
+
+def _clear_current_origin(driver, timeout: float) -> None:
+    """Author: taobo.zhou
+    清理当前页面所在源的 cookie、localStorage、sessionStorage 与 IndexedDB。
+    
+        driver: WebDriver 实例。
+        timeout: 清理脚本的最长执行时间（秒）。
+    """
+
+    url = driver.current_url or ""
+    if not url.startswith(("http://", "https://")):
+        return
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        origin = "/".join(url.split("/", 3)[:3])
+        try:
+            driver.execute_cdp_cmd("Storage.clearDataForOrigin", {"origin": origin, "storageTypes": "all"})
+            return
+        except Exception as exc:
+            log.debug("[PW][DRIVER] cdp clear failed for %s, fallback to js: %s", origin, exc)
+
+    driver.delete_all_cookies()
+    previous = None
+    try:
+        previous = driver.timeouts.script
+    except Exception:
+        pass
+    driver.set_script_timeout(timeout)
+    try:
+        driver.execute_async_script(_CLEAR_STORAGE_JS)
+    finally:
+        if previous is not None:
+            driver.set_script_timeout(previous)
+
+
+def reset_session(driver, timeout: float = 5.0) -> None:
+    """Author: taobo.zhou
+    原地重置浏览器会话：清理各窗口的站点数据、关闭多余窗口、回到 about:blank，并做一次健康探测。
+    
+        driver: WebDriver 实例。
+        timeout: 单个窗口清理脚本的最长执行时间（秒）。
+    """
+
+    handles = list(driver.window_handles)
+    for handle in handles[1:]:
+        driver.switch_to.window(handle)
+        _clear_current_origin(driver, timeout)
+        driver.close()
+    driver.switch_to.window(handles[0])
+    _clear_current_origin(driver, timeout)
+
+    if hasattr(driver, "execute_cdp_cmd"):
+        try:
+            driver.execute_cdp_cmd("Network.clearBrowserCookies", {})
+        except Exception:
+            pass
+    driver.get("about:blank")
+    driver.delete_all_cookies()
+
+    if driver.execute_script("return 1") != 1:
+        raise RuntimeError("driver health probe failed after reset")
+
+
+def _browser_processes(driver, root) -> list:
+    """Author: taobo.zhou
+    返回属于该会话的进程；驱动服务被多个会话共享时按 user-data-dir 区分浏览器进程。
+    
+        driver: WebDriver 实例。
+        root: 驱动服务进程。
+    """
+
+    children = root.children(recursive=True)
+    caps = getattr(driver, "capabilities", None) or {}
+    user_data_dir = (caps.get("chrome") or caps.get("msedge") or {}).get("userDataDir")
+    if not user_data_dir:
+        return [root] + children
+    procs = []
+    for child in root.children():
+        try:
+            if any(user_data_dir in arg for arg in child.cmdline()):
+                procs.append(child)
+                procs.extend(child.children(recursive=True))
+        except psutil.Error:
+            continue
+    return procs or [root] + children
+
+
+def driver_memory_mb(driver) -> float:
+    """Author: taobo.zhou
+    统计该会话浏览器进程树的常驻内存（MB），无法获取时返回 0。
+    
+        driver: WebDriver 实例。
+    """
+
+    process = getattr(getattr(driver, "service", None), "process", None)
+    pid = getattr(process, "pid", None)
+    if not pid:
+        return 0.0
+    try:
+        procs = _browser_processes(driver, psutil.Process(pid))
+    except psutil.Error:
+        return 0.0
+    total = 0
+    for proc in procs:
+        try:
+            total += proc.memory_info().rss
+        except psutil.Error:
+            continue
+    return total / (1024 * 1024)
@@ -31,14 +31,14 @@ class MouseMixin:
 
     def mouse_click(self, name, double: bool = False):
         """Author: taobo.zhou
-        滚动到元素后执行单击或双击。
+        滚动到元素并等待其停稳后执行单击或双击。
         
             name: 定位器名称。
             double: 是否执行双击。
         """
 
         self.scroll_and_wait(name)
-        self.sleep(0.5)
+        self.wait_element_settled(name)
         if double:
             self.double_click(name)
         else:
@@ -1,7 +1,196 @@
+import functools
+import inspect
 import time
 
+from selenium.common.exceptions import (
+    JavascriptException,
+    StaleElementReferenceException,
+    TimeoutException,
+)
 from selenium.webdriver.support import expected_conditions as EC
-from selenium.webdriver.support.ui import WebDriverWait
+
+from framework.core.case_budget import budgeted
+from framework.interactions.wait_engine import count_poll, default_policy, poll_until, recorded_wait
+
+# 单次 execute_async_script 的最长时间（秒），需小于驱动的脚本超时（默认 30 秒），更长的等待分多次调用
+_ASYNC_CHUNK = 25.0
+
+# 页面跳转或重新渲染中断等待脚本时抛出的异常，稍等后在新页面重试；会话失效、窗口关闭等其他驱动异常直接抛出
+_SCRIPT_INTERRUPTED = (JavascriptException, StaleElementReferenceException, TimeoutException)
+_INTERRUPT_BACKOFF = 0.2
+
+# 首次调用时在页面安装 MutationObserver、滚动监听与 XHR/fetch 计数，之后轮询直到静默窗口内无变化且无进行中的请求
+_DOM_STABLE_JS = """
+var quietMs = arguments[0], timeoutMs = arguments[1], longPollMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var s = window.__pwStability;
+if (!s) {
+  s = window.__pwStability = {last: Date.now(), seq: 0, pending: {}, resources: 0};
+  var touch = function () { s.last = Date.now(); };
+  new MutationObserver(touch).observe(document, {
+    subtree: true, childList: true, attributes: true, characterData: true
+  });
+  window.addEventListener('scroll', touch, true);
+  var begin = function () { var id = ++s.seq; s.pending[id] = Date.now(); touch(); return id; };
+  var end = function (id) { delete s.pending[id]; touch(); };
+  var send = XMLHttpRequest.prototype.send;
+  XMLHttpRequest.prototype.send = function () {
+    var id = begin();
+    this.addEventListener('loadend', function () { end(id); });
+    return send.apply(this, arguments);
+  };
+  if (window.fetch) {
+    var fetch = window.fetch;
+    window.fetch = function () {
+      var id = begin();
+      return fetch.apply(window, arguments).finally(function () { end(id); });
+    };
+  }
+}
+var started = Date.now();
+(function check() {
+  var now = Date.now();
+  var resources = performance.getEntriesByType('resource').length;
+  if (resources !== s.resources) { s.resources = resources; s.last = now; }
+  var pending = 0;
+  for (var id in s.pending) { if (now - s.pending[id] < longPollMs) { pending++; } }
+  // 静默窗口从本次调用开始计算，避免刚触发的操作（点击后异步渲染）尚未产生变更就判定为稳定
+  var quiet = now - Math.max(s.last, started);
+  if (document.readyState === 'complete' && pending === 0 && quiet >= quietMs) {
+    done({stable: true});
+  } else if (now - started >= timeoutMs) {
+    done({stable: false, pending: pending, quiet_ms: quiet, ready: document.readyState});
+  } else {
+    setTimeout(check, 50);
+  }
+})();
+"""
+
+# 元素位置与尺寸连续若干帧不变即视为停稳（平滑滚动、展开动画结束）
+_ELEMENT_SETTLED_JS = """
+var el = arguments[0], frames = arguments[1], timeoutMs = arguments[2];
+var done = arguments[arguments.length - 1];
+var started = Date.now(), last = null, same = 0;
+(function check() {
+  var r = el.getBoundingClientRect();
+  var key = [r.top, r.left, r.width, r.height].join(',');
+  same = key === last ? same + 1 : 0;
+  last = key;
+  if (same >= frames) {
+    done(true);
+  } else if (Date.now() - started >= timeoutMs) {
+    done(false);
+  } else {
+    requestAnimationFrame(check);
+  }
+})();
+"""
+
+# 在页面内按定位器查找各目标元素并判断条件，DOM 变更（合并到下一帧）与兜底定时器触发检查，满足 any/all 立即返回；
+# 条件表达式直接拼入脚本（驱动执行的脚本不受页面 CSP 限制，new Function 会受限），表达式中 el 为元素或 null
+_CONDITIONS_JS = """
+var targets = arguments[0], mode = arguments[1], timeoutMs = arguments[2], pollMs = arguments[3];
+var done = arguments[arguments.length - 1];
+var tests = [/*CONDITIONS*/];
+var find = function (by, value) {
+  switch (by) {
+    case 'id': return document.getElementById(value);
+    case 'name': return document.getElementsByName(value)[0] || null;
+    case 'css selector': return document.querySelector(value);
+    case 'class name': return document.getElementsByClassName(value)[0] || null;
+    case 'xpath':
+      return document.evaluate(value, document, null, XPathResult.FIRST_ORDERED_NODE_TYPE, null).singleNodeValue;
+  }
+  throw new Error('unsupported locator type: ' + by);
+};
+var finished = false, scheduled = false, lastError = null, observer, timer, poller;
+var finish = function (met) {
+  if (finished) { return; }
+  finished = true;
+  observer.disconnect();
+  clearTimeout(timer);
+  clearInterval(poller);
+  done({met: met, error: lastError});
+};
+var check = function () {
+  scheduled = false;
+  if (finished) { return; }
+  var met = [];
+  for (var i = 0; i < tests.length; i++) {
+    try {
+      if (tests[i](find(targets[i][0], targets[i][1]))) { met.push(i); }
+    } catch (e) {
+      lastError = String(e);
+    }
+  }
+  if (mode === 'any' ? met.length > 0 : met.length === tests.length) { finish(met); }
+};
+var schedule = function () {
+  if (!scheduled) { scheduled = true; requestAnimationFrame(check); }
+};
+observer = new MutationObserver(schedule);
+observer.observe(document, {subtree: true, childList: true, attributes: true, characterData: true});
+timer = setTimeout(function () { finish(null); }, timeoutMs);
+// 窗口不可见时 requestAnimationFrame 暂停，且属性（property）变化不产生 DOM 变更，用定时器兜底
+poller = setInterval(check, pollMs);
+check();
+"""
+
+# wait_any / wait_all 未指定条件时的默认条件：元素可见
+_VISIBLE_JS = (
+    "el && !!(el.offsetWidth || el.offsetHeight || el.getClientRects().length)"
+    " && getComputedStyle(el).visibility !== 'hidden'"
+)
+
+
+
+def _wait_step(param="timeout", record=True):
+    """Author: taobo.zhou
+    装饰等待方法：超时为 None 时取定位器 wait.timeout 或 selenium.explicit_wait，再取 min(超时, 用例剩余预算)，
+    并按 页面.方法(定位器) 记录消耗的预算、轮询次数与耗时。
+    
+        param: 超时参数名。
+        record: 是否记录轮询统计。
+    """
+
+    def decorator(fn):
+        """Author: taobo.zhou
+        包装等待方法。
+        
+            fn: 等待方法。
+        """
+
+        signature = inspect.signature(fn)
+
+        @functools.wraps(fn)
+        def wrapper(self, *args, **kwargs):
+            """Author: taobo.zhou
+            在用例预算下执行等待方法。
+            
+                self: 页面对象。
+                *args: 位置参数。
+                **kwargs: 关键字参数。
+            """
+
+            bound = signature.bind(self, *args, **kwargs)
+            bound.apply_defaults()
+            name = bound.arguments.get("name")
+            name = name if isinstance(name, str) else None
+            step = f"{self._page_name}.{fn.__name__}" + (f"({name})" if name else "")
+            if bound.arguments[param] is None:
+                bound.arguments[param] = self._wait_policy(name).timeout
+            with budgeted(step, bound.arguments[param]) as timeout:
+                bound.arguments[param] = timeout
+                if not record:
+                    return fn(*bound.args, **bound.kwargs)
+                with recorded_wait(step) as outcome:
+                    result = fn(*bound.args, **bound.kwargs)
+                    outcome["ok"] = result is not None and result is not False
+                    return result
+
+        return wrapper
+
+    return decorator
 
 
 class WaitMixin:
@@ -10,84 +199,254 @@ class WaitMixin:
     Wait interaction mixin providing page and element waits.
     """
 
-    def wait_page_ready(self, timeout=30):
+    def _wait_policy(self, name=None):
         """Author: taobo.zhou
-        等待页面加载完成且无活动请求。
+        返回等待策略：配置中的默认策略，再用定位器的 wait 配置覆盖。
         
-            timeout: 最大等待时间（秒）。
+            name: 定位器名称，为空时使用默认策略。
         """
 
-        WebDriverWait(self.__driver, timeout).until(
-            lambda d: d.execute_script(
+        policy = default_policy()
+        if name and hasattr(self._locators, "get_wait"):
+            policy = policy.merged(self._locators.get_wait(name))
+        return policy
+
+    @_wait_step()
+    def wait_page_ready(self, timeout=None):
+        """Author: taobo.zhou
+        等待页面加载完成且无活动请求，按退避间隔轮询，完成返回 True。
+        
+            timeout: 最大等待时间（秒），为空时使用 selenium.explicit_wait。
+        """
+
+        return poll_until(
+            lambda: self.__driver.execute_script(
                 """
                 return document.readyState === 'complete'
                 && (!window.jQuery || jQuery.active === 0)
             """
-            )
+            ),
+            self._wait_policy(),
+            timeout,
+            f"{self._page_name} page not ready",
         )
 
-    def wait_dom_stable(self, seconds=0.5):
+    @_wait_step()
+    def wait_dom_stable(self, quiet=0.5, timeout=10, long_poll=10):
         """Author: taobo.zhou
-        等待指定秒数以确保 DOM 稳定。
+        等待 DOM 稳定：页面加载完成、无进行中的 XHR/fetch，且 DOM 变更与滚动已静默 quiet 秒，超时返回 False。
         
-            seconds: 等待时间（秒）。
+            quiet: 静默窗口（秒）。
+            timeout: 最大等待时间（秒）。
+            long_poll: 进行中超过该时间（秒）的请求视为长轮询，不再计入。
         """
 
-        time.sleep(seconds)
+        started = time.time()
+        deadline = started + timeout
+        result = {}
+        while True:
+            chunk = max(0.1, min(deadline - time.time(), _ASYNC_CHUNK))
+            count_poll()
+            try:
+                result = self.__driver.execute_async_script(
+                    _DOM_STABLE_JS, quiet * 1000, chunk * 1000, long_poll * 1000
+                ) or {}
+            except _SCRIPT_INTERRUPTED as exc:
+                # 等待期间发生页面跳转时脚本被中断，稍等后在新页面重新安装监听
+                result = {}
+                self._log.debug(f"[WAIT_DOM_STABLE] {self._page_name} script interrupted: {exc}")
+                time.sleep(min(_INTERRUPT_BACKOFF, max(0.0, deadline - time.time())))
+            if result.get("stable"):
+                self._log.info(
+                    f"[WAIT_DOM_STABLE] {self._page_name} stable after {time.time() - started:.2f}s"
+                )
+                return True
+            if time.time() >= deadline:
+                self._log.warning(
+                    f"[WAIT_DOM_STABLE] {self._page_name} not stable after {timeout}s: {result}"
+                )
+                return False
 
-    def wait_visible(self, name, timeout=30):
+    @_wait_step()
+    def wait_element_settled(self, name, timeout=3, frames=3):
         """Author: taobo.zhou
-        等待元素可见。
+        等待元素位置与尺寸连续若干帧不变（平滑滚动或动画结束），超时返回 False。
         
             name: 定位器名称。
             timeout: 最大等待时间（秒）。
+            frames: 需要连续不变的帧数。
+        """
+
+        count_poll()
+        try:
+            settled = self.__driver.execute_async_script(
+                _ELEMENT_SETTLED_JS, self._find(name), frames, min(timeout, _ASYNC_CHUNK) * 1000
+            )
+        except _SCRIPT_INTERRUPTED as exc:
+            self._log.debug(f"[WAIT_SETTLED] {self._page_name}.{name} failed: {exc}")
+            return False
+        if not settled:
+            self._log.warning(f"[WAIT_SETTLED] {self._page_name}.{name} still moving after {timeout}s")
+        return bool(settled)
+
+    @_wait_step()
+    def wait_visible(self, name, timeout=None):
+        """Author: taobo.zhou
+        等待元素可见，按退避间隔轮询（先快后慢，最大间隔为 selenium.poll_frequency），可见返回 True。
+        
+            name: 定位器名称。
+            timeout: 最大等待时间（秒），为空时使用定位器 wait.timeout 或 selenium.explicit_wait。
         """
 
         by, value = self._get_locator(name)
-        WebDriverWait(self.__driver, timeout).until(
-            EC.visibility_of_element_located((by, value))
+        condition = EC.visibility_of_element_located((by, value))
+        poll_until(
+            lambda: condition(self.__driver),
+            self._wait_policy(name),
+            timeout,
+            f"{self._page_name}.{name} not visible",
         )
+        return True
 
-    def wait_for_element_disabled_to_be_removed(self, name, timeout=30, poll_interval=0.5):
+    def _wait_in_browser(self, targets, mode, timeout, poll_interval):
         """Author: taobo.zhou
-        等待元素的 disabled 属性被移除。
+        在浏览器内等待多个目标的条件，返回满足条件的目标下标列表，超时返回 None。
+        
+            targets: (定位器名称, JS 条件表达式) 列表。
+            mode: any 表示任一满足即返回，all 表示全部同时满足才返回。
+            timeout: 最大等待时间（秒），为空时使用 selenium.explicit_wait。
+            poll_interval: 页面内兜底检查间隔（秒）。
+        """
+
+        locators = [list(self._get_locator(name)) for name, _ in targets]
+        script = _CONDITIONS_JS.replace(
+            "/*CONDITIONS*/",
+            ",\n".join(f"function (el) {{ return ({condition}); }}" for _, condition in targets),
+        )
+        deadline = time.time() + timeout
+        result = {}
+        while True:
+            chunk = max(0.1, min(deadline - time.time(), _ASYNC_CHUNK))
+            count_poll()
+            try:
+                result = self.__driver.execute_async_script(
+                    script, locators, mode, chunk * 1000, poll_interval * 1000
+                ) or {}
+            except _SCRIPT_INTERRUPTED as exc:
+                # 页面跳转会中断脚本，稍等后在新页面继续等待
+                result = {}
+                self._log.debug(f"[WAIT_JS] {self._page_name} script interrupted: {exc}")
+                time.sleep(min(_INTERRUPT_BACKOFF, max(0.0, deadline - time.time())))
+            if result.get("met") is not None:
+                return result["met"]
+            if time.time() >= deadline:
+                if result.get("error"):
+                    self._log.warning(f"[WAIT_JS] {self._page_name} last error: {result['error']}")
+                return None
+
+    @staticmethod
+    def _normalize_outcomes(outcomes):
+        """Author: taobo.zhou
+        将等待目标统一为 (结果名称, 定位器名称, JS 条件) 列表。
+        
+            outcomes: 结果名称到定位器名称或 (定位器名称, JS 条件) 的映射。
+        """
+
+        normalized = []
+        for key, target in outcomes.items():
+            name, condition = (target, _VISIBLE_JS) if isinstance(target, str) else target
+            normalized.append((key, name, condition or _VISIBLE_JS))
+        return normalized
+
+    @_wait_step()
+    def wait_until_js(self, name, condition, timeout=None, poll_interval=0.25):
+        """Author: taobo.zhou
+        在浏览器内等待条件成立：每次 DOM 变更后重新按定位器查找元素并计算 JS 表达式（el 为元素或 null），
+        条件成立立即返回 True，超时返回 False；等待不超过 25 秒时只需一次 WebDriver 调用。
         
             name: 定位器名称。
-            timeout: 最大等待时间（秒）。
-            poll_interval: 轮询间隔（秒）。
+            condition: JS 表达式，例如 "el && !el.hasAttribute('disabled')"。
+            timeout: 最大等待时间（秒），为空时使用 selenium.explicit_wait。
+            poll_interval: 页面内兜底检查间隔（秒）。
         """
 
-        start_time = time.time()
-        by, value = self._get_locator(name)
+        return self._wait_in_browser([(name, condition)], "any", timeout, poll_interval) is not None
+
+    @_wait_step()
+    def wait_any(self, outcomes, timeout=None, poll_interval=0.25):
+        """Author: taobo.zhou
+        同时等待多个结果，返回最先出现的结果名称（同时满足时按字典顺序取第一个），超时返回 None。
+        
+            outcomes: 结果名称到定位器名称（等待可见）或 (定位器名称, JS 条件) 的映射，
+                例如 {"succeeded": "succeeded", "error": "error_message"}。
+            timeout: 最大等待时间（秒），为空时使用 selenium.explicit_wait。
+            poll_interval: 页面内兜底检查间隔（秒）。
+        """
 
+        normalized = self._normalize_outcomes(outcomes)
+        started = time.time()
+        met = self._wait_in_browser([(n, c) for _, n, c in normalized], "any", timeout, poll_interval)
+        if met is None:
+            self._log.warning(
+                f"[WAIT_ANY] {self._page_name} none of {list(outcomes)} after {timeout}s"
+            )
+            return None
+        key = normalized[met[0]][0]
+        self._log.info(f"[WAIT_ANY] {self._page_name} -> {key} after {time.time() - started:.2f}s")
+        return key
+
+    @_wait_step()
+    def wait_all(self, outcomes, timeout=None, poll_interval=0.25):
+        """Author: taobo.zhou
+        等待多个条件同时满足，满足返回 True，超时返回 False。
+        
+            outcomes: 结果名称到定位器名称（等待可见）或 (定位器名称, JS 条件) 的映射。
+            timeout: 最大等待时间（秒），为空时使用 selenium.explicit_wait。
+            poll_interval: 页面内兜底检查间隔（秒）。
+        """
+
+        normalized = self._normalize_outcomes(outcomes)
+        started = time.time()
+        met = self._wait_in_browser([(n, c) for _, n, c in normalized], "all", timeout, poll_interval)
+        if met is None:
+            self._log.warning(f"[WAIT_ALL] {self._page_name} {list(outcomes)} not all met after {timeout}s")
+            return False
+        self._log.info(f"[WAIT_ALL] {self._page_name} {list(outcomes)} after {time.time() - started:.2f}s")
+        return True
+
+    @_wait_step()
+    def wait_for_element_disabled_to_be_removed(self, name, timeout=None, poll_interval=0.5):
+        """Author: taobo.zhou
+        等待元素的 disabled 属性被移除（在浏览器内等待，移除后立即返回）。
+        
+            name: 定位器名称。
+            timeout: 最大等待时间（秒），为空时使用 selenium.explicit_wait。
+            poll_interval: 页面内兜底检查间隔（秒）。
+        """
+
+        start_time = time.time()
         self._log.info(
             f"[WAIT_DISABLED_REMOVE] {self._page_name}.{name} timeout={timeout}s"
         )
 
-        while True:
-            try:
-                el = self.__driver.find_element(by, value)
-                disabled = el.get_attribute("disabled")
-
-                if disabled is None or str(disabled).lower() != "true":
-                    elapsed = time.time() - start_time
-                    self._log.info(
-                        f"元素 {name} disabled 已移除，等待时间：{elapsed:.2f}s"
-                    )
-                    return True
-
-            except Exception as exc:
-                self._log.debug(f"获取元素 {name} disabled 失败：{exc}")
-
-            if time.time() - start_time >= timeout:
-                elapsed = time.time() - start_time
-                self._log.error(
-                    f"等待超时：元素 {name} disabled 仍为 true，等待时间：{elapsed:.2f}s"
-                )
-                return False
-
-            time.sleep(poll_interval)
+        removed = self.wait_until_js(
+            name,
+            "el && !el.hasAttribute('disabled') && el.disabled !== true",
+            timeout,
+            poll_interval,
+        )
+        elapsed = time.time() - start_time
+        if removed:
+            self._log.info(
+                f"元素 {name} disabled 已移除，等待时间：{elapsed:.2f}s"
+            )
+            return True
+        self._log.error(
+            f"等待超时：元素 {name} disabled 仍为 true，等待时间：{elapsed:.2f}s"
+        )
+        return False
 
+    @_wait_step("seconds", record=False)
     def sleep(self, seconds: float):
         """Author: taobo.zhou
         强制休眠指定时间。
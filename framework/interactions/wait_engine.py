@@ -0,0 +1,216 @@
+from __future__ import annotations
+
+import functools
+import threading
+import time
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass, replace
+from typing import Callable, Dict, Iterator, List, Optional
+
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from framework.utils.config_loader import load_config
+
+_IGNORED_EXCEPTIONS = (NoSuchElementException,)
+_POLLS: ContextVar[Optional[List[int]]] = ContextVar("WAIT_POLLS", default=None)
+
+
+@dataclass(frozen=True)
+class WaitPolicy:
+    """Author: taobo.zhou
+    等待策略：默认超时与指数退避的轮询间隔（从 initial 开始每次乘以 factor，不超过 max_interval）。
+    Wait policy holding the default timeout and exponential backoff polling intervals.
+    """
+
+    timeout: float
+    initial: float
+    factor: float
+    max_interval: float
+
+    def merged(self, override: Optional[dict]) -> "WaitPolicy":
+        """Author: taobo.zhou
+        返回用定位器 wait 配置覆盖后的策略。
+        
+            override: 定位器中的 wait 配置（timeout/initial/factor/max_interval）。
+        """
+
+        if not override:
+            return self
+        fields = {k: float(v) for k, v in override.items() if k in ("timeout", "initial", "factor", "max_interval")}
+        return replace(self, **fields)
+
+    def intervals(self) -> Iterator[float]:
+        """Author: taobo.zhou
+        依次生成轮询间隔（秒）。
+         无。
+        """
+
+        interval = min(self.initial, self.max_interval)
+        while True:
+            yield interval
+            interval = min(interval * self.factor, self.max_interval)
+
+
+@functools.lru_cache(maxsize=1)
+def default_policy() -> WaitPolicy:
+    """Author: taobo.zhou
+    按配置创建默认等待策略：超时取 selenium.explicit_wait，最大轮询间隔取 selenium.poll_frequency，
+    退避起点与倍数取 selenium.wait_backoff；进程内只读取一次。
+     无。
+    """
+
+    selenium_cfg = load_config().get("selenium", {}) or {}
+    backoff_cfg = selenium_cfg.get("wait_backoff", {}) or {}
+    return WaitPolicy(
+        timeout=float(selenium_cfg.get("explicit_wait", 30)),
+        initial=float(backoff_cfg.get("initial", 0.05)),
+        factor=max(1.0, float(backoff_cfg.get("factor", 1.6))),
+        max_interval=float(selenium_cfg.get("poll_frequency", 0.5)),
+    )
+
+
+def count_poll() -> None:
+    """Author: taobo.zhou
+    当前等待步骤的轮询（WebDriver 往返）次数加一。
+     无。
+    """
+
+    polls = _POLLS.get()
+    if polls is not None:
+        polls[0] += 1
+
+
+def poll_until(condition: Callable[[], object], policy: WaitPolicy, timeout: Optional[float] = None, message: str = ""):
+    """Author: taobo.zhou
+    按退避间隔轮询条件直到返回真值并返回该值，先快后慢，超时抛出 TimeoutException；条件抛出 NoSuchElementException 视为未满足。
+    
+        condition: 无参条件函数。
+        policy: 等待策略。
+        timeout: 最大等待时间（秒），为空时使用策略的超时。
+        message: 超时异常信息。
+    """
+
+    timeout = policy.timeout if timeout is None else float(timeout)
+    started = time.monotonic()
+    intervals = policy.intervals()
+    polls = 0
+    while True:
+        polls += 1
+        count_poll()
+        try:
+            value = condition()
+            if value:
+                return value
+        except _IGNORED_EXCEPTIONS:
+            pass
+        remaining = timeout - (time.monotonic() - started)
+        if remaining <= 0:
+            raise TimeoutException(f"{message} (timeout {timeout:.1f}s, {polls} polls)")
+        time.sleep(min(next(intervals), remaining))
+
+
+class WaitStats:
+    """Author: taobo.zhou
+    按用例统计各等待步骤的次数、轮询次数、耗时与超时次数，用于评估并行 worker 对驱动的压力。
+    Per-case statistics of wait steps: calls, polls, time to satisfy and timeouts.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        """Author: taobo.zhou
+        初始化统计状态。
+         无。
+        """
+
+        self._lock = threading.Lock()
+        self._active = False
+        self._steps: Dict[str, dict] = {}
+
+    @classmethod
+    def get(cls):
+        """Author: taobo.zhou
+        获取进程内单例。
+        
+            cls: 类对象。
+        """
+
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = WaitStats()
+            return cls._instance
+
+    def begin_case(self) -> None:
+        """Author: taobo.zhou
+        开始统计一个用例。
+         无。
+        """
+
+        with self._lock:
+            self._active = True
+            self._steps = {}
+
+    def record(self, step: str, polls: int, seconds: float, ok: bool) -> None:
+        """Author: taobo.zhou
+        记录一次等待，用例之外的等待不统计。
+        
+            step: 步骤名称（页面.方法(定位器)）。
+            polls: 轮询（WebDriver 往返）次数。
+            seconds: 耗时（秒）。
+            ok: 条件是否满足。
+        """
+
+        with self._lock:
+            if not self._active:
+                return
+            entry = self._steps.setdefault(step, {"count": 0, "polls": 0, "seconds": 0.0, "max": 0.0, "timeouts": 0})
+            entry["count"] += 1
+            entry["polls"] += polls
+            entry["seconds"] += seconds
+            entry["max"] = max(entry["max"], seconds)
+            if not ok:
+                entry["timeouts"] += 1
+
+    def end_case(self) -> Optional[dict]:
+        """Author: taobo.zhou
+        结束当前用例并返回汇总（总次数、总轮询次数、总耗时与各步骤明细），没有等待时返回 None。
+         无。
+        """
+
+        with self._lock:
+            steps, self._steps, self._active = self._steps, {}, False
+        if not steps:
+            return None
+        for entry in steps.values():
+            entry["seconds"] = round(entry["seconds"], 3)
+            entry["max"] = round(entry["max"], 3)
+        return {
+            "count": sum(e["count"] for e in steps.values()),
+            "polls": sum(e["polls"] for e in steps.values()),
+            "seconds": round(sum(e["seconds"] for e in steps.values()), 3),
+            "steps": dict(sorted(steps.items(), key=lambda kv: kv[1]["seconds"], reverse=True)),
+        }
+
+
+@contextmanager
+def recorded_wait(step: str):
+    """Author: taobo.zhou
+    统计一个等待步骤的轮询次数与耗时，返回的字典中 ok 由调用方设置；嵌套等待计入外层步骤。
+    
+        step: 步骤名称。
+    """
+
+    if _POLLS.get() is not None:
+        yield {}
+        return
+    polls = [0]
+    token = _POLLS.set(polls)
+    outcome = {"ok": False}
+    started = time.monotonic()
+    try:
+        yield outcome
+    finally:
+        _POLLS.reset(token)
+        WaitStats.get().record(step, polls[0], time.monotonic() - started, bool(outcome.get("ok")))
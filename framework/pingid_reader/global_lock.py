@@ -4,6 +4,8 @@ import os
 from contextlib import contextmanager
 from pathlib import Path
 
+from framework.utils.file_lock import file_lock
+
 
 def _default_lock_path() -> Path:
     """Author: taobo.zhou
@@ -25,31 +27,6 @@ def pingid_global_lock():
     """
 
     lockfile = os.environ.get("PW_PINGID_LOCKFILE")
-    lock_path = Path(lockfile) if lockfile else _default_lock_path()
-    lock_path.parent.mkdir(parents=True, exist_ok=True)
-
-    fh = lock_path.open("a+")
-    try:
-        if os.name == "nt":
-            import msvcrt
-
-            fh.seek(0)
-            msvcrt.locking(fh.fileno(), msvcrt.LK_LOCK, 1)
-        else:
-            import fcntl
-
-            fcntl.flock(fh.fileno(), fcntl.LOCK_EX)
+    with file_lock(Path(lockfile) if lockfile else _default_lock_path()):
         yield
-    finally:
-        try:
-            if os.name == "nt":
-                import msvcrt
-
-                fh.seek(0)
-                msvcrt.locking(fh.fileno(), msvcrt.LK_UNLCK, 1)
-            else:
-                import fcntl
-
-                fcntl.flock(fh.fileno(), fcntl.LOCK_UN)
-        finally:
-            fh.close()
+
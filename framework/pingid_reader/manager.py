@@ -10,6 +10,7 @@ from pathlib import Path
 from framework.utils.config_loader import load_config
 from .global_lock import pingid_global_lock
 from .window import (
+    is_window_alive,
     wait_for_pingid_window,
     normalize_pingid_window,
     click_copy_button,
@@ -74,7 +75,7 @@ class PingIDOtpManager:
          无。
         """
 
-        if self._ready and self._hwnd:
+        if self._ready and is_window_alive(self._hwnd):
             return
 
         log.info("Ensuring PingID is ready")
@@ -99,6 +100,16 @@ class PingIDOtpManager:
         self._ready = True
         log.info("PingID ready")
 
+    def warm_up(self):
+        """Author: taobo.zhou
+        在全局锁内预先启动 PingID，之后的 exclusive()/copy_otp() 可直接使用已就绪的窗口。
+         无。
+        """
+
+        with pingid_global_lock():
+            with PingIDOtpManager._use_lock:
+                self.ensure_ready()
+
     def shutdown(self):
         """Author: taobo.zhou
         关闭 PingID 应用并重置状态。
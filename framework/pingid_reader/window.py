@@ -50,6 +50,19 @@ def find_pingid_hwnd(window_title_keyword: str) -> int | None:
     return result
 
 
+def is_window_alive(hwnd: int | None) -> bool:
+    """Author: taobo.zhou
+    判断窗口句柄是否仍然有效且可见（PingID 可能已被其他 worker 关闭）。
+    
+        hwnd: 窗口句柄。
+    """
+
+    try:
+        return bool(hwnd) and bool(win32gui.IsWindow(hwnd)) and bool(win32gui.IsWindowVisible(hwnd))
+    except Exception:
+        return False
+
+
 def wait_for_pingid_window(
     *,
     title_keyword: str,
@@ -0,0 +1,153 @@
+from __future__ import annotations
+
+import threading
+import time
+from typing import Dict
+
+import psutil
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_MB = 1024 * 1024
+
+
+class AdaptiveConcurrency:
+    """Author: taobo.zhou
+    按空闲内存与 CPU 占用决定是否再启动一个 worker，资源紧张时暂停派发。
+    Admission controller that starts another worker only while free memory and CPU leave headroom.
+    """
+
+    def __init__(
+        self,
+        max_workers: int,
+        min_workers: int = 1,
+        min_free_memory_mb: float = 1536,
+        memory_per_worker_mb: float = 700,
+        max_cpu_percent: float = 85.0,
+        sample_interval: float = 2.0,
+        start_interval: float = 10.0,
+    ):
+        """Author: taobo.zhou
+        初始化并发控制器。
+        
+            max_workers: 并发上限。
+            min_workers: 不受资源限制、始终允许的并发数。
+            min_free_memory_mb: 启动新 worker 后至少保留的空闲内存（MB）。
+            memory_per_worker_mb: 预估单个 worker（含浏览器）占用的内存（MB）。
+            max_cpu_percent: CPU 占用超过该值时暂停派发。
+            sample_interval: 资源采样间隔（秒）。
+            start_interval: 并发突破历史最大值前距上次派发的最短间隔（秒），等待新浏览器占满内存。
+        """
+
+        self._max_workers = max(1, int(max_workers))
+        self._min_workers = max(1, min(int(min_workers), self._max_workers))
+        self._min_free = float(min_free_memory_mb) * _MB
+        self._per_worker = float(memory_per_worker_mb) * _MB
+        self._max_cpu = float(max_cpu_percent)
+        self._sample_interval = float(sample_interval)
+        self._start_interval = float(start_interval)
+        self._lock = threading.Lock()
+        self._sample_at = 0.0
+        self._available = 0.0
+        self._cpu = 0.0
+        self._last_start = 0.0
+        self._paused = False
+        self._pause_started = 0.0
+        self._paused_seconds = 0.0
+        self._pause_count = 0
+        self._peak = 0
+        self._min_available = None
+        psutil.cpu_percent(interval=None)
+
+    def _sample(self, now: float) -> None:
+        """Author: taobo.zhou
+        按采样间隔刷新空闲内存与 CPU 占用。
+        
+            now: 当前时间戳。
+        """
+
+        if now - self._sample_at < self._sample_interval:
+            return
+        self._sample_at = now
+        self._available = float(psutil.virtual_memory().available)
+        self._cpu = float(psutil.cpu_percent(interval=None))
+        if self._min_available is None or self._available < self._min_available:
+            self._min_available = self._available
+
+    def admit(self, running: int) -> bool:
+        """Author: taobo.zhou
+        判断在已有 running 个执行中工作项时能否再派发一个。
+        
+            running: 当前执行中的工作项数量。
+        """
+
+        now = time.time()
+        with self._lock:
+            if running >= self._max_workers:
+                return False
+            if running < self._min_workers:
+                return self._started(running, now)
+
+            self._sample(now)
+            reason = None
+            if self._available - self._per_worker < self._min_free:
+                reason = f"free_mem={self._available / _MB:.0f}MB"
+            elif self._cpu > self._max_cpu:
+                reason = f"cpu={self._cpu:.0f}%"
+            elif running + 1 > self._peak and now - self._last_start < self._start_interval:
+                return False
+
+            if reason is not None:
+                if not self._paused:
+                    self._paused = True
+                    self._pause_started = now
+                    self._pause_count += 1
+                    log.warning("[PW][CONCURRENCY] pause dispatch at running=%s (%s)", running, reason)
+                return False
+            if self._paused:
+                self._paused = False
+                self._paused_seconds += now - self._pause_started
+                log.info(
+                    "[PW][CONCURRENCY] resume dispatch at running=%s free_mem=%.0fMB cpu=%.0f%%",
+                    running,
+                    self._available / _MB,
+                    self._cpu,
+                )
+            return self._started(running, now)
+
+    def _started(self, running: int, now: float) -> bool:
+        """Author: taobo.zhou
+        记录一次派发并更新达到的最大并发。
+        
+            running: 派发前执行中的工作项数量。
+            now: 当前时间戳。
+        """
+
+        self._last_start = now
+        if running + 1 > self._peak:
+            self._peak = running + 1
+            log.info("[PW][CONCURRENCY] concurrency reached %s/%s", self._peak, self._max_workers)
+        return True
+
+    def summary(self) -> Dict[str, object]:
+        """Author: taobo.zhou
+        返回本次运行的并发统计，用于写入运行目录。
+         无。
+        """
+
+        with self._lock:
+            paused_seconds = self._paused_seconds
+            if self._paused:
+                paused_seconds += time.time() - self._pause_started
+            return {
+                "max_workers": self._max_workers,
+                "min_workers": self._min_workers,
+                "peak_concurrency": self._peak,
+                "pause_count": self._pause_count,
+                "paused_seconds": round(paused_seconds, 1),
+                "min_free_memory_mb": round((self._min_available or 0.0) / _MB),
+                "total_memory_mb": round(psutil.virtual_memory().total / _MB),
+                "cpu_count": psutil.cpu_count(),
+            }
@@ -0,0 +1,459 @@
+from __future__ import annotations
+
+import itertools
+import json
+import threading
+import time
+from collections import deque
+from dataclasses import asdict, dataclass
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Deque, Dict, List, Optional, Set, Tuple, Union
+
+from framework.runner.scheduler import ItemOutcome, WorkItem
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+Address = Union[Tuple[str, int], str]
+
+# 旧版本 config.yaml 中公开的默认密钥，不再接受
+PUBLIC_AUTHKEY = b"robot_test_coordinator"
+
+
+def send_message(conn, msg: dict) -> None:
+    """Author: taobo.zhou
+    以 JSON 发送消息；不使用 Connection.send，避免对端反序列化 pickle 时执行任意代码。
+    
+        conn: multiprocessing 连接。
+        msg: 可 JSON 序列化的消息字典。
+    """
+
+    conn.send_bytes(json.dumps(msg, ensure_ascii=False).encode("utf-8"))
+
+
+def recv_message(conn) -> dict:
+    """Author: taobo.zhou
+    接收并解析 JSON 消息，内容不是 JSON 对象时抛出 ValueError。
+    
+        conn: multiprocessing 连接。
+    """
+
+    msg = json.loads(conn.recv_bytes().decode("utf-8"))
+    if not isinstance(msg, dict):
+        raise ValueError("message must be a JSON object")
+    return msg
+
+
+def parse_address(value: str) -> Address:
+    """Author: taobo.zhou
+    解析协调器地址，host:port 为 TCP，其余视为 Unix socket 路径。
+    
+        value: 地址字符串。
+    """
+
+    host, sep, port = str(value).rpartition(":")
+    if sep and port.isdigit():
+        return (host or "127.0.0.1", int(port))
+    return str(value)
+
+
+@dataclass
+class _Lease:
+    """Author: taobo.zhou
+    agent 持有的工作项租约。
+    Lease of a work item held by an agent.
+    """
+
+    lease_id: str
+    item: WorkItem
+    agent_id: str
+    expires: float
+    started: float = 0.0
+
+
+class Coordinator:
+    """Author: taobo.zhou
+    拉取式分布执行协调器，持有工作项队列，agent 通过本地 TCP/Unix socket 注册、租用工作项、心跳续约并回传结果。
+    Pull-based coordinator holding the work queue; agents register, lease items, renew via heartbeat and report results.
+    """
+
+    def __init__(
+        self,
+        address: Address,
+        authkey: bytes,
+        run_name: str,
+        lease_timeout: float = 60.0,
+        heartbeat_interval: float = 10.0,
+        max_lease_losses: int = 2,
+        should_retry: Optional[Callable[[ItemOutcome], bool]] = None,
+        on_result: Optional[Callable[[WorkItem, dict], ItemOutcome]] = None,
+    ):
+        """Author: taobo.zhou
+        初始化协调器并开始监听。
+        
+            address: 监听地址，(host, port) 或 Unix socket 路径。
+            authkey: 连接认证密钥。
+            run_name: 运行名称，agent 用于命名本地目录。
+            lease_timeout: 租约超时时间（秒），超时未续约的工作项重新入队。
+            heartbeat_interval: 建议 agent 使用的心跳间隔（秒）。
+            max_lease_losses: 同一工作项因 agent 断开或租约超时被回收的最大次数，超过后记为 ERROR 不再入队。
+            should_retry: 判断结果是否需要重新入队的回调，可为空。
+            on_result: 保存 agent 回传结果并返回执行结果的回调，可为空。
+        """
+
+        if not authkey or authkey == PUBLIC_AUTHKEY:
+            raise ValueError("coordinator authkey must be set and must not be the public default")
+        self._listener = Listener(address, authkey=authkey)
+        self._run_name = run_name
+        self._lease_timeout = float(lease_timeout)
+        self._heartbeat_interval = float(heartbeat_interval)
+        self._max_lease_losses = max(0, int(max_lease_losses))
+        self._lease_losses: Dict[str, int] = {}
+        self._should_retry = should_retry
+        self._on_result = on_result
+        self._queue: Deque[WorkItem] = deque()
+        self._leases: Dict[str, _Lease] = {}
+        self._agents: Dict[str, dict] = {}
+        self._outcomes: List[ItemOutcome] = []
+        self._ids = itertools.count(1)
+        self._cond = threading.Condition()
+        self._closed = False
+        threading.Thread(target=self._accept_loop, name="pw-coord-accept", daemon=True).start()
+        threading.Thread(target=self._reap_loop, name="pw-coord-reaper", daemon=True).start()
+
+    @property
+    def address(self) -> Address:
+        """Author: taobo.zhou
+        返回实际监听地址。
+         无。
+        """
+
+        return self._listener.address
+
+    def submit(self, item: WorkItem) -> None:
+        """Author: taobo.zhou
+        将工作项加入队列尾部。
+        
+            item: 工作项。
+        """
+
+        with self._cond:
+            self._queue.append(item)
+            self._cond.notify_all()
+
+    def wait(self, poll: float = 5.0) -> List[ItemOutcome]:
+        """Author: taobo.zhou
+        阻塞直到队列清空且没有未完成的租约，返回所有执行结果。
+        
+            poll: 打印等待状态的间隔（秒）。
+        """
+
+        with self._cond:
+            while self._queue or self._leases:
+                if not self._cond.wait(poll) and not self._agents:
+                    log.info("[PW][COORD] waiting for agents, pending=%s", len(self._queue))
+            return list(self._outcomes)
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        停止监听，已连接的 agent 下次租用时收到 done 并退出。
+         无。
+        """
+
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        try:
+            self._listener.close()
+        except Exception:
+            pass
+
+    def _accept_loop(self) -> None:
+        """Author: taobo.zhou
+        持续接受 agent 连接，每个连接使用独立线程处理请求。
+         无。
+        """
+
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._closed:
+                    return
+                continue
+            threading.Thread(target=self._serve, args=(conn,), name="pw-coord-conn", daemon=True).start()
+
+    def _serve(self, conn) -> None:
+        """Author: taobo.zhou
+        处理单个 agent 连接上的请求，连接断开时立即回收其租约。
+        
+            conn: agent 连接。
+        """
+    
+        agent_ids: Set[str] = set()
+        while True:
+            try:
+                msg = recv_message(conn)
+            except (EOFError, OSError):
+                break
+            except ValueError as exc:
+                log.error("[PW][COORD] drop connection, malformed message: %s", exc)
+                break
+            try:
+                reply = self._dispatch(msg, agent_ids)
+            except Exception as exc:
+                log.error("[PW][COORD] request op=%s failed: %s", msg.get("op"), exc)
+                reply = {"ok": False, "error": str(exc)}
+            try:
+                send_message(conn, reply)
+            except (EOFError, OSError):
+                break
+        conn.close()
+        for agent_id in agent_ids:
+            self._drop_agent(agent_id, "disconnected")
+
+    def _dispatch(self, msg: dict, agent_ids: Set[str]) -> dict:
+        """Author: taobo.zhou
+        根据请求类型执行注册、租用、心跳或结果回传。
+        
+            msg: 请求字典。
+            agent_ids: 当前连接上注册的 agent 标识集合。
+        """
+
+        op = msg.get("op")
+        if op == "register":
+            agent_id = f"agent-{next(self._ids)}"
+            with self._cond:
+                self._agents[agent_id] = {"host": msg.get("host"), "pid": msg.get("pid"), "seen": time.time()}
+            agent_ids.add(agent_id)
+            log.info("[PW][COORD] register %s host=%s pid=%s", agent_id, msg.get("host"), msg.get("pid"))
+            return {
+                "ok": True,
+                "agent_id": agent_id,
+                "run": self._run_name,
+                "heartbeat_interval": self._heartbeat_interval,
+            }
+        if op == "lease":
+            return self._lease(str(msg.get("agent_id")))
+        if op == "heartbeat":
+            return self._heartbeat(str(msg.get("agent_id")), list(msg.get("leases") or []))
+        if op == "result":
+            return self._result(str(msg.get("lease_id")), msg)
+        if op == "bye":
+            agent_id = str(msg.get("agent_id"))
+            agent_ids.discard(agent_id)
+            self._drop_agent(agent_id, "left")
+            return {"ok": True}
+        return {"ok": False, "error": f"unknown op: {op}"}
+
+    def _lease(self, agent_id: str) -> dict:
+        """Author: taobo.zhou
+        为 agent 分配下一个工作项。
+        
+            agent_id: agent 标识。
+        """
+
+        with self._cond:
+            if agent_id not in self._agents:
+                return {"ok": False, "error": "unknown agent"}
+            self._agents[agent_id]["seen"] = time.time()
+            if not self._queue:
+                if self._closed:
+                    return {"ok": True, "done": True}
+                return {"ok": True, "wait": min(self._heartbeat_interval, 5.0)}
+            item = self._queue.popleft()
+            lease = _Lease(
+                lease_id=f"lease-{next(self._ids)}",
+                item=item,
+                agent_id=agent_id,
+                expires=time.time() + self._lease_timeout,
+                started=time.time(),
+            )
+            self._leases[lease.lease_id] = lease
+        log.info("[PW][COORD] lease %s item=%s attempt=%s -> %s", lease.lease_id, item.key, item.attempt, agent_id)
+        return {"ok": True, "lease_id": lease.lease_id, "item": asdict(item)}
+
+    def _heartbeat(self, agent_id: str, lease_ids: List[str]) -> dict:
+        """Author: taobo.zhou
+        续约 agent 持有的租约，返回已失效的租约列表。
+        
+            agent_id: agent 标识。
+            lease_ids: agent 持有的租约标识列表。
+        """
+
+        expired = []
+        with self._cond:
+            if agent_id in self._agents:
+                self._agents[agent_id]["seen"] = time.time()
+            for lease_id in lease_ids:
+                lease = self._leases.get(lease_id)
+                if lease is None or lease.agent_id != agent_id:
+                    expired.append(lease_id)
+                    continue
+                lease.expires = time.time() + self._lease_timeout
+        return {"ok": True, "expired": expired}
+
+    def _result(self, lease_id: str, msg: dict) -> dict:
+        """Author: taobo.zhou
+        接收工作项结果，按重跑策略决定是否以 attempt+1 重新入队。
+        
+            lease_id: 租约标识。
+            msg: 结果请求字典。
+        """
+
+        with self._cond:
+            lease = self._leases.get(lease_id)
+        if lease is None:
+            log.warning("[PW][COORD] drop late result for %s", lease_id)
+            return {"ok": False, "error": "lease expired"}
+
+        item = lease.item
+        if self._on_result is not None:
+            outcome = self._on_result(item, msg)
+        else:
+            data = msg.get("outcome") or {}
+            outcome = ItemOutcome(
+                item=item,
+                returncode=int(data.get("returncode", 1)),
+                status=str(data.get("status", "ERROR")),
+                error=data.get("error"),
+                duration=float(data.get("duration") or 0.0),
+            )
+
+        retry_item = None
+        if self._should_retry is not None:
+            try:
+                if self._should_retry(outcome):
+                    retry_item = WorkItem(item.sheet, item.case, item.attempt + 1, item.retries + 1)
+            except Exception as exc:
+                log.error("[PW][COORD] retry check failed item=%s: %s", item.key, exc)
+
+        with self._cond:
+            if self._leases.pop(lease_id, None) is None:
+                requeued = WorkItem(item.sheet, item.case, item.attempt + 1, item.retries)
+                if requeued in self._queue:
+                    self._queue.remove(requeued)
+                log.warning("[PW][COORD] lease %s expired while saving result, keep result", lease_id)
+            self._outcomes.append(outcome)
+            if retry_item is not None:
+                log.warning("[PW][COORD][RERUN] item=%s attempt=%s -> requeue", retry_item.key, retry_item.attempt)
+                self._queue.append(retry_item)
+            self._cond.notify_all()
+        log.info(
+            "[PW][COORD] result %s item=%s status=%s pending=%s leased=%s",
+            lease.agent_id,
+            item.key,
+            outcome.status,
+            len(self._queue),
+            len(self._leases),
+        )
+        return {"ok": True}
+
+    def _requeue_lease(self, lease: _Lease, reason: str) -> None:
+        """Author: taobo.zhou
+        回收租约，工作项以新的 attempt 重新入队（不计入重跑次数）；同一工作项回收次数超过 max_lease_losses 时
+        （例如用例总是导致 agent 崩溃或卡死）记为 ERROR，不再入队。调用方需持有锁。
+        
+            lease: 租约。
+            reason: 回收原因。
+        """
+
+        self._leases.pop(lease.lease_id, None)
+        item = lease.item
+        losses = self._lease_losses.get(item.key, 0) + 1
+        self._lease_losses[item.key] = losses
+        if losses > self._max_lease_losses:
+            error = f"{reason} {losses} times (max_lease_losses={self._max_lease_losses}), last agent {lease.agent_id}"
+            self._outcomes.append(
+                ItemOutcome(
+                    item=item,
+                    returncode=1,
+                    status="ERROR",
+                    error=error,
+                    duration=time.time() - lease.started if lease.started else 0.0,
+                )
+            )
+            log.error("[PW][COORD] %s item=%s -> ERROR: %s", lease.lease_id, item.key, error)
+            self._cond.notify_all()
+            return
+        retry_item = WorkItem(item.sheet, item.case, item.attempt + 1, item.retries)
+        self._queue.appendleft(retry_item)
+        log.warning(
+            "[PW][COORD] %s %s item=%s from %s -> requeue attempt=%s (lost %s/%s)",
+            reason,
+            lease.lease_id,
+            item.key,
+            lease.agent_id,
+            retry_item.attempt,
+            losses,
+            self._max_lease_losses,
+        )
+        self._cond.notify_all()
+
+    def _drop_agent(self, agent_id: str, reason: str) -> None:
+        """Author: taobo.zhou
+        注销 agent 并立即回收其所有租约。
+        
+            agent_id: agent 标识。
+            reason: 注销原因。
+        """
+
+        with self._cond:
+            self._agents.pop(agent_id, None)
+            for lease in [l for l in self._leases.values() if l.agent_id == agent_id]:
+                self._requeue_lease(lease, f"agent {reason}")
+        log.info("[PW][COORD] %s %s", agent_id, reason)
+
+    def _reap_loop(self) -> None:
+        """Author: taobo.zhou
+        定期回收超时未续约的租约。
+         无。
+        """
+
+        while not self._closed:
+            time.sleep(1.0)
+            now = time.time()
+            with self._cond:
+                for lease in [l for l in self._leases.values() if l.expires < now]:
+                    self._requeue_lease(lease, "lease expired")
+
+
+class CoordinatorClient:
+    """Author: taobo.zhou
+    agent 侧的协调器连接，线程安全的请求/应答。
+    Agent-side coordinator connection with thread-safe request/reply.
+    """
+
+    def __init__(self, address: Address, authkey: bytes):
+        """Author: taobo.zhou
+        连接协调器。
+        
+            address: 协调器地址。
+            authkey: 连接认证密钥。
+        """
+
+        self._conn = Client(address, authkey=authkey)
+        self._lock = threading.Lock()
+
+    def request(self, msg: dict) -> dict:
+        """Author: taobo.zhou
+        发送请求并等待应答。
+        
+            msg: 请求字典。
+        """
+
+        with self._lock:
+            send_message(self._conn, msg)
+            return recv_message(self._conn)
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        关闭连接。
+         无。
+        """
+
+        with self._lock:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
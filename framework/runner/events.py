@@ -0,0 +1,513 @@
+from __future__ import annotations
+
+import os
+import threading
+import time
+from multiprocessing.connection import Client, Listener
+from typing import Callable, Dict, List, Optional, Tuple
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+ENV_ADDR = "PW_EVENT_ADDR"
+ENV_AUTHKEY = "PW_EVENT_AUTHKEY"
+
+
+class EventServer:
+    """Author: taobo.zhou
+    父进程事件服务，接收 worker 通过本地 socket 推送的结构化事件。
+    Parent-side event server receiving structured events streamed by workers over a local socket.
+    """
+
+    def __init__(self, handler: Callable[[dict], None]):
+        """Author: taobo.zhou
+        初始化事件服务并开始监听。
+        
+            handler: 每个事件的处理回调。
+        """
+
+        self._handler = handler
+        self._authkey = os.urandom(16)
+        self._listener = Listener(("127.0.0.1", 0), authkey=self._authkey)
+        self._closed = False
+        self._conns: List[object] = []
+        self._open_pids: Dict[int, int] = {}
+        self._pid_conns: Dict[int, object] = {}
+        self._lock = threading.Condition()
+        self._accept_thread = threading.Thread(target=self._accept_loop, name="pw-event-accept", daemon=True)
+        self._accept_thread.start()
+
+    def env(self) -> Dict[str, str]:
+        """Author: taobo.zhou
+        返回 worker 连接事件服务所需的环境变量。
+         无。
+        """
+
+        host, port = self._listener.address
+        return {ENV_ADDR: f"{host}:{port}", ENV_AUTHKEY: self._authkey.hex()}
+
+    def _accept_loop(self) -> None:
+        """Author: taobo.zhou
+        持续接受 worker 连接，每个连接使用独立读取线程。
+         无。
+        """
+
+        while not self._closed:
+            try:
+                conn = self._listener.accept()
+            except Exception:
+                if self._closed:
+                    return
+                continue
+            with self._lock:
+                self._conns.append(conn)
+            threading.Thread(target=self._read_loop, args=(conn,), name="pw-event-reader", daemon=True).start()
+
+    def _read_loop(self, conn) -> None:
+        """Author: taobo.zhou
+        读取单个连接上的事件并交给处理回调，连接断开时退出。
+        
+            conn: worker 连接。
+        """
+
+        pid = None
+        while True:
+            try:
+                event = conn.recv()
+            except (EOFError, OSError):
+                break
+            if pid is None and event.get("pid"):
+                pid = int(event["pid"])
+                with self._lock:
+                    self._open_pids[pid] = self._open_pids.get(pid, 0) + 1
+                    self._pid_conns[pid] = conn
+            try:
+                self._handler(event)
+            except Exception as exc:
+                log.error("[PW][EVENT] handler failed event=%s: %s", event.get("kind"), exc)
+        with self._lock:
+            if conn in self._conns:
+                self._conns.remove(conn)
+            if pid is not None:
+                self._open_pids[pid] = self._open_pids.get(pid, 1) - 1
+                if self._open_pids[pid] <= 0:
+                    self._open_pids.pop(pid, None)
+                if self._pid_conns.get(pid) is conn:
+                    self._pid_conns.pop(pid, None)
+            self._lock.notify_all()
+
+    def send_command(self, pid: int, command: dict) -> bool:
+        """Author: taobo.zhou
+        通过事件连接向指定 worker 下发命令（例如采集诊断信息）。
+        
+            pid: worker 进程号。
+            command: 命令字典。
+        """
+
+        with self._lock:
+            conn = self._pid_conns.get(pid)
+        if conn is None:
+            return False
+        try:
+            conn.send(command)
+            return True
+        except Exception as exc:
+            log.warning("[PW][EVENT] send command to pid=%s failed: %s", pid, exc)
+            return False
+
+    def wait_closed(self, pid: int, timeout: float = 5.0) -> bool:
+        """Author: taobo.zhou
+        等待指定 worker 进程的连接读完并关闭，确保其最后的事件已处理。
+        
+            pid: worker 进程号。
+            timeout: 最长等待时间（秒）。
+        """
+
+        deadline = time.time() + timeout
+        with self._lock:
+            while pid in self._open_pids:
+                remaining = deadline - time.time()
+                if remaining <= 0:
+                    return False
+                self._lock.wait(remaining)
+        return True
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        关闭监听与所有连接。
+         无。
+        """
+
+        self._closed = True
+        try:
+            self._listener.close()
+        except Exception:
+            pass
+        with self._lock:
+            conns = list(self._conns)
+            self._conns.clear()
+        for conn in conns:
+            try:
+                conn.close()
+            except Exception:
+                pass
+
+
+class EventClient:
+    """Author: taobo.zhou
+    worker 侧事件客户端，按环境变量懒连接，发送失败时静默降级，不影响用例执行。
+    Worker-side event client; connects lazily from env and degrades silently on failure.
+    """
+
+    _instance = None
+    _instance_lock = threading.Lock()
+
+    def __init__(self):
+        """Author: taobo.zhou
+        初始化事件客户端。
+         无。
+        """
+
+        self._conn = None
+        self._addr: Optional[str] = None
+        self._lock = threading.Lock()
+
+    @classmethod
+    def get(cls) -> "EventClient":
+        """Author: taobo.zhou
+        获取进程内单例事件客户端。
+        
+            cls: 类对象。
+        """
+
+        with cls._instance_lock:
+            if cls._instance is None:
+                cls._instance = EventClient()
+            return cls._instance
+
+    def _connect(self):
+        """Author: taobo.zhou
+        按当前环境变量建立或复用连接，未配置时返回 None。
+         无。
+        """
+
+        addr = os.environ.get(ENV_ADDR)
+        if not addr:
+            return None
+        if self._conn is not None and addr == self._addr:
+            return self._conn
+        self.close()
+        host, port = addr.rsplit(":", 1)
+        authkey = bytes.fromhex(os.environ.get(ENV_AUTHKEY, ""))
+        self._conn = Client((host, int(port)), authkey=authkey)
+        self._addr = addr
+        return self._conn
+
+    def emit(self, kind: str, **fields) -> None:
+        """Author: taobo.zhou
+        发送一个事件。
+        
+            kind: 事件类型。
+            **fields: 事件字段。
+        """
+
+        event = {"kind": kind, "ts": time.time(), "pid": os.getpid(), **fields}
+        with self._lock:
+            try:
+                conn = self._connect()
+                if conn is not None:
+                    conn.send(event)
+            except Exception as exc:
+                log.debug(f"[PW][EVENT] emit {kind} failed: {exc}")
+                self.close()
+
+    def poll_command(self, timeout: float) -> Optional[dict]:
+        """Author: taobo.zhou
+        等待父进程下发的命令，超时或未连接时返回 None。
+        
+            timeout: 最长等待时间（秒）。
+        """
+
+        with self._lock:
+            try:
+                conn = self._connect()
+            except Exception:
+                conn = None
+        if conn is None:
+            time.sleep(timeout)
+            return None
+        try:
+            if conn.poll(timeout):
+                return conn.recv()
+        except Exception:
+            return None
+        return None
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        关闭当前连接。
+         无。
+        """
+
+        if self._conn is not None:
+            try:
+                self._conn.close()
+            except Exception:
+                pass
+        self._conn = None
+        self._addr = None
+
+
+def emit_event(kind: str, **fields) -> None:
+    """Author: taobo.zhou
+    通过进程内事件客户端发送事件，未配置事件服务时为空操作。
+    
+        kind: 事件类型。
+        **fields: 事件字段。
+    """
+
+    if not os.environ.get(ENV_ADDR):
+        return
+    EventClient.get().emit(kind, **fields)
+
+
+class LiveAggregate:
+    """Author: taobo.zhou
+    根据事件流实时维护用例状态与进度，worker 异常退出时保留已收到的部分结果。
+    Live aggregate built from the event stream; keeps partial results when a worker dies.
+    """
+
+    def __init__(self, total_items: int = 0):
+        """Author: taobo.zhou
+        初始化实时汇总。
+        
+            total_items: 预计的工作项数量，用于进度显示。
+        """
+
+        self._lock = threading.Lock()
+        self._total_items = total_items
+        self._finished_items = 0
+        self._running: Dict[Tuple[str, str], dict] = {}
+        self._attempts: Dict[Tuple[str, str, int], dict] = {}
+        self._case_params: Dict[str, dict] = {}
+        self._counts = {"PASS": 0, "FAIL": 0, "ERROR": 0, "SKIP": 0}
+        self._liveness: Dict[int, Tuple[float, object, float]] = {}
+        self._diagnostics: Dict[int, dict] = {}
+
+    def add_items(self, count: int) -> None:
+        """Author: taobo.zhou
+        增加预计工作项数量（例如重跑入队）。
+        
+            count: 增加的数量。
+        """
+
+        with self._lock:
+            self._total_items += count
+
+    def handle(self, event: dict) -> None:
+        """Author: taobo.zhou
+        处理单个事件并更新汇总状态。
+        
+            event: 事件字典。
+        """
+
+        kind = event.get("kind")
+        sheet = str(event.get("sheet", ""))
+        nodeid = str(event.get("nodeid", ""))
+        with self._lock:
+            self._track_liveness(event)
+            if kind == "heartbeat":
+                return
+            if kind == "diagnostics_saved":
+                self._diagnostics[int(event.get("pid") or 0)] = event
+                for running in self._running.values():
+                    if running.get("pid") == event.get("pid") and event.get("screenshot"):
+                        running["screenshot"] = event["screenshot"]
+                return
+            if kind == "case_started":
+                self._running[(sheet, nodeid)] = event
+            elif kind == "screenshot_saved":
+                running = self._running.get((sheet, nodeid))
+                if running is not None:
+                    running["screenshot"] = event.get("path")
+            elif kind == "attempt_finished":
+                self._running.pop((sheet, nodeid), None)
+                self._attempts[(sheet, nodeid, int(event.get("attempt") or 1))] = event
+                status = str(event.get("status", ""))
+                self._counts[status] = self._counts.get(status, 0) + 1
+                if event.get("case_params"):
+                    self._case_params[sheet] = event["case_params"]
+                log.info(
+                    "[PW][PROGRESS] %s attempt=%s -> %s | items=%s/%s running=%s pass=%s fail=%s error=%s skip=%s",
+                    nodeid,
+                    event.get("attempt"),
+                    status,
+                    self._finished_items,
+                    self._total_items,
+                    len(self._running),
+                    self._counts.get("PASS", 0),
+                    self._counts.get("FAIL", 0),
+                    self._counts.get("ERROR", 0),
+                    self._counts.get("SKIP", 0),
+                )
+
+    def _track_liveness(self, event: dict) -> None:
+        """Author: taobo.zhou
+        记录 worker 最近一次事件与进度时间，心跳中的进度计数变化才视为有进展。
+        
+            event: 事件字典。
+        """
+
+        pid = event.get("pid")
+        if not pid:
+            return
+        now = time.time()
+        _, last_marker, last_progress = self._liveness.get(int(pid), (0.0, None, now))
+        marker = event.get("progress") if event.get("kind") == "heartbeat" else ("event", now)
+        if marker != last_marker:
+            last_progress = now
+        self._liveness[int(pid)] = (now, marker, last_progress)
+
+    def liveness(self, pid: int) -> Optional[Tuple[float, float]]:
+        """Author: taobo.zhou
+        返回 worker 最近一次事件时间与最近一次有进展的时间。
+        
+            pid: worker 进程号。
+        """
+
+        with self._lock:
+            entry = self._liveness.get(int(pid))
+        if entry is None:
+            return None
+        return entry[0], entry[2]
+
+    def diagnostics(self, pid: int) -> Optional[dict]:
+        """Author: taobo.zhou
+        返回并清除 worker 最近一次上报的诊断信息。
+        
+            pid: worker 进程号。
+        """
+
+        with self._lock:
+            return self._diagnostics.pop(int(pid), None)
+
+    def item_finished(self) -> None:
+        """Author: taobo.zhou
+        记录一个工作项执行完毕。
+         无。
+        """
+
+        with self._lock:
+            self._finished_items += 1
+
+    @staticmethod
+    def _belongs_to(key: Tuple[str, str], event: dict, item: Tuple[str, Optional[str], int], pid: Optional[int]) -> bool:
+        """Author: taobo.zhou
+        判断事件是否属于指定工作项：sheet 与尝试序号相同，工作项指定用例时 nodeid 去掉参数化后缀后与其相同，
+        指定进程号时由该 worker 上报。
+        
+            key: 事件的 (sheet, nodeid)。
+            event: 事件字典。
+            item: 工作项的 (sheet, case, attempt)，case 为不含参数化后缀的 nodeid，为空表示整个 sheet。
+            pid: worker 进程号，为空时不限。
+        """
+
+        sheet, case, attempt = item
+        if key[0] != sheet or int(event.get("attempt") or 1) != attempt:
+            return False
+        if case is not None and key[1].split("[", 1)[0] != case:
+            return False
+        return pid is None or int(event.get("pid") or 0) == int(pid)
+
+    def pids_for(self, sheet: str, attempt: int, case: Optional[str] = None) -> List[int]:
+        """Author: taobo.zhou
+        返回上报过指定工作项 (sheet, case, attempt) 事件的 worker 进程号。
+        
+            sheet: sheet 名称。
+            attempt: 尝试序号。
+            case: 不含参数化后缀的用例 nodeid，为空表示整个 sheet。
+        """
+
+        item = (sheet, case, attempt)
+        with self._lock:
+            events = list(self._running.items()) + [((s, n), ev) for (s, n, _), ev in self._attempts.items()]
+            return sorted({
+                int(ev["pid"])
+                for key, ev in events
+                if ev.get("pid") and self._belongs_to(key, ev, item, None)
+            })
+
+    def partial_payload(
+        self,
+        sheet: str,
+        attempt: int,
+        reason: str,
+        case: Optional[str] = None,
+        pid: Optional[int] = None,
+    ) -> Optional[dict]:
+        """Author: taobo.zhou
+        根据已收到的事件构建指定工作项的部分结果（与 results.json 同格式），进行中的用例记为 ERROR；
+        同一 sheet 中并发执行的其他工作项不受影响。
+        
+            sheet: sheet 名称。
+            attempt: 尝试序号。
+            reason: 进行中用例的错误原因。
+            case: 不含参数化后缀的用例 nodeid，为空表示整个 sheet。
+            pid: 执行该工作项的 worker 进程号，为空时不限。
+        """
+
+        item = (sheet, case, attempt)
+        with self._lock:
+            results = []
+            for (s, nodeid, a), ev in self._attempts.items():
+                if self._belongs_to((s, nodeid), {**ev, "attempt": a}, item, pid):
+                    results.append(_result_from_event(ev))
+            for key, ev in list(self._running.items()):
+                if not self._belongs_to(key, ev, item, pid):
+                    continue
+                results.append(_result_from_event({
+                    **ev,
+                    "status": "ERROR",
+                    "error": reason,
+                    "end_time": time.strftime("%Y-%m-%d %H:%M:%S"),
+                }))
+                self._running.pop(key, None)
+            if not results:
+                return None
+            statuses = [r["status"] for r in results]
+            return {
+                "sheet": sheet,
+                "counts": {
+                    "total": len(results),
+                    "passed": statuses.count("PASS"),
+                    "failed": statuses.count("FAIL"),
+                    "error": statuses.count("ERROR"),
+                    "skipped": statuses.count("SKIP"),
+                },
+                "results": results,
+                "case_params": {sheet: self._case_params.get(sheet, {"sheet_name": sheet})},
+            }
+
+
+def _result_from_event(event: dict) -> dict:
+    """Author: taobo.zhou
+    将事件转换为 results.json 中的单条结果。
+    
+        event: case_started 或 attempt_finished 事件。
+    """
+
+    attempt = int(event.get("attempt") or 1)
+    return {
+        "case_id": event.get("sheet"),
+        "sheet": event.get("sheet"),
+        "status": event.get("status", "ERROR"),
+        "retried": attempt > 1,
+        "attempt": attempt,
+        "error": event.get("error"),
+        "screenshot": event.get("screenshot"),
+        "nodeid": event.get("nodeid"),
+        "start_time": event.get("start_time", "-"),
+        "end_time": event.get("end_time", "-"),
+        "duration": event.get("duration"),
+    }
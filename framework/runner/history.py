@@ -0,0 +1,154 @@
+from __future__ import annotations
+
+import heapq
+import json
+import os
+import statistics
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Tuple
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+INDEX_NAME = "durations.json"
+_KEEP_SAMPLES = 10
+
+
+class DurationHistory:
+    """Author: taobo.zhou
+    sheet 历史耗时索引，优先读取 output/runs/durations.json，缺失时扫描历史 results.json。
+    Per-sheet duration history backed by output/runs/durations.json with a results.json fallback.
+    """
+
+    def __init__(self, runs_root: Path):
+        """Author: taobo.zhou
+        初始化历史耗时索引。
+        
+            runs_root: 运行根目录的上级目录（output/runs）。
+        """
+
+        self._runs_root = Path(runs_root)
+        self._index_path = self._runs_root / INDEX_NAME
+        self._samples: Dict[str, List[float]] = {}
+        self._load()
+
+    def _load(self) -> None:
+        """Author: taobo.zhou
+        加载耗时索引，索引不存在时从历史运行目录重建。
+         无。
+        """
+
+        if self._index_path.exists():
+            try:
+                with self._index_path.open("r", encoding="utf-8") as f:
+                    payload = json.load(f) or {}
+                self._samples = {
+                    str(k): [float(x) for x in v][-_KEEP_SAMPLES:]
+                    for k, v in (payload.get("sheets") or {}).items()
+                }
+                return
+            except Exception as exc:
+                log.warning("[PW][HISTORY] bad index %s, rescan: %s", self._index_path, exc)
+        self._samples = self._scan_runs()
+
+    def _scan_runs(self) -> Dict[str, List[float]]:
+        """Author: taobo.zhou
+        扫描 output/runs/*/<sheet>/reports/results.json 汇总每个 sheet 的历史耗时。
+         无。
+        """
+
+        samples: Dict[str, List[float]] = {}
+        if not self._runs_root.exists():
+            return samples
+        for run_dir in sorted(p for p in self._runs_root.iterdir() if p.is_dir()):
+            for result_path in run_dir.glob("*/reports/results.json"):
+                try:
+                    with result_path.open("r", encoding="utf-8") as f:
+                        payload = json.load(f)
+                except Exception:
+                    continue
+                durations = [r.get("duration") for r in payload.get("results", [])]
+                durations = [float(d) for d in durations if isinstance(d, (int, float))]
+                if durations:
+                    sheet = result_path.parent.parent.name
+                    samples.setdefault(sheet, []).append(sum(durations))
+        return {k: v[-_KEEP_SAMPLES:] for k, v in samples.items()}
+
+    def expected(self, sheet: str) -> Optional[float]:
+        """Author: taobo.zhou
+        返回 sheet 的预期耗时（最近样本中位数），无历史时返回 None。
+        
+            sheet: sheet 名称。
+        """
+
+        values = self._samples.get(sheet)
+        if not values:
+            return None
+        return float(statistics.median(values))
+
+    def estimates(self, sheets: Iterable[str]) -> Dict[str, float]:
+        """Author: taobo.zhou
+        返回各 sheet 的预期耗时，无历史的 sheet 按已知最大值估计以便优先调度。
+        
+            sheets: sheet 名称列表。
+        """
+
+        known = {s: self.expected(s) for s in sheets}
+        known_values = [v for v in known.values() if v is not None]
+        fallback = max(known_values) if known_values else 0.0
+        return {s: (v if v is not None else fallback) for s, v in known.items()}
+
+    def record(self, durations: Dict[str, float]) -> None:
+        """Author: taobo.zhou
+        追加本次运行各 sheet 的耗时并原子写回索引。
+        
+            durations: sheet 名称到本次耗时（秒）的映射。
+        """
+
+        for sheet, value in durations.items():
+            if value is None or value <= 0:
+                continue
+            self._samples.setdefault(sheet, []).append(round(float(value), 3))
+            self._samples[sheet] = self._samples[sheet][-_KEEP_SAMPLES:]
+
+        self._runs_root.mkdir(parents=True, exist_ok=True)
+        tmp_path = self._index_path.with_suffix(".json.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"sheets": self._samples}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, self._index_path)
+
+
+def plan_longest_first(estimates: Dict[str, float], workers: int) -> Tuple[List[str], float]:
+    """Author: taobo.zhou
+    按预期耗时降序排列 sheet（LPT），并模拟分配到 workers 个槽位计算预测总时长。
+    
+        estimates: sheet 名称到预期耗时的映射。
+        workers: 并发槽位数量。
+    """
+
+    ordered = sorted(estimates, key=lambda s: estimates[s], reverse=True)
+    loads = [0.0] * max(1, int(workers))
+    heapq.heapify(loads)
+    for sheet in ordered:
+        heapq.heappush(loads, heapq.heappop(loads) + estimates[sheet])
+    return ordered, max(loads)
+
+
+def assign_shards(estimates: Dict[str, float], shards: int) -> List[List[str]]:
+    """Author: taobo.zhou
+    按预期耗时把 sheet 分配到 shards 个分片（LPT），同耗时按名称与分片 sheet 数排序以保证各主机结果一致。
+    
+        estimates: sheet 名称到预期耗时的映射。
+        shards: 分片数量。
+    """
+
+    count = max(1, int(shards))
+    buckets: List[List[str]] = [[] for _ in range(count)]
+    loads = [(0.0, 0, index) for index in range(count)]
+    heapq.heapify(loads)
+    for sheet in sorted(estimates, key=lambda s: (-estimates[s], s)):
+        load, size, index = heapq.heappop(loads)
+        buckets[index].append(sheet)
+        heapq.heappush(loads, (load + estimates[sheet], size + 1, index))
+    return buckets
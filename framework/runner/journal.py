@@ -0,0 +1,118 @@
+from __future__ import annotations
+
+import json
+import os
+import threading
+import time
+from pathlib import Path
+from typing import Dict, Iterable, Iterator, Tuple
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+
+class AttemptJournal:
+    """Author: taobo.zhou
+    追加写入的 JSONL 尝试日志，每条记录立即落盘，按条数或时间间隔批量 fsync。
+    Append-only JSONL attempt journal; every record is flushed and fsync is batched by count or interval.
+    """
+
+    def __init__(self, path: Path, fsync_every: int = 20, fsync_interval: float = 2.0):
+        """Author: taobo.zhou
+        打开（或创建）日志文件。
+        
+            path: JSONL 文件路径。
+            fsync_every: 每写入多少条记录执行一次 fsync。
+            fsync_interval: 距上次 fsync 超过多少秒时强制 fsync。
+        """
+
+        self.path = Path(path)
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self._fh = self.path.open("a", encoding="utf-8")
+        self._fsync_every = max(1, int(fsync_every))
+        self._fsync_interval = float(fsync_interval)
+        self._unsynced = 0
+        self._last_sync = time.time()
+        self._lock = threading.Lock()
+
+    def append(self, record: dict) -> None:
+        """Author: taobo.zhou
+        追加一条记录。
+        
+            record: 可 JSON 序列化的记录字典。
+        """
+
+        line = json.dumps(record, ensure_ascii=False, default=str)
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.write(line + "\n")
+            self._fh.flush()
+            self._unsynced += 1
+            if self._unsynced >= self._fsync_every or time.time() - self._last_sync >= self._fsync_interval:
+                self._sync()
+
+    def _sync(self) -> None:
+        """Author: taobo.zhou
+        将已写入的内容 fsync 到磁盘。
+         无。
+        """
+
+        try:
+            os.fsync(self._fh.fileno())
+        except OSError as exc:
+            log.warning(f"[PW][JOURNAL] fsync failed {self.path}: {exc}")
+        self._unsynced = 0
+        self._last_sync = time.time()
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        fsync 剩余内容并关闭文件。
+         无。
+        """
+
+        with self._lock:
+            if self._fh.closed:
+                return
+            self._fh.flush()
+            self._sync()
+            self._fh.close()
+
+
+def iter_journal(path: Path) -> Iterator[dict]:
+    """Author: taobo.zhou
+    逐行读取 JSONL 日志，跳过进程被杀时写了一半的行。
+    
+        path: JSONL 文件路径。
+    """
+
+    with Path(path).open("r", encoding="utf-8", errors="replace") as f:
+        for line in f:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                yield json.loads(line)
+            except ValueError:
+                log.warning("[PW][JOURNAL] skip truncated line in %s", path)
+
+
+def merge_journals(paths: Iterable[Path]) -> Tuple[Dict[str, dict], Dict[str, dict]]:
+    """Author: taobo.zhou
+    流式合并多个日志，每个 nodeid 只保留尝试序号最大的记录，内存只随用例数增长。
+    
+        paths: JSONL 文件路径列表。
+    """
+
+    final: Dict[str, dict] = {}
+    case_params: Dict[str, dict] = {}
+    for path in paths:
+        for record in iter_journal(path):
+            nodeid = str(record.get("nodeid", ""))
+            prev = final.get(nodeid)
+            if prev is None or int(record.get("attempt") or 1) >= int(prev.get("attempt") or 1):
+                final[nodeid] = record
+            if record.get("case_params"):
+                case_params[str(record.get("sheet_name", ""))] = record["case_params"]
+    return final, case_params
@@ -0,0 +1,187 @@
+from __future__ import annotations
+
+import threading
+from collections import deque
+from dataclasses import dataclass
+from typing import Callable, Deque, List, Optional
+
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+
+@dataclass(frozen=True)
+class WorkItem:
+    """Author: taobo.zhou
+    调度队列中的工作项，对应一次 (sheet, case, attempt) 执行。
+    Work item in the scheduler queue for one (sheet, case, attempt) run.
+    """
+
+    sheet: str
+    case: Optional[str]
+    attempt: int = 1
+    retries: int = 0
+
+    @property
+    def key(self) -> str:
+        """Author: taobo.zhou
+        返回不含 attempt 的工作项标识。
+         无。
+        """
+
+        return f"{self.sheet}::{self.case or '*'}"
+
+
+@dataclass
+class ItemOutcome:
+    """Author: taobo.zhou
+    单个工作项的执行结果。
+    Execution outcome of a single work item.
+    """
+
+    item: WorkItem
+    returncode: int
+    status: str
+    error: Optional[str] = None
+    slot: int = -1
+    duration: float = 0.0
+
+
+class WorkQueueScheduler:
+    """Author: taobo.zhou
+    共享队列调度器，空闲 worker 主动拉取下一个工作项，重跑项回到同一队列。
+    Shared-queue scheduler; idle workers pull the next item and retries re-enter the same queue.
+    """
+
+    def __init__(
+        self,
+        run_item: Callable[[WorkItem, int], ItemOutcome],
+        max_workers: int,
+        should_retry: Optional[Callable[[ItemOutcome], bool]] = None,
+        admit: Optional[Callable[[int], bool]] = None,
+        admit_poll: float = 1.0,
+    ):
+        """Author: taobo.zhou
+        初始化调度器。
+        
+            run_item: 执行单个工作项的回调，参数为工作项与 worker 槽位。
+            max_workers: 并发 worker 数量上限。
+            should_retry: 判断结果是否需要重新入队的回调，可为空。
+            admit: 判断能否在当前执行中数量下再派发一项的回调，可为空。
+            admit_poll: admit 拒绝时重新检查的间隔（秒）。
+        """
+
+        self._run_item = run_item
+        self._max_workers = max(1, int(max_workers))
+        self._should_retry = should_retry
+        self._admit = admit
+        self._admit_poll = float(admit_poll)
+        self._queue: Deque[WorkItem] = deque()
+        self._cond = threading.Condition()
+        self._in_flight = 0
+        self._outcomes: List[ItemOutcome] = []
+
+    def submit(self, item: WorkItem) -> None:
+        """Author: taobo.zhou
+        将工作项加入队列尾部。
+        
+            item: 工作项。
+        """
+
+        with self._cond:
+            self._queue.append(item)
+            self._cond.notify()
+
+    def pending(self) -> int:
+        """Author: taobo.zhou
+        返回队列中等待执行的工作项数量。
+         无。
+        """
+
+        with self._cond:
+            return len(self._queue)
+
+    def _next_item(self) -> Optional[WorkItem]:
+        """Author: taobo.zhou
+        阻塞获取下一个工作项，资源不足时等待 admit 放行，队列为空且无执行中的项时返回 None。
+         无。
+        """
+
+        with self._cond:
+            while True:
+                if not self._queue:
+                    if self._in_flight == 0:
+                        self._cond.notify_all()
+                        return None
+                    self._cond.wait()
+                    continue
+                if self._admit is not None and not self._admit(self._in_flight) and self._in_flight > 0:
+                    self._cond.wait(self._admit_poll)
+                    continue
+                break
+            self._in_flight += 1
+            return self._queue.popleft()
+
+    def _finish_item(self, outcome: ItemOutcome) -> None:
+        """Author: taobo.zhou
+        记录结果，需要重跑时以 attempt+1 重新入队。
+        
+            outcome: 工作项执行结果。
+        """
+
+        retry_item = None
+        if self._should_retry is not None:
+            try:
+                if self._should_retry(outcome):
+                    item = outcome.item
+                    retry_item = WorkItem(item.sheet, item.case, item.attempt + 1, item.retries + 1)
+            except Exception as exc:
+                log.error("[PW][SCHED] retry check failed item=%s: %s", outcome.item.key, exc)
+
+        with self._cond:
+            self._outcomes.append(outcome)
+            if retry_item is not None:
+                log.warning(
+                    "[PW][SCHED][RERUN] item=%s attempt=%s -> requeue",
+                    retry_item.key,
+                    retry_item.attempt,
+                )
+                self._queue.append(retry_item)
+            self._in_flight -= 1
+            self._cond.notify_all()
+
+    def _worker_loop(self, slot: int) -> None:
+        """Author: taobo.zhou
+        worker 线程主循环，持续拉取工作项直到队列耗尽。
+        
+            slot: worker 槽位编号。
+        """
+
+        while True:
+            item = self._next_item()
+            if item is None:
+                return
+            log.info("[PW][SCHED] slot=%s take item=%s attempt=%s", slot, item.key, item.attempt)
+            try:
+                outcome = self._run_item(item, slot)
+            except Exception as exc:
+                log.error("[PW][SCHED] item=%s crashed: %s", item.key, exc)
+                outcome = ItemOutcome(item=item, returncode=1, status="ERROR", error=str(exc))
+            outcome.slot = slot
+            self._finish_item(outcome)
+
+    def run(self) -> List[ItemOutcome]:
+        """Author: taobo.zhou
+        启动 worker 线程并等待队列全部执行完成。
+         无。
+        """
+
+        threads = [
+            threading.Thread(target=self._worker_loop, args=(slot,), name=f"pw-worker-{slot}", daemon=True)
+            for slot in range(self._max_workers)
+        ]
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+        return list(self._outcomes)
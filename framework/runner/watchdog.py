@@ -0,0 +1,303 @@
+from __future__ import annotations
+
+import itertools
+import logging
+import os
+import threading
+import time
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Callable, Dict, Optional
+
+import psutil
+
+from framework.runner.events import EventClient, EventServer, LiveAggregate, emit_event
+from framework.utils.logger import LOGGER_NAME, get_logger
+
+log = get_logger()
+
+_PROGRESS = itertools.count(1)
+_progress_value = 0
+
+
+def touch_progress() -> None:
+    """Author: taobo.zhou
+    标记当前 worker 有新的进展（页面动作、用例阶段变化等）。
+     无。
+    """
+
+    global _progress_value
+    _progress_value = next(_PROGRESS)
+
+
+class _ProgressHandler(logging.Handler):
+    """Author: taobo.zhou
+    日志处理器，把框架日志视为进展信号。
+    Logging handler treating framework log records as progress signals.
+    """
+
+    def emit(self, record: logging.LogRecord) -> None:
+        """Author: taobo.zhou
+        记录一次进展。
+        
+            record: 日志记录对象。
+        """
+
+        touch_progress()
+
+
+class HeartbeatThread:
+    """Author: taobo.zhou
+    worker 心跳线程，定期上报进度计数，并响应父进程下发的诊断采集命令。
+    Worker heartbeat thread reporting a progress counter and serving diagnostics requests from the parent.
+    """
+
+    def __init__(self, interval: float, diagnostics: Callable[[str], dict]):
+        """Author: taobo.zhou
+        初始化心跳线程。
+        
+            interval: 心跳间隔（秒）。
+            diagnostics: 采集诊断信息的回调，参数为原因，返回诊断结果字典。
+        """
+
+        self._interval = max(0.5, float(interval))
+        self._diagnostics = diagnostics
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="pw-heartbeat", daemon=True)
+        self._handler = _ProgressHandler()
+
+    def start(self) -> None:
+        """Author: taobo.zhou
+        启动心跳线程并挂载进展日志处理器。
+         无。
+        """
+
+        logging.getLogger(LOGGER_NAME).addHandler(self._handler)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """Author: taobo.zhou
+        停止心跳线程并移除日志处理器。
+         无。
+        """
+
+        self._stop.set()
+        logging.getLogger(LOGGER_NAME).removeHandler(self._handler)
+        self._thread.join(timeout=self._interval * 2)
+
+    def _loop(self) -> None:
+        """Author: taobo.zhou
+        心跳主循环。
+         无。
+        """
+
+        client = EventClient.get()
+        while not self._stop.is_set():
+            emit_event("heartbeat", progress=_progress_value)
+            command = client.poll_command(self._interval)
+            if not command:
+                continue
+            if command.get("op") == "diagnose":
+                reason = str(command.get("reason", ""))
+                try:
+                    info = self._diagnostics(reason) or {}
+                except Exception as exc:
+                    info = {"error": str(exc)}
+                emit_event("diagnostics_saved", reason=reason, **info)
+
+
+@dataclass
+class _Watch:
+    """Author: taobo.zhou
+    单个被监控 worker 的状态。
+    State of a single watched worker.
+    """
+
+    pid: int
+    key: str
+    started: float
+    reason: Optional[str] = None
+    done: threading.Event = field(default_factory=threading.Event)
+
+
+def kill_process_tree(pid: int) -> None:
+    """Author: taobo.zhou
+    结束进程及其所有子进程（浏览器、驱动等）。
+    
+        pid: 根进程号。
+    """
+
+    try:
+        root = psutil.Process(pid)
+    except psutil.NoSuchProcess:
+        return
+    procs = root.children(recursive=True) + [root]
+    for proc in procs:
+        try:
+            proc.kill()
+        except psutil.NoSuchProcess:
+            pass
+        except Exception as exc:
+            log.warning("[PW][WATCHDOG] kill pid=%s failed: %s", proc.pid, exc)
+    psutil.wait_procs(procs, timeout=10)
+
+
+class Watchdog:
+    """Author: taobo.zhou
+    父进程看门狗，按工作项截止时间与无进展超时判定挂起，采集诊断后结束进程树。
+    Parent-side watchdog; on deadline or no-progress expiry it captures diagnostics and kills the process tree.
+    """
+
+    def __init__(
+        self,
+        events: EventServer,
+        aggregate: LiveAggregate,
+        sheet_deadline: float,
+        no_progress_timeout: float,
+        diagnostics_timeout: float = 20.0,
+    ):
+        """Author: taobo.zhou
+        初始化看门狗并启动检查线程。
+        
+            events: 事件服务，用于下发诊断命令。
+            aggregate: 实时汇总，用于读取心跳与进度。
+            sheet_deadline: 单个工作项的最长执行时间（秒），<=0 表示不限制。
+            no_progress_timeout: 无进展超时（秒），<=0 表示不限制。
+            diagnostics_timeout: 等待诊断采集完成的最长时间（秒）。
+        """
+
+        self._events = events
+        self._aggregate = aggregate
+        self._sheet_deadline = float(sheet_deadline or 0)
+        self._no_progress_timeout = float(no_progress_timeout or 0)
+        self._diagnostics_timeout = float(diagnostics_timeout)
+        self._watches: Dict[int, _Watch] = {}
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = threading.Thread(target=self._loop, name="pw-watchdog", daemon=True)
+        self._thread.start()
+
+    def watch(self, pid: int, key: str) -> None:
+        """Author: taobo.zhou
+        开始监控执行某个工作项的 worker 进程。
+        
+            pid: worker 进程号。
+            key: 工作项标识。
+        """
+
+        with self._lock:
+            self._watches[pid] = _Watch(pid=pid, key=key, started=time.time())
+
+    def unwatch(self, pid: int) -> Optional[str]:
+        """Author: taobo.zhou
+        结束监控，若看门狗曾触发则等待处理完成并返回原因。
+        
+            pid: worker 进程号。
+        """
+
+        with self._lock:
+            watch = self._watches.pop(pid, None)
+        if watch is None or watch.reason is None:
+            return None
+        watch.done.wait(self._diagnostics_timeout + 15)
+        return watch.reason
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        停止检查线程。
+         无。
+        """
+
+        self._stop.set()
+        self._thread.join(timeout=5)
+
+    def _loop(self) -> None:
+        """Author: taobo.zhou
+        每秒检查一次所有被监控的 worker。
+         无。
+        """
+
+        while not self._stop.wait(1.0):
+            now = time.time()
+            with self._lock:
+                watches = [w for w in self._watches.values() if w.reason is None]
+            for watch in watches:
+                reason = self._check(watch, now)
+                if reason is None:
+                    continue
+                watch.reason = reason
+                threading.Thread(target=self._expire, args=(watch,), name="pw-watchdog-kill", daemon=True).start()
+
+    def _check(self, watch: _Watch, now: float) -> Optional[str]:
+        """Author: taobo.zhou
+        判断单个 worker 是否超过截止时间或长时间无进展。
+        
+            watch: 监控状态。
+            now: 当前时间戳。
+        """
+
+        elapsed = now - watch.started
+        if self._sheet_deadline > 0 and elapsed > self._sheet_deadline:
+            return f"watchdog: deadline {self._sheet_deadline:.0f}s exceeded for {watch.key}"
+        if self._no_progress_timeout > 0:
+            liveness = self._aggregate.liveness(watch.pid)
+            last_progress = max(watch.started, liveness[1] if liveness else watch.started)
+            idle = now - last_progress
+            if idle > self._no_progress_timeout:
+                return f"watchdog: no progress for {idle:.0f}s on {watch.key}"
+        return None
+
+    def _expire(self, watch: _Watch) -> None:
+        """Author: taobo.zhou
+        请求 worker 采集截图与页面源码，随后结束其进程树。
+        
+            watch: 已超时的监控状态。
+        """
+
+        log.error("[PW][WATCHDOG] pid=%s %s", watch.pid, watch.reason)
+        try:
+            if self._events.send_command(watch.pid, {"op": "diagnose", "reason": watch.reason}):
+                deadline = time.time() + self._diagnostics_timeout
+                while time.time() < deadline:
+                    info = self._aggregate.diagnostics(watch.pid)
+                    if info is not None:
+                        log.error(
+                            "[PW][WATCHDOG] diagnostics pid=%s screenshot=%s page_source=%s",
+                            watch.pid,
+                            info.get("screenshot"),
+                            info.get("page_source"),
+                        )
+                        break
+                    time.sleep(0.5)
+            kill_process_tree(watch.pid)
+        finally:
+            watch.done.set()
+
+
+def capture_diagnostics(driver, out_dir: Path, prefix: str) -> dict:
+    """Author: taobo.zhou
+    采集当前浏览器截图与页面源码。
+    
+        driver: WebDriver 实例，可为空。
+        out_dir: 输出目录。
+        prefix: 文件名前缀。
+    """
+
+    if driver is None:
+        return {"error": "driver is None"}
+    out_dir.mkdir(parents=True, exist_ok=True)
+    ts = time.strftime("%Y%m%d_%H%M%S")
+    info: Dict[str, str] = {}
+    png_path = out_dir / f"{prefix}__WATCHDOG_{ts}_{os.getpid()}.png"
+    try:
+        driver.save_screenshot(str(png_path))
+        info["screenshot"] = str(png_path)
+    except Exception as exc:
+        info["screenshot_error"] = str(exc)
+    html_path = out_dir / f"{prefix}__WATCHDOG_{ts}_{os.getpid()}.html"
+    try:
+        html_path.write_text(driver.page_source or "", encoding="utf-8")
+        info["page_source"] = str(html_path)
+    except Exception as exc:
+        info["page_source_error"] = str(exc)
+    return info
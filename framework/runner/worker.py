@@ -0,0 +1,273 @@
+from __future__ import annotations
+
+import os
+import subprocess
+import sys
+import threading
+from multiprocessing.connection import Client, Listener
+from pathlib import Path
+from typing import Dict, List, Optional
+
+from framework.utils.config_loader import PROJECT_ROOT, load_config
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+_ACCEPT_TIMEOUT = 120.0
+
+
+def _prewarm() -> None:
+    """Author: taobo.zhou
+    预热常驻 worker：导入测试依赖、加载配置与定位器并提前启动浏览器。
+     无。
+    """
+
+    import pytest  # noqa: F401
+    import tests.conftest  # noqa: F401
+    import tests.pytest_hooks  # noqa: F401
+    from framework.core.driver_manager import DriverManager
+    from framework.utils.locator_loader import load_locators
+
+    cfg = load_config()
+    locator_path = Path(cfg["paths"]["locator"])
+    if not locator_path.is_absolute():
+        locator_path = (PROJECT_ROOT / locator_path).resolve()
+    load_locators(str(locator_path))
+
+    if cfg.get("runner", {}).get("prewarm_driver", True):
+        DriverManager.pool().prewarm(1)
+
+
+def worker_main() -> int:
+    """Author: taobo.zhou
+    常驻 worker 进程入口，连接父进程并循环执行下发的 pytest 参数。
+     无。
+    """
+
+    host, port = os.environ["PW_WORKER_ADDR"].rsplit(":", 1)
+    authkey = bytes.fromhex(os.environ["PW_WORKER_AUTHKEY"])
+    slot = int(os.environ.get("PW_WORKER_SLOT", "0"))
+
+    conn = Client((host, int(port)), authkey=authkey)
+    os.environ["PW_KEEP_DRIVER"] = "1"
+    try:
+        _prewarm()
+    except Exception as exc:
+        log.error("[PW][WORKER] slot=%s prewarm failed: %s", slot, exc)
+    conn.send({"op": "hello", "slot": slot, "pid": os.getpid()})
+
+    import pytest
+    from framework.core.driver_manager import DriverManager
+
+    try:
+        while True:
+            try:
+                msg = conn.recv()
+            except EOFError:
+                break
+            if msg.get("op") == "stop":
+                break
+            if msg.get("op") != "run":
+                continue
+
+            # 工作项的环境变量只在本次 pytest.main 内生效，结束后恢复，避免泄漏到下一个工作项
+            saved_env = os.environ.copy()
+            os.environ.update(msg.get("env") or {})
+            try:
+                rc = int(pytest.main(list(msg["args"])))
+            except SystemExit as exc:
+                rc = int(exc.code or 0)
+            except Exception as exc:
+                log.error("[PW][WORKER] slot=%s pytest crashed: %s", slot, exc)
+                rc = 3
+            finally:
+                os.environ.clear()
+                os.environ.update(saved_env)
+            conn.send({"op": "done", "rc": rc})
+    finally:
+        try:
+            DriverManager.quit()
+        finally:
+            conn.close()
+    return 0
+
+
+class _WorkerHandle:
+    """Author: taobo.zhou
+    父进程侧的单个常驻 worker 句柄。
+    Parent-side handle of a single persistent worker.
+    """
+
+    def __init__(self, slot: int, proc: subprocess.Popen, conn, listener: Listener):
+        """Author: taobo.zhou
+        初始化 worker 句柄。
+        
+            slot: worker 槽位编号。
+            proc: worker 子进程对象。
+            conn: 与 worker 通信的连接。
+            listener: 该槽位使用的监听器。
+        """
+
+        self.slot = slot
+        self.proc = proc
+        self.conn = conn
+        self.listener = listener
+
+    def alive(self) -> bool:
+        """Author: taobo.zhou
+        判断 worker 进程是否仍在运行。
+         无。
+        """
+
+        return self.proc.poll() is None
+
+    def close(self, timeout: float = 30.0) -> None:
+        """Author: taobo.zhou
+        通知 worker 退出并回收进程。
+        
+            timeout: 等待退出的最长时间（秒）。
+        """
+
+        try:
+            if self.alive():
+                self.conn.send({"op": "stop"})
+                self.proc.wait(timeout=timeout)
+        except Exception:
+            pass
+        finally:
+            if self.alive():
+                self.proc.kill()
+            try:
+                self.conn.close()
+            finally:
+                self.listener.close()
+
+
+class PersistentWorkerPool:
+    """Author: taobo.zhou
+    常驻 pytest worker 池，每个槽位只启动一次进程并复用导入、配置与浏览器。
+    Persistent pytest worker pool; each slot starts once and keeps imports, config and browser alive.
+    """
+
+    def __init__(self, base_env: Optional[Dict[str, str]] = None):
+        """Author: taobo.zhou
+        初始化 worker 池。
+        
+            base_env: worker 启动时的附加环境变量，可为空。
+        """
+
+        self._base_env = dict(base_env or {})
+        self._workers: Dict[int, _WorkerHandle] = {}
+        self._lock = threading.Lock()
+
+    def _spawn(self, slot: int) -> _WorkerHandle:
+        """Author: taobo.zhou
+        启动指定槽位的 worker 并等待其完成预热。
+        
+            slot: worker 槽位编号。
+        """
+
+        authkey = os.urandom(16)
+        listener = Listener(("127.0.0.1", 0), authkey=authkey)
+        host, port = listener.address
+
+        env = os.environ.copy()
+        env.update(self._base_env)
+        env["PW_WORKER"] = "1"
+        env["PW_WORKER_ADDR"] = f"{host}:{port}"
+        env["PW_WORKER_AUTHKEY"] = authkey.hex()
+        env["PW_WORKER_SLOT"] = str(slot)
+
+        cmd = [sys.executable, "-m", "framework.runner.worker"]
+        log.info("[PW][POOL] spawn slot=%s %s", slot, " ".join(cmd))
+        proc = subprocess.Popen(cmd, env=env, cwd=str(PROJECT_ROOT))
+
+        accepted: List[object] = []
+
+        def _accept():
+            """Author: taobo.zhou
+            在后台线程中接受 worker 连接。
+             无。
+            """
+
+            try:
+                accepted.append(listener.accept())
+            except Exception as exc:
+                accepted.append(exc)
+
+        t = threading.Thread(target=_accept, daemon=True)
+        t.start()
+        t.join(_ACCEPT_TIMEOUT)
+        if not accepted or isinstance(accepted[0], Exception):
+            proc.kill()
+            listener.close()
+            raise RuntimeError(f"persistent worker slot={slot} failed to connect")
+
+        conn = accepted[0]
+        hello = conn.recv()
+        log.info("[PW][POOL] slot=%s ready pid=%s", slot, hello.get("pid"))
+        return _WorkerHandle(slot, proc, conn, listener)
+
+    def _get(self, slot: int) -> _WorkerHandle:
+        """Author: taobo.zhou
+        获取槽位上存活的 worker，不存在或已退出时重新启动。
+        
+            slot: worker 槽位编号。
+        """
+
+        with self._lock:
+            handle = self._workers.get(slot)
+        if handle is not None and handle.alive():
+            return handle
+        if handle is not None:
+            handle.close(timeout=0)
+        handle = self._spawn(slot)
+        with self._lock:
+            self._workers[slot] = handle
+        return handle
+
+    def pid(self, slot: int) -> int:
+        """Author: taobo.zhou
+        返回槽位上 worker 的进程号，必要时先启动 worker。
+        
+            slot: worker 槽位编号。
+        """
+
+        return self._get(slot).proc.pid
+
+    def run(self, slot: int, args: List[str], env: Dict[str, str]) -> int:
+        """Author: taobo.zhou
+        在指定槽位的 worker 中执行一次 pytest 并返回退出码。
+        
+            slot: worker 槽位编号。
+            args: pytest 命令行参数。
+            env: 本次执行需要设置的环境变量。
+        """
+
+        handle = self._get(slot)
+        try:
+            handle.conn.send({"op": "run", "args": list(args), "env": dict(env)})
+            reply = handle.conn.recv()
+        except (EOFError, OSError) as exc:
+            log.error("[PW][POOL] slot=%s worker died: %s", slot, exc)
+            handle.close(timeout=0)
+            with self._lock:
+                self._workers.pop(slot, None)
+            return -1
+        return int(reply.get("rc", 1))
+
+    def close(self) -> None:
+        """Author: taobo.zhou
+        关闭池内所有 worker。
+         无。
+        """
+
+        with self._lock:
+            handles = list(self._workers.values())
+            self._workers.clear()
+        for handle in handles:
+            handle.close()
+
+
+if __name__ == "__main__":
+    raise SystemExit(worker_main())
@@ -0,0 +1,72 @@
+from __future__ import annotations
+
+import json
+import os
+from pathlib import Path
+from typing import Dict
+
+from framework.utils.file_lock import file_lock
+from framework.utils.logger import get_logger
+
+log = get_logger()
+
+# 指标名称 -> sheet 运行目录 reports/ 下的文件名
+CASE_METRIC_FILES = {
+    "commands": "command_latency.json",
+    "resources": "driver_health.json",
+    "budget": "case_budget.json",
+    "waits": "wait_stats.json",
+}
+
+
+def write_case_metrics(path: Path, cases: Dict[str, dict]) -> None:
+    """Author: taobo.zhou
+    将用例指标合并写入 JSON 文件，同一 nodeid 保留尝试序号较大的记录；多个工作项共用一个 sheet 目录，
+    读改写在跨进程文件锁内完成，经临时文件替换写入，读取方不会看到写了一半的文件。
+    
+        path: 指标文件路径。
+        cases: nodeid 到指标（含 attempt）的映射。
+    """
+
+    if not cases:
+        return
+    path.parent.mkdir(parents=True, exist_ok=True)
+    with file_lock(path.with_suffix(".lock")):
+        merged: Dict[str, dict] = {}
+        if path.exists():
+            try:
+                with path.open("r", encoding="utf-8") as f:
+                    merged = json.load(f).get("cases", {}) or {}
+            except Exception as exc:
+                log.warning("[PW][METRICS] bad metrics file %s: %s", path, exc)
+        for nodeid, metrics in cases.items():
+            prev = merged.get(nodeid)
+            if prev is None or int(metrics.get("attempt") or 1) >= int(prev.get("attempt") or 1):
+                merged[nodeid] = metrics
+        tmp_path = path.with_suffix(f".{os.getpid()}.tmp")
+        with tmp_path.open("w", encoding="utf-8") as f:
+            json.dump({"cases": merged}, f, ensure_ascii=False, indent=2)
+        os.replace(tmp_path, path)
+
+
+def load_case_metrics(reports_dir: Path) -> Dict[str, dict]:
+    """Author: taobo.zhou
+    读取 sheet 运行目录下的各类用例指标，返回 nodeid 到 {指标名称: 指标} 的映射。
+    
+        reports_dir: sheet 的 reports 目录。
+    """
+
+    result: Dict[str, dict] = {}
+    for key, filename in CASE_METRIC_FILES.items():
+        path = Path(reports_dir) / filename
+        if not path.exists():
+            continue
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                cases = json.load(f).get("cases", {}) or {}
+        except Exception as exc:
+            log.warning("[PW][METRICS] bad metrics file %s: %s", path, exc)
+            continue
+        for nodeid, metrics in cases.items():
+            result.setdefault(nodeid, {})[key] = metrics
+    return result
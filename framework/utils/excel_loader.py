@@ -16,7 +16,16 @@ def load_excel_kv(path: str, sheet_name: str) -> dict:
             f"Excel 中不存在名为 [{sheet_name}] 的 sheet"
         )
 
-    ws = wb[sheet_name]
+    return _sheet_kv(wb[sheet_name])
+
+
+def _sheet_kv(ws) -> dict:
+    """Author: taobo.zhou
+    读取工作表前两列的键值对。
+    
+        ws: openpyxl 工作表对象。
+    """
+
     data = {}
 
     for row in ws.iter_rows(min_row=2, max_col=2, values_only=True):
@@ -28,11 +37,12 @@ def load_excel_kv(path: str, sheet_name: str) -> dict:
     return data
 
 
-def load_excel_sheets_kv(path: str) -> dict:
+def load_excel_sheets_kv(path: str, sheet_names=None) -> dict:
     """Author: taobo.zhou
-    读取 Excel 中的所有 sheet 并返回键值对集合。
+    只打开一次工作簿，读取全部（或指定）sheet 并返回键值对集合。
     
         path: Excel 文件路径。
+        sheet_names: 需要读取的 sheet 名称列表，为空表示全部。
     """
 
     wb = load_workbook(path, data_only=True)
@@ -40,7 +50,9 @@ def load_excel_sheets_kv(path: str) -> dict:
         raise RuntimeError("Excel 中至少必须存在一个 sheet")
 
     result = {}
-    for name in wb.sheetnames:
-        result[name] = load_excel_kv(path, name)
+    for name in sheet_names or wb.sheetnames:
+        if name not in wb.sheetnames:
+            raise RuntimeError(f"Excel 中不存在名为 [{name}] 的 sheet")
+        result[name] = _sheet_kv(wb[name])
 
     return result
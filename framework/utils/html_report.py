@@ -6,6 +6,161 @@ from typing import List, Dict, Any
 import uuid
 import os
 
+_SPARK_CHARS = "▁▂▃▄▅▆▇█"
+
+
+def _commands_html(commands: Dict[str, Any]) -> str:
+    """Author: taobo.zhou
+    生成 WebDriver 命令耗时的 HTML 片段。
+    
+        commands: 用例的命令耗时汇总。
+    """
+
+    rows = "".join(
+        f"<tr><td>{escape(str(name))}</td><td>{c.get('count')}</td><td>{c.get('total', 0):.3f}</td>"
+        f"<td>{c.get('p50', 0) * 1000:.0f}</td><td>{c.get('p95', 0) * 1000:.0f}</td></tr>"
+        for name, c in (commands.get("commands") or {}).items()
+    )
+    targets = "".join(
+        f"<div>{escape(str(t.get('name')))} ×{t.get('count')} {t.get('total', 0):.3f}s</div>"
+        for t in commands.get("targets") or []
+    )
+    slowest = "".join(
+        f"<div>{escape(str(s.get('command')))} {s.get('seconds', 0):.3f}s "
+        f"<span class='muted'>{escape(str(s.get('caller') or '-'))}</span></div>"
+        for s in commands.get("slowest") or []
+    )
+    return f"""
+<details>
+  <summary>WebDriver 命令耗时（{commands.get('count', 0)} 次 / {commands.get('total', 0):.1f}s）</summary>
+  <table class="metrics">
+    <tr><th>命令</th><th>次数</th><th>总耗时(s)</th><th>p50(ms)</th><th>p95(ms)</th></tr>
+    {rows}
+  </table>
+  <div class="muted">耗时最多的定位器</div>{targets or "<div class='muted'>-</div>"}
+  <div class="muted">最慢的命令</div>{slowest or "<div class='muted'>-</div>"}
+</details>
+"""
+
+
+def _sparkline(values: List[float], width: int = 60) -> str:
+    """Author: taobo.zhou
+    将数值序列渲染为字符迷你曲线（邮件客户端不支持 SVG/脚本，用字符保证可见），超过宽度时按区间取最大值。
+    
+        values: 数值序列。
+        width: 最多字符数。
+    """
+
+    if not values:
+        return ""
+    if len(values) > width:
+        step = len(values) / width
+        values = [max(values[int(i * step):max(int(i * step) + 1, int((i + 1) * step))]) for i in range(width)]
+    low, high = min(values), max(values)
+    span = (high - low) or 1.0
+    return "".join(_SPARK_CHARS[int((v - low) / span * (len(_SPARK_CHARS) - 1))] for v in values)
+
+
+def _resources_html(resources: Dict[str, Any]) -> str:
+    """Author: taobo.zhou
+    生成浏览器资源曲线（RSS、CPU、命令延迟）的 HTML 片段。
+    
+        resources: 用例的驱动健康采样数据。
+    """
+
+    samples = resources.get("samples") or []
+    series = (
+        ("RSS(MB)", [s[1] for s in samples]),
+        ("CPU(%)", [s[2] for s in samples]),
+        ("p95 延迟(ms)", [s[3] for s in samples]),
+    )
+    rows = "".join(
+        f"<tr><td>{name}</td><td class='spark'>{_sparkline(values)}</td>"
+        f"<td>{min(values):.0f}</td><td>{max(values):.0f}</td></tr>"
+        for name, values in series
+        if values
+    )
+    recycle = resources.get("recycle")
+    recycle_html = f"<div class='muted'>已标记回收：{escape(str(recycle))}</div>" if recycle else ""
+    return f"""
+<details>
+  <summary>浏览器资源（峰值 {resources.get('peak_rss_mb', 0):.0f}MB / CPU {resources.get('max_cpu_percent', 0):.0f}%）</summary>
+  <table class="metrics">
+    <tr><th>指标</th><th>曲线（每 {resources.get('interval', 0):g}s 采样）</th><th>最小</th><th>最大</th></tr>
+    {rows}
+  </table>
+  {recycle_html}
+</details>
+"""
+
+
+def _budget_html(budget: Dict[str, Any]) -> str:
+    """Author: taobo.zhou
+    生成用例时间预算使用情况的 HTML 片段。
+    
+        budget: 用例的时间预算汇总。
+    """
+
+    rows = "".join(
+        f"<tr><td>{escape(str(s.get('step')))}</td><td>{s.get('count')}</td><td>{s.get('seconds', 0):.1f}</td>"
+        f"<td>{s.get('percent', 0):.1f}%</td><td>{'截断' if s.get('clamped') else ''}</td></tr>"
+        for s in sorted(budget.get("steps") or [], key=lambda s: s.get("seconds", 0), reverse=True)
+    )
+    used, total = budget.get("used", 0), budget.get("budget", 0) or 1
+    return f"""
+<details>
+  <summary>时间预算（{used:.0f}s / {total:.0f}s，{used / total * 100:.0f}%）</summary>
+  <table class="metrics">
+    <tr><th>步骤</th><th>次数</th><th>耗时(s)</th><th>占预算</th><th></th></tr>
+    {rows}
+  </table>
+</details>
+"""
+
+
+def _waits_html(waits: Dict[str, Any]) -> str:
+    """Author: taobo.zhou
+    生成等待步骤轮询次数与耗时的 HTML 片段。
+    
+        waits: 用例的等待统计。
+    """
+
+    rows = "".join(
+        f"<tr><td>{escape(str(step))}</td><td>{s.get('count')}</td><td>{s.get('polls')}</td>"
+        f"<td>{s.get('seconds', 0):.2f}</td><td>{s.get('max', 0):.2f}</td><td>{s.get('timeouts') or ''}</td></tr>"
+        for step, s in (waits.get("steps") or {}).items()
+    )
+    return f"""
+<details>
+  <summary>等待（{waits.get('count', 0)} 次 / {waits.get('polls', 0)} 次轮询 / {waits.get('seconds', 0):.1f}s）</summary>
+  <table class="metrics">
+    <tr><th>步骤</th><th>次数</th><th>轮询</th><th>耗时(s)</th><th>最长(s)</th><th>未满足</th></tr>
+    {rows}
+  </table>
+</details>
+"""
+
+
+def _metrics_html(metrics: Dict[str, Any] | None) -> str:
+    """Author: taobo.zhou
+    生成用例性能指标的 HTML 片段，没有指标时返回空字符串。
+    
+        metrics: 指标名称到指标数据的映射。
+    """
+
+    if not metrics:
+        return ""
+    parts = []
+    if metrics.get("commands"):
+        parts.append(_commands_html(metrics["commands"]))
+    if metrics.get("resources"):
+        parts.append(_resources_html(metrics["resources"]))
+    if metrics.get("budget"):
+        parts.append(_budget_html(metrics["budget"]))
+    if metrics.get("waits"):
+        parts.append(_waits_html(metrics["waits"]))
+    return "".join(parts)
+
 
 def build_html_report(
     results: List[Any],
@@ -68,6 +223,8 @@ def build_html_report(
             else "<div class='muted'>无失败日志</div>"
         )
 
+        metrics_html = _metrics_html(getattr(r, "metrics", None))
+
         display_status = r.status
         if r.status == "PASS" and r.retried:
             display_status = "PASS (after retry)"
@@ -105,6 +262,7 @@ def build_html_report(
       {screenshots_html}
       {error_html}
     </details>
+    {metrics_html}
   </td>
 </tr>
 """
@@ -148,6 +306,18 @@ details summary {{
   margin-top: 6px;
 }}
 .k {{ color: #666; }}
+table.metrics {{
+  width: auto;
+  margin: 6px 0;
+}}
+table.metrics th, table.metrics td {{
+  padding: 2px 8px;
+  font-size: 12px;
+}}
+table.metrics td.spark {{
+  font-family: monospace;
+  letter-spacing: -1px;
+}}
 pre {{
   background: #f6f8fa;
   padding: 8px;
@@ -1,9 +1,13 @@
 import os
+import threading
 
 import yaml
 from selenium.webdriver.common.by import By
 
 
+_WAIT_KEYS = {"timeout", "initial", "factor", "max_interval"}
+
+
 class LocatorLoader:
     """Author: taobo.zhou
     定位器加载器，负责读取并校验定位器配置。
@@ -37,6 +41,9 @@ class LocatorLoader:
             for name, locator in locators.items():
                 if "by" not in locator or "value" not in locator:
                     raise ValueError(f"{page}.{name} missing by/value")
+                wait = locator.get("wait")
+                if wait is not None and (not isinstance(wait, dict) or set(wait) - _WAIT_KEYS):
+                    raise ValueError(f"{page}.{name}.wait only supports {sorted(_WAIT_KEYS)}")
 
     def get(self, page, name):
         """Author: taobo.zhou
@@ -52,6 +59,29 @@ class LocatorLoader:
             raise KeyError(f"Locator not found: {page}.{name}")
 
 
+_LOADER_CACHE = {}
+_LOADER_CACHE_LOCK = threading.Lock()
+
+
+def load_locators(yaml_path):
+    """Author: taobo.zhou
+    加载并校验定位器文件，按路径与修改时间缓存，供常驻 worker 复用。
+    
+        yaml_path: 定位器 YAML 文件路径。
+    """
+
+    path = os.path.abspath(yaml_path)
+    mtime = os.path.getmtime(path) if os.path.exists(path) else None
+    with _LOADER_CACHE_LOCK:
+        cached = _LOADER_CACHE.get(path)
+        if cached is not None and cached[0] == mtime:
+            return cached[1]
+        loader = LocatorLoader(path)
+        loader.validate_all()
+        _LOADER_CACHE[path] = (mtime, loader)
+        return loader
+
+
 class PageLocators:
     """Author: taobo.zhou
     页面定位器代理，转换为 Selenium 定位器。
@@ -91,6 +121,15 @@ class PageLocators:
             raise KeyError(f"Locator not found: {self._page_name}.{name}.shadow_host")
         return _convert_locator(locator["by"], locator["shadow_host"])
 
+    def get_wait(self, name):
+        """Author: taobo.zhou
+        获取定位器的等待策略覆盖（wait: timeout/initial/factor/max_interval），未配置时返回空字典。
+        
+            name: 定位器名称。
+        """
+
+        return dict(self._loader.get(self._page_name, name).get("wait") or {})
+
 
 def _convert_locator(locator_type: str, locator_value: str):
     """Author: taobo.zhou
@@ -0,0 +1,64 @@
+from __future__ import annotations
+
+from pathlib import Path
+from typing import Optional
+
+import yaml
+
+from framework.utils.config_loader import PROJECT_ROOT
+
+
+def load_retry_policy(path: str | Path = "config/retry_policy.yaml") -> dict:
+    """Author: taobo.zhou
+    读取重跑策略配置，文件缺失或解析失败时返回默认策略。
+    
+        path: 策略文件路径，支持相对路径。
+    """
+
+    p = Path(path)
+    if not p.is_absolute():
+        p = (PROJECT_ROOT / p).resolve()
+
+    retry_cfg = {}
+    if p.exists():
+        try:
+            with p.open("r", encoding="utf-8") as f:
+                retry_cfg = yaml.safe_load(f) or {}
+        except Exception:
+            retry_cfg = {}
+
+    retry_section = retry_cfg.get("retry", {}) if isinstance(retry_cfg, dict) else {}
+    return {
+        "max_retry": int(retry_section.get("max_retry", 1)),
+        "non_retryable_keywords": retry_section.get("non_retryable_keywords") or [],
+        "retryable_keywords": retry_section.get("retryable_keywords") or [],
+    }
+
+
+def should_retry_error(longrepr: Optional[str], policy: dict) -> bool:
+    """Author: taobo.zhou
+    根据错误信息与策略判断是否允许重跑。
+    
+        longrepr: 错误的详细信息字符串。
+        policy: 重跑策略配置字典。
+    """
+
+    if not longrepr:
+        return False
+
+    text = str(longrepr)
+    text_lower = text.lower()
+    non_retryable = policy.get("non_retryable_keywords") or []
+    for kw in non_retryable:
+        if kw and str(kw).lower() in text_lower:
+            return False
+
+    retryable = policy.get("retryable_keywords") or []
+    if not retryable:
+        return True
+
+    for kw in retryable:
+        if kw and str(kw).lower() in text_lower:
+            return True
+
+    return False
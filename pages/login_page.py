@@ -1,3 +1,5 @@
+from urllib.parse import urlsplit
+
 from framework.core.base_page import BasePage
 from framework.pingid_reader import PingIDOtpManager
 
@@ -17,6 +19,83 @@ class LoginPage(BasePage):
         """
 
         super().__init__(driver, locator_loader, page_name="LoginPage")
+        self.__driver = driver
+
+    def login_with_cache(self, url: str, username: str, password: str, session_cache=None) -> bool:
+        """Author: taobo.zhou
+        优先注入缓存的登录态并跳过登录；缓存无效时由一个 worker 完整登录并保存，返回是否复用了缓存。
+        
+            url: 基础 URL。
+            username: 登录用户名。
+            password: 登录密码。
+            session_cache: AuthSessionCache 实例，为空时直接完整登录。
+        """
+
+        if session_cache is None:
+            self._open_and_login(url, username, password)
+            return False
+
+        if self._try_cached_session(url, username, session_cache):
+            return True
+        with session_cache.login_lock(url, username):
+            if self._try_cached_session(url, username, session_cache):
+                return True
+            self._open_and_login(url, username, password)
+            session_cache.save(self.__driver, url, username)
+        return False
+
+    def _try_cached_session(self, url: str, username: str, session_cache) -> bool:
+        """Author: taobo.zhou
+        注入缓存的登录态并探测是否仍然有效，无效时删除缓存。
+        
+            url: 基础 URL。
+            username: 登录用户名。
+            session_cache: AuthSessionCache 实例。
+        """
+
+        try:
+            if not session_cache.restore(self.__driver, url, username):
+                return False
+            self.wait_page_ready()
+            if self._session_valid(url, session_cache.probe_timeout):
+                self._log.info(f"[LOGIN] reuse cached session user={username}")
+                return True
+        except Exception as exc:
+            self._log.warning(f"[LOGIN] restore cached session failed: {exc}")
+        self._log.info(f"[LOGIN] cached session invalid, login again user={username}")
+        session_cache.invalidate(url, username)
+        self.__driver.delete_all_cookies()
+        return False
+
+    def _session_valid(self, url: str, timeout: float) -> bool:
+        """Author: taobo.zhou
+        探测缓存的登录态：等待只有登录后才出现的 logged_in_marker，先出现登录输入框或超时均视为无效；
+        标志出现后仍需停留在应用域名（SPA 加载后再跳转到 IdP、登录表单异步渲染时都不会误判为已登录）。
+        
+            url: 基础 URL。
+            timeout: 最长等待时间（秒）。
+        """
+
+        outcome = self.wait_any({"logged_in": "logged_in_marker", "login": "username_input"}, timeout)
+        if outcome != "logged_in":
+            return False
+        return urlsplit(self.__driver.current_url or "").netloc == urlsplit(url).netloc
+
+    def _open_and_login(self, url: str, username: str, password: str):
+        """Author: taobo.zhou
+        打开登录页并执行完整登录流程。
+        
+            url: 基础 URL。
+            username: 登录用户名。
+            password: 登录密码。
+        """
+
+        self.open(url)
+        self.wait_page_ready()
+        self.wait_visible("next_button"), (
+            "登录页加载失败：next_button 不可见（检查 url / locator / 页面是否可访问）"
+        )
+        self.login(username, password)
 
     def login(self, username: str, password: str):
         """Author: taobo.zhou
@@ -1,3 +1,5 @@
+from selenium.common.exceptions import TimeoutException
+
 from framework.core.base_page import BasePage
 
 
@@ -45,19 +47,19 @@ class SoftwareContainerPage(BasePage):
         self.click("create_version_button")
 
         self.wait_visible("select_version")
-        self.sleep(1.5)
+        self.wait_dom_stable()
         self.select("select_version", version)
         if self.get_element_attr("release_candidate", "class").strip().endswith("unchecked"):
             self.click("release_candidate")
         if self.get_element_attr("MB_conform_flashable", "class").strip().endswith("unchecked"):
             self.click("MB_conform_flashable")
-        self.sleep(5.5)
+        self.wait_dom_stable(timeout=15)
         self.click("next_button")
 
         self.wait_visible("general_setting")
         self.wait_page_ready()
         self.select("general_setting", general_setting)
-        self.sleep(1.5)
+        self.wait_dom_stable()
         self.input_text_in_shadow_dom("semantic_version", semantic_version)
         self.input_text_in_shadow_dom("software_part_number", software_part_number)
         self.input_text_in_shadow_dom("software_YMP_version", software_YMP_version)
@@ -77,4 +79,9 @@ class SoftwareContainerPage(BasePage):
 
         self.mouse_click("version_confirm_button")
 
-        self.wait_visible("succeeded", 60 * 5)
+        outcome = self.wait_any({"succeeded": "succeeded", "error": "error_message"}, 60 * 5)
+        if outcome == "error":
+            raise AssertionError(f"创建版本失败：{self._find('error_message').text}")
+        if outcome is None:
+            # 与其他等待超时一致按 ERROR 处理（可重跑），只有页面明确报错才判定为 FAIL
+            raise TimeoutException("等待创建版本结果超时，请检查！")
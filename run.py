@@ -1,22 +1,40 @@
 from __future__ import annotations
 
+import argparse
+import base64
+import hashlib
 import json
 import os
+import re
+import secrets
+import socket
 import sys
+import threading
 import time
 import zipfile
-from concurrent.futures import ThreadPoolExecutor, as_completed
 from dataclasses import dataclass
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Callable, Dict, List, Optional, Tuple
 
 import subprocess
 from openpyxl import load_workbook
 
+from framework.driver.connection_bench import run_benchmark
+from framework.driver.driver_factory import build_profile_template
+from framework.runner.concurrency import AdaptiveConcurrency
+from framework.runner.coordinator import PUBLIC_AUTHKEY, Coordinator, CoordinatorClient, parse_address
+from framework.runner.events import EventServer, LiveAggregate
+from framework.runner.history import DurationHistory, assign_shards, plan_longest_first
+from framework.runner.journal import merge_journals
+from framework.runner.scheduler import ItemOutcome, WorkItem, WorkQueueScheduler
+from framework.runner.watchdog import Watchdog
+from framework.runner.worker import PersistentWorkerPool
+from framework.utils.case_metrics import load_case_metrics
 from framework.utils.config_loader import load_config
 from framework.utils.html_report import build_html_report
 from framework.utils.logger import get_logger
 from framework.utils.mailer import send_report
+from framework.utils.retry_policy import load_retry_policy, should_retry_error
 
 log = get_logger()
 
@@ -38,6 +56,7 @@ class CaseResult:
     nodeid: str
     start_time: str
     end_time: str
+    metrics: Optional[dict] = None
 
 
 def _now_ts() -> str:
@@ -93,35 +112,392 @@ def _load_sheet_names(cfg: dict) -> List[str]:
         wb.close()
 
 
-def _run_sheet(sheet: str, run_dir: Path, run_root: Path) -> int:
+def _parse_shard(value: str) -> Tuple[int, int]:
     """Author: taobo.zhou
-    运行指定 sheet 的 pytest 用例。
+    解析 --shard 参数（i/N，i 从 1 开始）。
+    
+        value: 命令行参数值。
+    """
+
+    match = re.fullmatch(r"\s*(\d+)\s*/\s*(\d+)\s*", value or "")
+    if not match:
+        raise argparse.ArgumentTypeError(f"--shard 格式应为 i/N: {value}")
+    index, total = int(match.group(1)), int(match.group(2))
+    if total < 1 or not 1 <= index <= total:
+        raise argparse.ArgumentTypeError(f"--shard 需满足 1 <= i <= N: {value}")
+    return index, total
+
+
+def _select_shard(sheet_names: List[str], index: int, total: int, mode: str, runs_root: Path) -> List[str]:
+    """Author: taobo.zhou
+    返回第 index/total 个分片包含的 sheet，保持 Excel 中的原始顺序。
+    
+        sheet_names: 全部 sheet 名称。
+        index: 分片序号（从 1 开始）。
+        total: 分片数量。
+        mode: hash 按名称哈希排序后轮流分配；duration 按 durations.json 历史耗时均衡分配。
+        runs_root: output/runs 目录。
+    """
+
+    if mode == "duration":
+        buckets = assign_shards(DurationHistory(runs_root).estimates(sheet_names), total)
+        selected = set(buckets[index - 1])
+    else:
+        ordered = sorted(sheet_names, key=lambda sheet: hashlib.sha1(sheet.encode("utf-8")).hexdigest())
+        selected = set(ordered[index - 1::total])
+    return [sheet for sheet in sheet_names if sheet in selected]
+
+
+def _write_shard_info(run_root: Path, index: int, total: int, mode: str, sheet_names: List[str]) -> None:
+    """Author: taobo.zhou
+    将分片信息写入 reports/shard.json，供续跑与 merge 命令识别本目录包含的 sheet。
+    
+        run_root: 运行根目录。
+        index: 分片序号（从 1 开始）。
+        total: 分片数量。
+        mode: 分片方式。
+        sheet_names: 本分片包含的 sheet。
+    """
+
+    path = run_root / "reports" / "shard.json"
+    _ensure_dir(path.parent)
+    with path.open("w", encoding="utf-8") as f:
+        json.dump(
+            {"shard": index, "of": total, "mode": mode, "sheets": sheet_names},
+            f,
+            ensure_ascii=False,
+            indent=2,
+        )
+
+
+def _read_shard_info(run_root: Path) -> Optional[dict]:
+    """Author: taobo.zhou
+    读取运行目录中的分片信息，不存在时返回 None。
+    
+        run_root: 运行根目录。
+    """
+
+    path = run_root / "reports" / "shard.json"
+    if not path.exists():
+        return None
+    with path.open("r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _run_dir_sheets(run_root: Path) -> List[str]:
+    """Author: taobo.zhou
+    返回运行目录包含的 sheet，优先读取 shard.json，否则按含 results.json 的子目录推断。
+    
+        run_root: 运行根目录。
+    """
+
+    info = _read_shard_info(run_root)
+    if info and info.get("sheets"):
+        return [str(sheet) for sheet in info["sheets"]]
+    return sorted(p.parent.parent.name for p in run_root.glob("*/reports/results.json"))
+
+
+def _worker_env(run_dir: Path, run_root: Path) -> Dict[str, str]:
+    """Author: taobo.zhou
+    构建 worker 执行单个工作项所需的环境变量。
     
-        sheet: sheet 名称。
         run_dir: 当前 sheet 的运行目录。
         run_root: 运行根目录。
     """
 
-    env = os.environ.copy()
-    env["PW_WORKER"] = "1"
-    env["PW_RUN_DIR"] = str(run_dir)
-    env["PW_PINGID_LOCKFILE"] = str(run_root / "pingid.lock")
+    return {
+        "PW_WORKER": "1",
+        "PW_RUN_DIR": str(run_dir),
+        "PW_PINGID_LOCKFILE": str(run_root / "pingid.lock"),
+    }
+
+
+def _collect_cases() -> List[Optional[str]]:
+    """Author: taobo.zhou
+    一次性收集 tests 下的用例函数，返回去掉参数化后缀的 nodeid 列表。
+     无。
+    """
 
     cmd = [
         sys.executable,
         "-m",
         "pytest",
+        "-o",
+        "addopts=",
+        "-q",
+        "--collect-only",
+        "-p",
+        "no:cacheprovider",
+        "tests",
+    ]
+    env = os.environ.copy()
+    env["PW_WORKER"] = "1"
+    try:
+        completed = subprocess.run(cmd, env=env, capture_output=True, text=True, encoding="utf-8", errors="replace")
+    except Exception as exc:
+        log.warning("[PW][COLLECT] failed, fallback to sheet-level items: %s", exc)
+        return [None]
+
+    cases: List[Optional[str]] = []
+    for line in completed.stdout.splitlines():
+        case = line.strip().split("[", 1)[0]
+        if "::" not in case or " " in case:
+            continue
+        if case not in cases:
+            cases.append(case)
+
+    if completed.returncode != 0 or not cases:
+        tail = (completed.stdout + completed.stderr).strip().splitlines()[-5:]
+        log.warning(
+            "[PW][COLLECT] rc=%s cases=%s, fallback to sheet-level items: %s",
+            completed.returncode,
+            len(cases),
+            " | ".join(tail),
+        )
+        return [None]
+    log.info("[PW][COLLECT] cases=%s", cases)
+    return cases
+
+
+def _item_results_path(run_dir: Path, item: WorkItem) -> Path:
+    """Author: taobo.zhou
+    返回工作项单次尝试的结果文件路径。
+    
+        run_dir: 当前 sheet 的运行目录。
+        item: 工作项。
+    """
+
+    case = item.case or "all"
+    safe_case = re.sub(r"[^A-Za-z0-9_.=-]+", "_", case.split("::")[-1])[:60]
+    digest = hashlib.sha1(case.encode("utf-8")).hexdigest()[:8]
+    return run_dir / "reports" / "attempts" / f"{safe_case}_{digest}__attempt{item.attempt}.json"
+
+
+def _worst_status(payload: dict) -> Tuple[str, Optional[str]]:
+    """Author: taobo.zhou
+    从单次尝试的结果中取最严重的状态及错误信息。
+    
+        payload: 结果文件内容。
+    """
+
+    results = payload.get("results") or []
+    if not results:
+        return "ERROR", "no test results produced"
+
+    rank = {"PASS": 0, "SKIP": 1, "FAIL": 2, "ERROR": 3}
+    worst = max(results, key=lambda r: rank.get(_normalize_status(str(r.get("status", ""))), 3))
+    return _normalize_status(str(worst.get("status", ""))), worst.get("error")
+
+
+def _run_item(
+    item: WorkItem,
+    run_root: Path,
+    slot: int,
+    pool: Optional[PersistentWorkerPool] = None,
+    events: Optional[EventServer] = None,
+    aggregate: Optional[LiveAggregate] = None,
+    watchdog: Optional[Watchdog] = None,
+) -> ItemOutcome:
+    """Author: taobo.zhou
+    运行单个工作项并读取其结果，pool 为空时启动独立 pytest 进程。
+    
+        item: 工作项。
+        run_root: 运行根目录。
+        slot: worker 槽位编号。
+        pool: 常驻 worker 池，可为空。
+        events: 事件服务，可为空。
+        aggregate: 实时汇总，worker 异常退出时用于恢复部分结果，可为空。
+        watchdog: 看门狗，可为空。
+    """
+
+    run_dir = run_root / item.sheet
+    results_path = _item_results_path(run_dir, item)
+    worker_env = _worker_env(run_dir, run_root)
+    if events is not None:
+        worker_env.update(events.env())
+
+    args = [
         "-q",
         "--pw-worker",
         "--pw-sheet",
-        sheet,
+        item.sheet,
         "--pw-run-dir",
         str(run_dir),
-        "tests",
+        "--pw-attempt",
+        str(item.attempt),
+        "--pw-results",
+        str(results_path),
+        item.case or "tests",
     ]
-    log.info("[PW][RUN] %s", " ".join(cmd))
-    completed = subprocess.run(cmd, env=env)
-    return completed.returncode
+    started = time.time()
+    watchdog_reason = None
+    worker_pid = None
+    if pool is not None:
+        log.info("[PW][RUN] slot=%s pytest %s", slot, " ".join(args))
+        pid = worker_pid = pool.pid(slot)
+        if watchdog is not None:
+            watchdog.watch(pid, item.key)
+        try:
+            returncode = pool.run(slot, args, worker_env)
+        finally:
+            if watchdog is not None:
+                watchdog_reason = watchdog.unwatch(pid)
+    else:
+        cmd = [sys.executable, "-m", "pytest", *args]
+        env = os.environ.copy()
+        env.update(worker_env)
+        log.info("[PW][RUN] %s", " ".join(cmd))
+        proc = subprocess.Popen(cmd, env=env)
+        worker_pid = proc.pid
+        if watchdog is not None:
+            watchdog.watch(proc.pid, item.key)
+        try:
+            returncode = proc.wait()
+        finally:
+            if watchdog is not None:
+                watchdog_reason = watchdog.unwatch(proc.pid)
+    duration = time.time() - started
+
+    if not results_path.exists() and aggregate is not None:
+        _recover_partial_results(item, results_path, returncode, events, aggregate, watchdog_reason, worker_pid)
+
+    if not results_path.exists():
+        return ItemOutcome(
+            item=item,
+            returncode=returncode,
+            status="ERROR",
+            error=watchdog_reason or f"worker exited rc={returncode} without results",
+            duration=duration,
+        )
+    with results_path.open("r", encoding="utf-8") as f:
+        payload = json.load(f)
+    status, error = _worst_status(payload)
+    return ItemOutcome(item=item, returncode=returncode, status=status, error=error, duration=duration)
+
+
+def _recover_partial_results(
+    item: WorkItem,
+    results_path: Path,
+    returncode: int,
+    events: Optional[EventServer],
+    aggregate: LiveAggregate,
+    reason: Optional[str] = None,
+    pid: Optional[int] = None,
+) -> None:
+    """Author: taobo.zhou
+    worker 未写出结果时，用该工作项已收到的事件生成部分结果，进行中的用例记为 ERROR。
+    
+        item: 工作项。
+        results_path: 该工作项的结果文件路径。
+        returncode: worker 退出码。
+        events: 事件服务，可为空。
+        aggregate: 实时汇总。
+        reason: 看门狗终止原因，可为空。
+        pid: 执行该工作项的 worker 进程号，可为空。
+    """
+
+    if events is not None:
+        pids = [pid] if pid else aggregate.pids_for(item.sheet, item.attempt, item.case)
+        for worker_pid in pids:
+            events.wait_closed(worker_pid)
+    payload = aggregate.partial_payload(
+        item.sheet,
+        item.attempt,
+        reason or f"worker died before finishing the case (rc={returncode})",
+        case=item.case,
+        pid=pid,
+    )
+    if payload is None:
+        return
+    _ensure_dir(results_path.parent)
+    with results_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    log.warning("[PW][EVENT] partial results recovered for item=%s -> %s", item.key, results_path)
+
+
+def _should_requeue(outcome: ItemOutcome, policy: dict) -> bool:
+    """Author: taobo.zhou
+    判断工作项是否按重跑策略回到队列。
+    
+        outcome: 工作项执行结果。
+        policy: 重跑策略配置字典。
+    """
+
+    if outcome.status != "ERROR":
+        return False
+    if outcome.item.retries >= int(policy.get("max_retry", 0)):
+        return False
+    return should_retry_error(outcome.error, policy)
+
+
+def _journal_to_result(record: dict) -> dict:
+    """Author: taobo.zhou
+    将尝试日志记录转换为 results.json 中的单条结果。
+    
+        record: 尝试日志中的一条记录。
+    """
+
+    attempt = int(record.get("attempt") or 1)
+    return {
+        "case_id": record.get("sheet_name"),
+        "sheet": record.get("sheet_name"),
+        "status": _normalize_status(str(record.get("status") or record.get("outcome") or "")),
+        "retried": attempt > 1,
+        "attempt": attempt,
+        "error": record.get("longrepr"),
+        "screenshot": record.get("screenshot_path"),
+        "nodeid": record.get("nodeid"),
+        "start_time": record.get("start_time", "-"),
+        "end_time": record.get("end_time", "-"),
+        "duration": record.get("duration"),
+    }
+
+
+def _merge_sheet_results(run_dir: Path, sheet: str) -> None:
+    """Author: taobo.zhou
+    流式合并 sheet 下的尝试日志与尝试结果文件，每个 nodeid 保留最后一次尝试，写出 results.json。
+    
+        run_dir: 当前 sheet 的运行目录。
+        sheet: sheet 名称。
+    """
+
+    reports_dir = run_dir / "reports"
+    journal_final, case_params = merge_journals(sorted((reports_dir / "journal").glob("*.jsonl")))
+    final: Dict[str, dict] = {nodeid: _journal_to_result(r) for nodeid, r in journal_final.items()}
+
+    for path in sorted((reports_dir / "attempts").glob("*.json")):
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                payload = json.load(f)
+        except Exception as exc:
+            log.error("[PW][MERGE] bad attempt file %s: %s", path, exc)
+            continue
+        case_params.update(payload.get("case_params", {}) or {})
+        for item in payload.get("results", []):
+            nodeid = str(item.get("nodeid", ""))
+            prev = final.get(nodeid)
+            if prev is None or int(item.get("attempt") or 1) >= int(prev.get("attempt") or 1):
+                final[nodeid] = item
+
+    if not final:
+        return
+
+    results = list(final.values())
+    statuses = [_normalize_status(str(r.get("status", ""))) for r in results]
+    payload = {
+        "sheet": sheet,
+        "counts": {
+            "total": len(results),
+            "passed": statuses.count("PASS"),
+            "failed": statuses.count("FAIL"),
+            "error": statuses.count("ERROR"),
+            "skipped": statuses.count("SKIP"),
+        },
+        "results": results,
+        "case_params": case_params,
+    }
+    with (reports_dir / "results.json").open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
 
 
 def _normalize_status(status: str) -> str:
@@ -167,6 +543,7 @@ def _collect_results(run_root: Path, sheet_names: List[str]) -> tuple[List[CaseR
             payload = json.load(f)
 
         case_params.update(payload.get("case_params", {}) or {})
+        case_metrics = load_case_metrics(result_path.parent)
         for item in payload.get("results", []):
             status = _normalize_status(str(item.get("status", "")))
             results.append(CaseResult(
@@ -180,6 +557,7 @@ def _collect_results(run_root: Path, sheet_names: List[str]) -> tuple[List[CaseR
                 nodeid=str(item.get("nodeid", "")),
                 start_time=str(item.get("start_time", "-")),
                 end_time=str(item.get("end_time", "-")),
+                metrics=case_metrics.get(str(item.get("nodeid", ""))),
             ))
 
             counts["total"] += 1
@@ -195,67 +573,599 @@ def _collect_results(run_root: Path, sheet_names: List[str]) -> tuple[List[CaseR
     return results, case_params, counts
 
 
-def _zip_screenshots(run_root: Path, ts: str) -> Optional[str]:
+def _zip_screenshots(run_root: Path, ts: str, sources: Optional[List[Path]] = None) -> Optional[str]:
     """Author: taobo.zhou
     打包所有截图并返回 zip 路径。
     
-        run_root: 运行根目录。
+        run_root: 运行根目录，zip 写入其 reports 目录。
         ts: 时间戳字符串。
+        sources: 截图来源运行目录列表，为空时只打包 run_root。
     """
 
     reports_dir = run_root / "reports"
     _ensure_dir(reports_dir)
     zip_path = reports_dir / f"screenshots_{ts}.zip"
     with zipfile.ZipFile(str(zip_path), "w", compression=zipfile.ZIP_DEFLATED) as zf:
-        for sheet_dir in run_root.iterdir():
-            if not sheet_dir.is_dir():
-                continue
-            ss_dir = sheet_dir / "screenshots"
-            if not ss_dir.exists():
-                continue
-            for root, _, files in os.walk(str(ss_dir)):
-                for fname in files:
-                    file_path = Path(root) / fname
-                    rel_path = file_path.relative_to(run_root)
-                    zf.write(str(file_path), str(rel_path))
+        for source in sources or [run_root]:
+            for sheet_dir in source.iterdir():
+                if not sheet_dir.is_dir():
+                    continue
+                ss_dir = sheet_dir / "screenshots"
+                if not ss_dir.exists():
+                    continue
+                for root, _, files in os.walk(str(ss_dir)):
+                    for fname in files:
+                        file_path = Path(root) / fname
+                        rel_path = file_path.relative_to(source)
+                        zf.write(str(file_path), str(rel_path))
     return str(zip_path)
 
 
-def main() -> int:
+def _latest_run_dir(runs_root: Path) -> Optional[Path]:
     """Author: taobo.zhou
-    主入口，执行并汇总自动化测试。
-     无。
+    返回最近一次运行目录（不含 merge 生成的目录）。
+    
+        runs_root: output/runs 目录。
     """
 
-    cfg = load_config()
-    max_workers = int(cfg.get("runner", {}).get("max_workers", 1))
-    sheet_names = _load_sheet_names(cfg)
+    if not runs_root.exists():
+        return None
+    run_dirs = sorted(p for p in runs_root.iterdir() if p.is_dir() and not p.name.endswith("_merged"))
+    return run_dirs[-1] if run_dirs else None
 
-    ts = _now_ts()
-    project_root = Path(cfg.get("_project_root", "."))
-    run_root = project_root / "output" / "runs" / ts
-    _ensure_dir(run_root)
 
+def _resume_plan(run_root: Path, sheet_names: List[str]) -> Dict[str, int]:
+    """Author: taobo.zhou
+    读取已有运行目录，返回需要重跑的 sheet 及其新的起始尝试序号。
+    
+        run_root: 已有的运行根目录。
+        sheet_names: sheet 名称列表。
+    """
+
+    plan: Dict[str, int] = {}
     for sheet in sheet_names:
+        sheet_dir = run_root / sheet
+        _merge_sheet_results(sheet_dir, sheet)
+        result_path = sheet_dir / "reports" / "results.json"
+        if not result_path.exists():
+            plan[sheet] = 1
+            continue
+        try:
+            with result_path.open("r", encoding="utf-8") as f:
+                items = json.load(f).get("results", []) or []
+        except Exception as exc:
+            log.error("[PW][RESUME] bad results.json for sheet=%s: %s", sheet, exc)
+            plan[sheet] = 1
+            continue
+        statuses = {_normalize_status(str(item.get("status", ""))) for item in items}
+        if not items or statuses & {"FAIL", "ERROR"}:
+            plan[sheet] = max(int(item.get("attempt") or 1) for item in items) + 1 if items else 1
+    return plan
+
+
+def _start_runtime(runner_cfg: dict, run_root: Path) -> Tuple[
+    Optional[PersistentWorkerPool], LiveAggregate, EventServer, Optional[Watchdog]
+]:
+    """Author: taobo.zhou
+    启动本机执行所需的常驻 worker 池、事件服务与看门狗。
+    
+        runner_cfg: runner 配置字典。
+        run_root: 运行根目录。
+    """
+
+    pool = None
+    if str(runner_cfg.get("worker_mode", "subprocess")).lower() == "persistent":
+        pool = PersistentWorkerPool(base_env={"PW_PINGID_LOCKFILE": str(run_root / "pingid.lock")})
+
+    aggregate = LiveAggregate()
+    events = EventServer(aggregate.handle)
+    watchdog = None
+    watchdog_cfg = runner_cfg.get("watchdog", {}) or {}
+    if watchdog_cfg.get("enable", False):
+        watchdog = Watchdog(
+            events,
+            aggregate,
+            sheet_deadline=float(watchdog_cfg.get("sheet_deadline", 1800)),
+            no_progress_timeout=float(watchdog_cfg.get("no_progress_timeout", 600)),
+            diagnostics_timeout=float(watchdog_cfg.get("diagnostics_timeout", 20)),
+        )
+    return pool, aggregate, events, watchdog
+
+
+def _stop_runtime(pool: Optional[PersistentWorkerPool], events: EventServer, watchdog: Optional[Watchdog]) -> None:
+    """Author: taobo.zhou
+    关闭看门狗、常驻 worker 池与事件服务。
+    
+        pool: 常驻 worker 池，可为空。
+        events: 事件服务。
+        watchdog: 看门狗，可为空。
+    """
+
+    if watchdog is not None:
+        watchdog.close()
+    if pool is not None:
+        pool.close()
+    events.close()
+
+
+def _plan_items(plan: Dict[str, int], history: DurationHistory, workers: int) -> Tuple[List[WorkItem], float]:
+    """Author: taobo.zhou
+    按历史耗时最长优先排列 sheet，展开为工作项列表并返回预测总时长。
+    
+        plan: sheet 名称到起始尝试序号的映射。
+        history: sheet 历史耗时索引。
+        workers: 并发槽位数量。
+    """
+
+    ordered_sheets, makespan = plan_longest_first(history.estimates(list(plan)), workers)
+    log.info(
+        "[PW][PLAN] workers=%s order=%s predicted_makespan=%.1fs",
+        workers,
+        ordered_sheets,
+        makespan,
+    )
+    cases = _collect_cases()
+    items = [
+        WorkItem(sheet=sheet, case=case, attempt=plan[sheet])
+        for sheet in ordered_sheets
+        for case in cases
+    ]
+    return items, makespan
+
+
+def _complete_run(
+    run_root: Path,
+    plan: Dict[str, int],
+    outcomes: List[ItemOutcome],
+    history: DurationHistory,
+) -> Dict[str, int]:
+    """Author: taobo.zhou
+    记录各 sheet 耗时、合并结果文件，并返回各工作项的最终退出码。
+    
+        run_root: 运行根目录。
+        plan: sheet 名称到起始尝试序号的映射。
+        outcomes: 全部工作项执行结果。
+        history: sheet 历史耗时索引。
+    """
+
+    sheet_durations: Dict[str, float] = {}
+    for outcome in outcomes:
+        sheet = outcome.item.sheet
+        sheet_durations[sheet] = sheet_durations.get(sheet, 0.0) + outcome.duration
+    history.record(sheet_durations)
+
+    returncodes: Dict[str, int] = {}
+    for outcome in sorted(outcomes, key=lambda o: o.item.attempt):
+        returncodes[outcome.item.key] = outcome.returncode
+
+    for sheet in plan:
+        _merge_sheet_results(run_root / sheet, sheet)
+    return returncodes
+
+
+def _execute_run(cfg: dict, run_root: Path, plan: Dict[str, int]) -> Dict[str, int]:
+    """Author: taobo.zhou
+    在运行目录中调度执行计划内的 sheet，合并结果并返回各工作项的最终退出码。
+    
+        cfg: 配置字典。
+        run_root: 运行根目录。
+        plan: sheet 名称到起始尝试序号的映射。
+    """
+
+    runner_cfg = cfg.get("runner", {}) or {}
+    max_workers = int(runner_cfg.get("max_workers", 1))
+    project_root = Path(cfg.get("_project_root", "."))
+
+    for sheet in plan:
         sheet_dir = run_root / sheet
         _ensure_dir(sheet_dir / "screenshots")
         _ensure_dir(sheet_dir / "reports")
 
-    returncodes = {}
-    with ThreadPoolExecutor(max_workers=max_workers) as executor:
-        futures = {
-            executor.submit(_run_sheet, sheet, run_root / sheet, run_root): sheet
-            for sheet in sheet_names
-        }
-        for future in as_completed(futures):
-            sheet = futures[future]
+    policy = load_retry_policy()
+    pool, aggregate, events, watchdog = _start_runtime(runner_cfg, run_root)
+
+    def _run_and_track(item: WorkItem, slot: int) -> ItemOutcome:
+        """Author: taobo.zhou
+        执行工作项并更新实时进度。
+        
+            item: 工作项。
+            slot: worker 槽位编号。
+        """
+
+        try:
+            return _run_item(item, run_root, slot, pool, events, aggregate, watchdog)
+        finally:
+            aggregate.item_finished()
+
+    def _requeue(outcome: ItemOutcome) -> bool:
+        """Author: taobo.zhou
+        判断是否重跑并同步进度中的工作项总数。
+        
+            outcome: 工作项执行结果。
+        """
+
+        if _should_requeue(outcome, policy):
+            aggregate.add_items(1)
+            return True
+        return False
+
+    concurrency = None
+    adaptive_cfg = runner_cfg.get("adaptive", {}) or {}
+    if adaptive_cfg.get("enable", False):
+        concurrency = AdaptiveConcurrency(
+            max_workers=max_workers,
+            min_workers=int(adaptive_cfg.get("min_workers", 1)),
+            min_free_memory_mb=float(adaptive_cfg.get("min_free_memory_mb", 1536)),
+            memory_per_worker_mb=float(adaptive_cfg.get("memory_per_worker_mb", 700)),
+            max_cpu_percent=float(adaptive_cfg.get("max_cpu_percent", 85)),
+            sample_interval=float(adaptive_cfg.get("sample_interval", 2)),
+            start_interval=float(adaptive_cfg.get("start_interval", 10)),
+        )
+
+    scheduler = WorkQueueScheduler(
+        run_item=_run_and_track,
+        max_workers=max_workers,
+        should_retry=_requeue,
+        admit=concurrency.admit if concurrency is not None else None,
+    )
+    history = DurationHistory(project_root / "output" / "runs")
+    items, makespan = _plan_items(plan, history, max_workers)
+    for item in items:
+        scheduler.submit(item)
+    aggregate.add_items(len(items))
+
+    run_started = time.time()
+    try:
+        outcomes = scheduler.run()
+    finally:
+        _stop_runtime(pool, events, watchdog)
+    log.info(
+        "[PW][PLAN] actual_makespan=%.1fs predicted_makespan=%.1fs",
+        time.time() - run_started,
+        makespan,
+    )
+
+    if concurrency is not None:
+        _write_concurrency_summary(run_root, concurrency.summary())
+    return _complete_run(run_root, plan, outcomes, history)
+
+
+def _coordinator_authkey(cfg: dict, generate: bool = False) -> bytes:
+    """Author: taobo.zhou
+    返回协调器连接密钥，环境变量 PW_COORDINATOR_AUTHKEY 优先于配置；拒绝旧版本公开的默认密钥。
+    未配置时协调器（generate=True）生成随机密钥并输出到日志，agent 需设置相同的环境变量。
+    
+        cfg: 配置字典。
+        generate: 未配置时是否生成随机密钥。
+    """
+
+    coord_cfg = (cfg.get("runner", {}) or {}).get("coordinator", {}) or {}
+    key = os.environ.get("PW_COORDINATOR_AUTHKEY") or str(coord_cfg.get("authkey") or "")
+    if key.encode("utf-8") == PUBLIC_AUTHKEY:
+        raise RuntimeError("协调器密钥不能使用公开的默认值 robot_test_coordinator，请设置环境变量 PW_COORDINATOR_AUTHKEY")
+    if not key:
+        if not generate:
+            raise RuntimeError("未设置协调器密钥：请将环境变量 PW_COORDINATOR_AUTHKEY 设置为协调器启动时输出的密钥")
+        key = secrets.token_urlsafe(24)
+        log.warning("[PW][COORD] generated authkey, start agents with: PW_COORDINATOR_AUTHKEY=%s", key)
+    return key.encode("utf-8")
+
+
+def _save_agent_result(run_root: Path, item: WorkItem, msg: dict) -> ItemOutcome:
+    """Author: taobo.zhou
+    保存 agent 回传的结果与截图到运行目录，返回工作项执行结果。
+    
+        run_root: 运行根目录。
+        item: 工作项。
+        msg: agent 回传的结果请求。
+    """
+
+    data = msg.get("outcome") or {}
+    returncode = int(data.get("returncode", 1))
+    duration = float(data.get("duration") or 0.0)
+    payload = msg.get("payload")
+    if not payload:
+        return ItemOutcome(
+            item=item,
+            returncode=returncode,
+            status="ERROR",
+            error=data.get("error") or f"agent returned no results rc={returncode}",
+            duration=duration,
+        )
+
+    run_dir = run_root / item.sheet
+    shots = msg.get("screenshots") or {}
+    for result in payload.get("results", []):
+        name = Path(str(result.get("screenshot") or "")).name
+        if name and name in shots:
+            dest = run_dir / "screenshots" / name
+            _ensure_dir(dest.parent)
+            dest.write_bytes(base64.b64decode(shots[name]))
+            result["screenshot"] = str(dest)
+
+    results_path = _item_results_path(run_dir, item)
+    _ensure_dir(results_path.parent)
+    with results_path.open("w", encoding="utf-8") as f:
+        json.dump(payload, f, ensure_ascii=False, indent=2)
+    status, error = _worst_status(payload)
+    return ItemOutcome(item=item, returncode=returncode, status=status, error=error, duration=duration)
+
+
+def _execute_distributed(cfg: dict, run_root: Path, plan: Dict[str, int], listen: str) -> Dict[str, int]:
+    """Author: taobo.zhou
+    以协调器模式执行：工作项放入协调器队列，由任意数量的 agent 拉取执行并回传结果。
+    
+        cfg: 配置字典。
+        run_root: 运行根目录。
+        plan: sheet 名称到起始尝试序号的映射。
+        listen: 监听地址，host:port 或 Unix socket 路径。
+    """
+
+    runner_cfg = cfg.get("runner", {}) or {}
+    coord_cfg = runner_cfg.get("coordinator", {}) or {}
+    project_root = Path(cfg.get("_project_root", "."))
+
+    for sheet in plan:
+        sheet_dir = run_root / sheet
+        _ensure_dir(sheet_dir / "screenshots")
+        _ensure_dir(sheet_dir / "reports")
+
+    policy = load_retry_policy()
+    coordinator = Coordinator(
+        parse_address(listen),
+        _coordinator_authkey(cfg, generate=True),
+        run_name=run_root.name,
+        lease_timeout=float(coord_cfg.get("lease_timeout", 60)),
+        heartbeat_interval=float(coord_cfg.get("heartbeat_interval", 10)),
+        max_lease_losses=int(coord_cfg.get("max_lease_losses", 2)),
+        should_retry=lambda outcome: _should_requeue(outcome, policy),
+        on_result=lambda item, msg: _save_agent_result(run_root, item, msg),
+    )
+    log.info("[PW][COORD] listening on %s run=%s", coordinator.address, run_root.name)
+
+    history = DurationHistory(project_root / "output" / "runs")
+    items, _ = _plan_items(plan, history, int(runner_cfg.get("max_workers", 1)))
+    for item in items:
+        coordinator.submit(item)
+
+    run_started = time.time()
+    try:
+        outcomes = coordinator.wait()
+    finally:
+        coordinator.close()
+    log.info("[PW][COORD] all items finished in %.1fs", time.time() - run_started)
+    return _complete_run(run_root, plan, outcomes, history)
+
+
+def _run_agent(cfg: dict, address: str, run_item: Optional[Callable[..., ItemOutcome]] = None) -> int:
+    """Author: taobo.zhou
+    agent 模式：向协调器注册，循环租用工作项在本机执行，心跳续约并回传结果。
+    
+        cfg: 配置字典。
+        address: 协调器地址，host:port 或 Unix socket 路径。
+        run_item: 执行单个工作项的函数（参数同 _run_item），为空时使用 _run_item。
+    """
+
+    run_item = run_item or _run_item
+    runner_cfg = cfg.get("runner", {}) or {}
+    project_root = Path(cfg.get("_project_root", "."))
+    slots = max(1, int(runner_cfg.get("max_workers", 1)))
+
+    client = CoordinatorClient(parse_address(address), _coordinator_authkey(cfg))
+    host = socket.gethostname()
+    hello = client.request({"op": "register", "host": host, "pid": os.getpid()})
+    if not hello.get("ok"):
+        raise RuntimeError(f"协调器拒绝注册: {hello.get('error')}")
+    agent_id = hello["agent_id"]
+    heartbeat_interval = float(hello.get("heartbeat_interval", 10))
+    safe_host = re.sub(r"[^0-9A-Za-z_.-]+", "_", host)
+    run_root = project_root / "output" / "agents" / f"{hello['run']}_{safe_host}_{os.getpid()}"
+    _ensure_dir(run_root)
+    log.info("[PW][AGENT] %s registered at %s slots=%s run_dir=%s", agent_id, address, slots, run_root)
+
+    pool, aggregate, events, watchdog = _start_runtime(runner_cfg, run_root)
+    active: Dict[str, WorkItem] = {}
+    active_lock = threading.Lock()
+    stop = threading.Event()
+
+    def _heartbeat_loop() -> None:
+        """Author: taobo.zhou
+        定期为持有的租约续约。
+         无。
+        """
+
+        while not stop.wait(heartbeat_interval):
+            with active_lock:
+                lease_ids = list(active)
             try:
-                returncodes[sheet] = future.result()
-            except Exception as exc:
-                log.error("[PW][RUN] sheet=%s failed: %s", sheet, exc)
-                returncodes[sheet] = 1
+                reply = client.request({"op": "heartbeat", "agent_id": agent_id, "leases": lease_ids})
+            except (EOFError, OSError):
+                return
+            for lease_id in reply.get("expired") or []:
+                log.warning("[PW][AGENT] lease %s expired on coordinator", lease_id)
+
+    def _slot_loop(slot: int) -> None:
+        """Author: taobo.zhou
+        单个槽位的租用-执行-回传循环，协调器结束或断开时退出。
+        
+            slot: worker 槽位编号。
+        """
+
+        while True:
+            try:
+                reply = client.request({"op": "lease", "agent_id": agent_id})
+            except (EOFError, OSError):
+                return
+            if not reply.get("ok") or reply.get("done"):
+                return
+            if "wait" in reply:
+                time.sleep(float(reply["wait"]))
+                continue
+
+            item = WorkItem(**reply["item"])
+            lease_id = reply["lease_id"]
+            with active_lock:
+                active[lease_id] = item
+            try:
+                run_dir = run_root / item.sheet
+                _ensure_dir(run_dir / "screenshots")
+                _ensure_dir(run_dir / "reports")
+                try:
+                    outcome = run_item(item, run_root, slot, pool, events, aggregate, watchdog)
+                except Exception as exc:
+                    log.error("[PW][AGENT] item=%s crashed: %s", item.key, exc)
+                    outcome = ItemOutcome(item=item, returncode=1, status="ERROR", error=str(exc))
+
+                payload = None
+                shots: Dict[str, str] = {}
+                results_path = _item_results_path(run_dir, item)
+                if results_path.exists():
+                    with results_path.open("r", encoding="utf-8") as f:
+                        payload = json.load(f)
+                    for result in payload.get("results", []):
+                        shot = Path(str(result.get("screenshot") or ""))
+                        if shot.name and shot.is_file():
+                            shots[shot.name] = base64.b64encode(shot.read_bytes()).decode("ascii")
+                try:
+                    client.request({
+                        "op": "result",
+                        "agent_id": agent_id,
+                        "lease_id": lease_id,
+                        "outcome": {
+                            "returncode": outcome.returncode,
+                            "status": outcome.status,
+                            "error": outcome.error,
+                            "duration": outcome.duration,
+                        },
+                        "payload": payload,
+                        "screenshots": shots,
+                    })
+                except (EOFError, OSError):
+                    return
+            finally:
+                with active_lock:
+                    active.pop(lease_id, None)
+
+    heartbeat = threading.Thread(target=_heartbeat_loop, name="pw-agent-heartbeat", daemon=True)
+    heartbeat.start()
+    threads = [
+        threading.Thread(target=_slot_loop, args=(slot,), name=f"pw-agent-{slot}", daemon=True)
+        for slot in range(slots)
+    ]
+    try:
+        for t in threads:
+            t.start()
+        for t in threads:
+            t.join()
+    finally:
+        stop.set()
+        try:
+            client.request({"op": "bye", "agent_id": agent_id})
+        except (EOFError, OSError):
+            pass
+        client.close()
+        _stop_runtime(pool, events, watchdog)
+    log.info("[PW][AGENT] %s finished", agent_id)
+    return 0
+
+
+def _write_concurrency_summary(run_root: Path, summary: dict) -> None:
+    """Author: taobo.zhou
+    将本次执行达到的并发等统计写入 reports/concurrency.json，续跑时追加到 runs 列表。
+    
+        run_root: 运行根目录。
+        summary: 并发统计字典。
+    """
+
+    path = run_root / "reports" / "concurrency.json"
+    _ensure_dir(path.parent)
+    runs = []
+    if path.exists():
+        try:
+            with path.open("r", encoding="utf-8") as f:
+                runs = list((json.load(f) or {}).get("runs", []))
+        except Exception as exc:
+            log.warning("[PW][CONCURRENCY] bad summary %s, overwrite: %s", path, exc)
+    runs.append({"finished_at": time.strftime("%Y-%m-%d %H:%M:%S"), **summary})
+    with path.open("w", encoding="utf-8") as f:
+        json.dump({"runs": runs}, f, ensure_ascii=False, indent=2)
+    log.info("[PW][CONCURRENCY] %s -> %s", summary, path)
+
+
+def _finalize_run(run_root: Path, sheet_names: List[str], ts: str, send_mail: bool = True) -> Dict[str, int]:
+    """Author: taobo.zhou
+    汇总运行目录中的结果，生成 HTML 报告与截图压缩包并发送邮件，返回统计数据。
+    
+        run_root: 运行根目录。
+        sheet_names: sheet 名称列表。
+        ts: 报告文件名使用的时间戳。
+        send_mail: 是否发送邮件，分片运行时由 merge 命令统一发送。
+    """
 
     results, case_params, counts = _collect_results(run_root, sheet_names)
+    screenshot_zip = _zip_screenshots(run_root, ts)
+    _publish_report(run_root, results, case_params, counts, ts, screenshot_zip, send_mail)
+    return counts
+
+
+def _merge_runs(run_dirs: List[Path], output_root: Path, ts: str) -> Dict[str, int]:
+    """Author: taobo.zhou
+    合并多个分片运行目录的结果，生成一份 HTML 报告、一个截图压缩包并发送一封邮件。
+    
+        run_dirs: 分片运行目录列表。
+        output_root: 合并结果输出目录。
+        ts: 报告文件名使用的时间戳。
+    """
+
+    owners: Dict[str, Path] = {}
+    for run_dir in run_dirs:
+        if not run_dir.is_dir():
+            raise RuntimeError(f"待合并的运行目录不存在: {run_dir}")
+        for sheet in _run_dir_sheets(run_dir):
+            if sheet in owners:
+                log.warning("[PW][MERGE] sheet=%s in both %s and %s, keep the latter", sheet, owners[sheet], run_dir)
+            owners[sheet] = run_dir
+
+    results: List[CaseResult] = []
+    case_params: Dict[str, dict] = {}
+    counts = {"total": 0, "passed": 0, "failed": 0, "error": 0, "skipped": 0}
+    for run_dir in run_dirs:
+        sheets = [sheet for sheet, owner in owners.items() if owner == run_dir]
+        if not sheets:
+            continue
+        dir_results, dir_params, dir_counts = _collect_results(run_dir, sheets)
+        results.extend(dir_results)
+        case_params.update(dir_params)
+        for key, value in dir_counts.items():
+            counts[key] += value
+        log.info("[PW][MERGE] %s sheets=%s counts=%s", run_dir, sheets, dir_counts)
+
+    _ensure_dir(output_root)
+    screenshot_zip = _zip_screenshots(output_root, ts, sources=list(dict.fromkeys(owners.values())))
+    _publish_report(output_root, results, case_params, counts, ts, screenshot_zip, True)
+    return counts
+
+
+def _publish_report(
+    run_root: Path,
+    results: List[CaseResult],
+    case_params: Dict[str, dict],
+    counts: Dict[str, int],
+    ts: str,
+    screenshot_zip: Optional[str],
+    send_mail: bool,
+) -> None:
+    """Author: taobo.zhou
+    生成 HTML 报告并按需发送邮件。
+    
+        run_root: 报告输出的运行根目录。
+        results: 用例结果列表。
+        case_params: 用例参数字典。
+        counts: 统计数据。
+        ts: 报告文件名使用的时间戳。
+        screenshot_zip: 截图压缩包路径。
+        send_mail: 是否发送邮件。
+    """
 
     reports_dir = run_root / "reports"
     _ensure_dir(reports_dir)
@@ -271,7 +1181,9 @@ def main() -> int:
         )
     report_path.write_text(html, encoding="utf-8")
 
-    screenshot_zip = _zip_screenshots(run_root, ts)
+    if not send_mail:
+        log.info("[PW][REPORT] %s written, mail skipped for shard run", report_path)
+        return
     subject = (
         f"Robot 自动化测试报告 | Total={counts['total']} "
         f"Pass={counts['passed']} Fail={counts['failed']} "
@@ -302,6 +1214,163 @@ def main() -> int:
         extra_attachments=None,
     )
 
+
+def _parse_args(argv: Optional[List[str]] = None) -> argparse.Namespace:
+    """Author: taobo.zhou
+    解析命令行参数。
+    
+        argv: 命令行参数列表，为空时读取 sys.argv。
+    """
+
+    parser = argparse.ArgumentParser(description="Robot_Test 自动化测试执行入口")
+    parser.add_argument(
+        "--resume",
+        metavar="RUN_DIR",
+        default=None,
+        help="在已有运行目录中只重跑结果缺失、FAIL 或 ERROR 的 sheet，并重新生成报告",
+    )
+    parser.add_argument(
+        "--rerun-failed",
+        action="store_true",
+        help="同 --resume；未指定 --resume 时使用 output/runs 下最近一次运行",
+    )
+    parser.add_argument(
+        "--shard",
+        metavar="i/N",
+        type=_parse_shard,
+        default=None,
+        help="只运行 N 个分片中的第 i 个（i 从 1 开始），结果由 merge 命令统一汇总与发送邮件",
+    )
+    parser.add_argument(
+        "--shard-by",
+        choices=("hash", "duration"),
+        default="hash",
+        help="hash：按 sheet 名称哈希排序后轮流分配；duration：按 durations.json 历史耗时均衡分配（各主机需共享同一份索引）",
+    )
+    parser.add_argument(
+        "--serve",
+        action="store_true",
+        help="以协调器模式运行：持有工作项队列，由 --agent 进程拉取执行",
+    )
+    parser.add_argument(
+        "--listen",
+        metavar="ADDR",
+        default=None,
+        help="协调器监听地址（host:port 或 Unix socket 路径），默认 runner.coordinator.listen",
+    )
+    parser.add_argument(
+        "--agent",
+        metavar="ADDR",
+        default=None,
+        help="以 agent 模式连接协调器并执行其分配的工作项",
+    )
+    subparsers = parser.add_subparsers(dest="command")
+    merge_parser = subparsers.add_parser("merge", help="合并多个分片运行目录，生成一份报告并发送一封邮件")
+    merge_parser.add_argument("run_dirs", nargs="+", metavar="RUN_DIR", help="分片运行目录")
+    merge_parser.add_argument(
+        "--output",
+        metavar="DIR",
+        default=None,
+        help="合并结果输出目录，默认 output/runs/<时间戳>_merged",
+    )
+    template_parser = subparsers.add_parser(
+        "profile-template", help="访问 project.urls 构建当前浏览器版本的预热 profile 模板"
+    )
+    template_parser.add_argument("--browser", default=None, help="浏览器类型，默认 project.browser")
+    template_parser.add_argument(
+        "--launch-profile",
+        default=None,
+        help="构建时使用的启动配置（无头、窗口大小等），默认 selenium.launch_profile",
+    )
+    bench_parser = subparsers.add_parser(
+        "bench-connection", help="对比不保持连接、Selenium 默认连接与调优后连接的命令往返耗时"
+    )
+    bench_parser.add_argument("--requests", type=int, default=500, help="每种连接发送的命令数")
+    bench_parser.add_argument("--threads", type=int, default=1, help="并发发送命令的线程数")
+    bench_parser.add_argument(
+        "--browser",
+        default=None,
+        help="对真实驱动会话测量（chrome/edge/firefox），默认使用本地假 W3C 端点",
+    )
+    return parser.parse_args(argv)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    """Author: taobo.zhou
+    主入口，执行并汇总自动化测试。
+    
+        argv: 命令行参数列表，为空时读取 sys.argv。
+    """
+
+    args = _parse_args(argv)
+    cfg = load_config()
+
+    ts = _now_ts()
+    project_root = Path(cfg.get("_project_root", "."))
+    runs_root = project_root / "output" / "runs"
+
+    if args.command == "merge":
+        output_root = Path(args.output) if args.output else runs_root / f"{ts}_merged"
+        counts = _merge_runs([Path(p) for p in args.run_dirs], output_root, ts)
+        return 1 if counts["failed"] > 0 or counts["error"] > 0 else 0
+
+    if args.command == "profile-template":
+        info = build_profile_template(args.browser, args.launch_profile)
+        log.info("[PW][DRIVER] profile template ready version=%s path=%s", info["version"], info["path"])
+        return 0
+
+    if args.command == "bench-connection":
+        results = run_benchmark(cfg, args.requests, args.threads, args.browser)
+        for name, r in results.items():
+            log.info(
+                "[PW][BENCH] %-12s requests=%s mean=%.3fms p50=%.3fms p95=%.3fms connections=%s",
+                name,
+                r["requests"],
+                r["mean_ms"],
+                r["p50_ms"],
+                r["p95_ms"],
+                "-" if r["connections"] is None else r["connections"],
+            )
+        return 0
+
+    if args.agent:
+        return _run_agent(cfg, args.agent)
+
+    sheet_names = _load_sheet_names(cfg)
+    send_mail = True
+    if args.shard:
+        index, total = args.shard
+        sheet_names = _select_shard(sheet_names, index, total, args.shard_by, runs_root)
+        send_mail = False
+        log.info("[PW][SHARD] shard=%s/%s by=%s sheets=%s", index, total, args.shard_by, sheet_names)
+
+    if args.resume or args.rerun_failed:
+        run_root = Path(args.resume) if args.resume else _latest_run_dir(runs_root)
+        if run_root is None or not run_root.is_dir():
+            raise RuntimeError(f"待恢复的运行目录不存在: {run_root}")
+        shard_info = _read_shard_info(run_root)
+        if shard_info is not None:
+            sheet_names = [str(sheet) for sheet in shard_info.get("sheets", [])]
+            send_mail = False
+        plan = _resume_plan(run_root, sheet_names)
+        log.info("[PW][RESUME] run_dir=%s rerun=%s", run_root, plan)
+    else:
+        run_root = runs_root / (f"{ts}_shard{args.shard[0]}of{args.shard[1]}" if args.shard else ts)
+        plan = {sheet: 1 for sheet in sheet_names}
+        if args.shard:
+            _write_shard_info(run_root, args.shard[0], args.shard[1], args.shard_by, sheet_names)
+    _ensure_dir(run_root)
+
+    if not plan:
+        returncodes = {}
+    elif args.serve:
+        coord_cfg = (cfg.get("runner", {}) or {}).get("coordinator", {}) or {}
+        listen = args.listen or str(coord_cfg.get("listen", "127.0.0.1:47100"))
+        returncodes = _execute_distributed(cfg, run_root, plan, listen)
+    else:
+        returncodes = _execute_run(cfg, run_root, plan)
+    counts = _finalize_run(run_root, sheet_names, ts, send_mail)
+
     if counts["failed"] > 0 or counts["error"] > 0:
         return 1
     if any(code != 0 for code in returncodes.values()):
@@ -1,18 +1,21 @@
+import os
 from pathlib import Path
 
 import pytest
 from openpyxl import load_workbook
 
+from framework.core.bootstrap import resolve_config_paths
 from framework.core.driver_manager import DriverManager
+from framework.core.session_cache import AuthSessionCache
 from framework.utils.config_loader import load_config
 from framework.utils.excel_loader import load_excel_kv
-from framework.utils.locator_loader import LocatorLoader
+from framework.utils.locator_loader import load_locators
 
 
 def pytest_addoption(parser):
     """Author: taobo.zhou
     注册 pytest 命令行参数。
-
+    
         parser: pytest 参数解析器。
     """
 
@@ -35,41 +38,72 @@ def pytest_addoption(parser):
         default=None,
         help="指定当前进程输出目录",
     )
+    group.addoption(
+        "--pw-attempt",
+        action="store",
+        default=None,
+        help="由调度器指定的尝试序号，设置后进程内不再重跑",
+    )
+    group.addoption(
+        "--pw-results",
+        action="store",
+        default=None,
+        help="指定 results.json 输出路径",
+    )
 
 
 @pytest.fixture(scope="session")
-def config():
+def config(request):
     """Author: taobo.zhou
-    加载并补全全局配置。
-     无。
+    加载并补全全局配置；开启启动引导时等待后台编译好的定位器。
+    
+        request: pytest 请求对象，用于获取启动引导。
     """
 
-    cfg = load_config()
+    bootstrap = getattr(request.config, "_pw_bootstrap", None)
+    if bootstrap is not None:
+        cfg = bootstrap.config
+        cfg["locator_loader"] = bootstrap.wait("locators")
+        return cfg
 
-    project_root = Path(cfg.get("_project_root", "."))
-    if "paths" in cfg and isinstance(cfg["paths"], dict):
-        for k, v in list(cfg["paths"].items()):
-            if isinstance(v, str) and v and not Path(v).is_absolute():
-                cfg["paths"][k] = str((project_root / v).resolve())
+    cfg = resolve_config_paths(load_config())
 
     locator_path = cfg["paths"]["locator"]
-    loader = LocatorLoader(locator_path)
-    loader.validate_all()
-    cfg["locator_loader"] = loader
+    cfg["locator_loader"] = load_locators(locator_path)
 
     return cfg
 
 
 @pytest.fixture(scope="session")
-def driver(config, request):
+def driver_pool(config):
+    """Author: taobo.zhou
+    提供进程内驱动池，会话结束时关闭（常驻 worker 开启复用模式时保留给下一个工作项）。
+    
+        config: 全局配置字典。
+    """
+
+    pool = DriverManager.pool()
+    try:
+        yield pool
+    finally:
+        if os.environ.get("PW_KEEP_DRIVER") != "1" or not DriverManager.reuse_enabled():
+            DriverManager.quit()
+
+
+@pytest.fixture
+def driver(config, driver_pool, request):
     """Author: taobo.zhou
-    初始化浏览器驱动并在会话结束时关闭。
+    每个用例从驱动池借出浏览器驱动，结束时归还；复用模式下归还时原地重置而不是重启浏览器。
     
         config: 全局配置字典。
+        driver_pool: 进程内驱动池。
         request: pytest 请求对象，用于挂载 driver。
     """
 
-    driver = DriverManager.get_driver()
+    bootstrap = getattr(request.config, "_pw_bootstrap", None)
+    if bootstrap is not None:
+        bootstrap.wait("driver")
+    driver = driver_pool.acquire()
     request.session.driver = driver
 
     selenium_cfg = config.get("selenium", {}) or {}
@@ -95,7 +129,18 @@ def driver(config, request):
                 delattr(request.session, "driver")
         except Exception:
             pass
-        DriverManager.quit()
+        driver_pool.release(driver)
+
+
+@pytest.fixture(scope="session")
+def session_cache(config):
+    """Author: taobo.zhou
+    登录态缓存，config.yaml 中 session_cache.enable 为 false 时返回 None。
+    
+        config: 全局配置字典。
+    """
+
+    return AuthSessionCache.from_config(config)
 
 
 def pytest_generate_tests(metafunc):
@@ -138,14 +183,20 @@ def pytest_generate_tests(metafunc):
 
 
 @pytest.fixture
-def case_data(config, sheet_name):
+def case_data(config, sheet_name, request):
     """Author: taobo.zhou
-    读取当前 sheet_name 对应的测试数据。
+    读取当前 sheet_name 对应的测试数据；开启启动引导时使用后台预加载的结果。
     
         config: 全局配置字典。
         sheet_name: Excel sheet 名称。
+        request: pytest 请求对象，用于获取启动引导。
     """
 
+    bootstrap = getattr(request.config, "_pw_bootstrap", None)
+    sheets = bootstrap.wait("excel") if bootstrap is not None else None
+    if sheets and sheet_name in sheets:
+        return dict(sheets[sheet_name])
+
     return load_excel_kv(
         config["paths"]["data"],
         sheet_name,
@@ -5,16 +5,25 @@ import re
 import shutil
 import time
 import zipfile
-from dataclasses import dataclass
+from dataclasses import asdict, dataclass
 from pathlib import Path
 from typing import Dict, List, Optional, Tuple
 import pytest
-import yaml
 
+from framework.core.bootstrap import SessionBootstrap, resolve_config_paths
+from framework.core.case_budget import CaseBudget, CaseBudgetExceeded, set_current_budget
+from framework.core.driver_manager import DriverManager
+from framework.driver.command_profiler import CommandProfiler
+from framework.interactions.wait_engine import WaitStats
+from framework.runner.events import ENV_ADDR, emit_event
+from framework.runner.journal import AttemptJournal
+from framework.runner.watchdog import HeartbeatThread, capture_diagnostics
+from framework.utils.case_metrics import CASE_METRIC_FILES, write_case_metrics
 from framework.utils.config_loader import load_config
 from framework.utils.logger import get_logger
 from framework.utils.html_report import build_html_report
 from framework.utils.mailer import send_report
+from framework.utils.retry_policy import load_retry_policy, should_retry_error
 
 log = get_logger()
 
@@ -52,6 +61,7 @@ class CaseResult:
     nodeid: str
     start_time: str
     end_time: str
+    metrics: Optional[dict] = None
 
 
 def _ensure_dir(p: Path) -> None:
@@ -73,6 +83,18 @@ def _now_ts() -> str:
     return time.strftime("%Y%m%d_%H%M%S")
 
 
+def _fmt_time(ts: Optional[float]) -> str:
+    """Author: taobo.zhou
+    将时间戳格式化为报告显示用字符串。
+    
+        ts: Unix 时间戳，可为空。
+    """
+
+    if not ts:
+        return "-"
+    return time.strftime("%Y-%m-%d %H:%M:%S", time.localtime(ts))
+
+
 def _safe_name(s: str) -> str:
     """Author: taobo.zhou
     将字符串转换为安全的文件名片段。
@@ -195,6 +217,12 @@ def _get_sheet_name(item) -> str:
             return str(item.funcargs["sheet_name"])
     except Exception:
         pass
+    try:
+        params = getattr(item, "callspec", None)
+        if params and "sheet_name" in params.params:
+            return str(params.params["sheet_name"])
+    except Exception:
+        pass
     return "unknown_sheet"
 
 
@@ -226,7 +254,7 @@ def _get_attempt(config, nodeid: str) -> int:
         nodeid: 用例唯一标识。
     """
 
-    return int(config._pw_attempts.get(nodeid, 0)) + 1
+    return int(config._pw_attempts.get(nodeid, config._pw_attempt_base)) + 1
 
 
 def _inc_attempt(config, nodeid: str) -> int:
@@ -237,7 +265,7 @@ def _inc_attempt(config, nodeid: str) -> int:
         nodeid: 用例唯一标识。
     """
 
-    config._pw_attempts[nodeid] = int(config._pw_attempts.get(nodeid, 0)) + 1
+    config._pw_attempts[nodeid] = int(config._pw_attempts.get(nodeid, config._pw_attempt_base)) + 1
     return int(config._pw_attempts[nodeid])
 
 
@@ -250,6 +278,9 @@ def _is_assertion_failure(call):
 
     try:
         excinfo = getattr(call, "excinfo", None)
+        if excinfo and isinstance(excinfo.value, CaseBudgetExceeded):
+            # 预算耗尽属于执行错误，不按回溯文本中的 assert 判为断言失败
+            return False
         if excinfo and isinstance(excinfo.value, AssertionError):
             return True
     except Exception:
@@ -257,6 +288,8 @@ def _is_assertion_failure(call):
 
     try:
         text = str(getattr(call, "longrepr", ""))
+        if "CaseBudgetExceeded" in text:
+            return False
         if "assert " in text or "AssertionError" in text:
             return True
     except Exception:
@@ -265,35 +298,6 @@ def _is_assertion_failure(call):
     return False
 
 
-def _should_retry_error(longrepr: Optional[str], policy: dict) -> bool:
-    """Author: taobo.zhou
-    根据错误信息与策略判断是否允许重跑。
-    
-        longrepr: 错误的详细信息字符串。
-        policy: 重跑策略配置字典。
-    """
-
-    if not longrepr:
-        return False
-
-    text = str(longrepr)
-    text_lower = text.lower()
-    non_retryable = policy.get("non_retryable_keywords") or []
-    for kw in non_retryable:
-        if kw and str(kw).lower() in text_lower:
-            return False
-
-    retryable = policy.get("retryable_keywords") or []
-    if not retryable:
-        return True
-
-    for kw in retryable:
-        if kw and str(kw).lower() in text_lower:
-            return True
-
-    return False
-
-
 def _normalize_status(outc: str) -> str:
     """Author: taobo.zhou
     将 pytest 结果状态标准化为报告状态。
@@ -319,9 +323,9 @@ def pytest_configure(config):
 
     cfg = load_config()
     config._pw_cfg = cfg
-    config._pw_all_attempts: List[AttemptRecord] = []
     config._pw_attempts: Dict[str, int] = {}
     config._pw_final: Dict[str, Tuple[str, int, Optional[str], Optional[str], str]] = {}
+    config._pw_timing: Dict[str, Tuple[float, float]] = {}
     config._pw_rerun_left: Dict[str, int] = {}
     config._pw_case_params: Dict[str, Dict[str, object]] = {}
 
@@ -335,32 +339,118 @@ def pytest_configure(config):
         cfg["paths"]["reports"] = str(rep_dir)
         _ensure_dir(ss_dir)
         _ensure_dir(rep_dir)
-        if ss_dir.exists():
+        if ss_dir.exists() and not config.getoption("--pw-attempt"):
             shutil.rmtree(ss_dir)
             ss_dir.mkdir(parents=True, exist_ok=True)
 
-    rp_path = Path("config") / "retry_policy.yaml"
-    retry_cfg = {}
-    if rp_path.exists():
-        try:
-            with rp_path.open("r", encoding="utf-8") as f:
-                retry_cfg = yaml.safe_load(f) or {}
-        except Exception:
-            retry_cfg = {}
-
-    retry_section = retry_cfg.get("retry", {}) if isinstance(retry_cfg, dict) else {}
-    max_retry = int(retry_section.get("max_retry", 1))
-    policy = {
-        "max_retry": max_retry,
-        "non_retryable_keywords": retry_section.get("non_retryable_keywords") or [],
-        "retryable_keywords": retry_section.get("retryable_keywords") or [],
-    }
+    policy = load_retry_policy()
     config._pw_retry_policy = policy
-    config._pw_default_reruns = max(0, int(max_retry))
+    config._pw_default_reruns = max(0, int(policy["max_retry"]))
+
+    attempt_opt = config.getoption("--pw-attempt")
+    config._pw_attempt_base = 0
+    if attempt_opt:
+        config._pw_attempt_base = max(0, int(attempt_opt) - 1)
+        config._pw_default_reruns = 0
+
+    config._pw_journal = None
+    if not config.getoption("collectonly"):
+        journal_cfg = (cfg.get("runner", {}) or {}).get("journal", {}) or {}
+        rep_dir = Path(cfg.get("paths", {}).get("reports", "output/reports"))
+        config._pw_journal = AttemptJournal(
+            rep_dir / "journal" / f"worker_{os.getpid()}.jsonl",
+            fsync_every=int(journal_cfg.get("fsync_every", 20)),
+            fsync_interval=float(journal_cfg.get("fsync_interval", 2.0)),
+        )
+
+    config._pw_case_metrics: Dict[str, Dict[str, dict]] = {}
+    config._pw_profiler = CommandProfiler.get() if DriverManager.profiler_enabled() else None
+    config._pw_health = DriverManager.health_monitor()
+
+    config._pw_session = None
+    config._pw_heartbeat = None
+    watchdog_cfg = (cfg.get("runner", {}) or {}).get("watchdog", {}) or {}
+    if os.environ.get(ENV_ADDR) and watchdog_cfg.get("enable", False) and not config.getoption("collectonly"):
+        config._pw_heartbeat = HeartbeatThread(
+            interval=float(watchdog_cfg.get("heartbeat_interval", 5)),
+            diagnostics=lambda reason: _capture_watchdog_diagnostics(config, reason),
+        )
+        config._pw_heartbeat.start()
 
     log.info(f"[PW] default reruns for error failures = {config._pw_default_reruns}")
 
 
+def _capture_watchdog_diagnostics(config, reason: str) -> dict:
+    """Author: taobo.zhou
+    响应看门狗命令，采集当前浏览器截图与页面源码。
+    
+        config: pytest 配置对象。
+        reason: 看门狗触发原因。
+    """
+
+    log.error(f"[PW][WATCHDOG] capture diagnostics: {reason}")
+    session = getattr(config, "_pw_session", None)
+    driver = getattr(session, "driver", None)
+    paths = config._pw_cfg.get("paths", {})
+    sheet = config.getoption("--pw-sheet") or "unknown_sheet"
+    return capture_diagnostics(driver, Path(paths.get("screenshots", "output/screenshots")), _safe_name(sheet))
+
+
+def _start_bootstrap(config) -> Optional[SessionBootstrap]:
+    """Author: taobo.zhou
+    按配置 bootstrap 启动会话启动引导，在收集用例的同时后台启动浏览器、加载数据与定位器、预热 PingID。
+    
+        config: pytest 配置对象。
+    """
+
+    boot_cfg = config._pw_cfg.get("bootstrap", {}) or {}
+    if not boot_cfg.get("enable", False) or config.getoption("collectonly"):
+        return None
+    sheet = config.getoption("--pw-sheet")
+    bootstrap = SessionBootstrap(resolve_config_paths(load_config()), [sheet] if sheet else None)
+    return bootstrap.start(
+        driver_pool=DriverManager.pool() if boot_cfg.get("driver", True) else None,
+        warm_pingid=bool(boot_cfg.get("pingid", False)),
+    )
+
+
+def pytest_sessionstart(session):
+    """Author: taobo.zhou
+    记录当前会话，供看门狗采集诊断时获取 driver；开启时启动会话启动引导。
+    
+        session: pytest 会话对象。
+    """
+
+    session.config._pw_session = session
+    session.config._pw_bootstrap = _start_bootstrap(session.config)
+
+
+def pytest_unconfigure(config):
+    """Author: taobo.zhou
+    停止心跳线程、关闭启动引导与尝试日志，确保剩余记录落盘。
+    
+        config: pytest 配置对象。
+    """
+
+    heartbeat = getattr(config, "_pw_heartbeat", None)
+    if heartbeat is not None:
+        heartbeat.stop()
+        config._pw_heartbeat = None
+
+    bootstrap = getattr(config, "_pw_bootstrap", None)
+    if bootstrap is not None:
+        bootstrap.close()
+        config._pw_bootstrap = None
+        # 没有用例借用驱动时 driver_pool 不会清理，这里回收后台预先启动的浏览器
+        if os.environ.get("PW_KEEP_DRIVER") != "1" or not DriverManager.reuse_enabled():
+            DriverManager.quit()
+
+    journal = getattr(config, "_pw_journal", None)
+    if journal is not None:
+        journal.close()
+        config._pw_journal = None
+
+
 def _cache_case_params(item) -> None:
     """Author: taobo.zhou
     缓存当前 sheet 的 case_params 供结果汇总使用。
@@ -392,11 +482,20 @@ def _cache_case_params(item) -> None:
 
 def pytest_runtest_setup(item):
     """Author: taobo.zhou
-    缓存当前 sheet 的 case_params 供结果汇总使用。
+    缓存当前 sheet 的 case_params 供结果汇总使用，开始本用例的时间预算与等待统计；开启命令耗时统计或驱动健康监控时开始记录本用例。
     
         item: pytest 用例项对象。
     """
 
+    profiler = getattr(item.config, "_pw_profiler", None)
+    if profiler is not None:
+        profiler.begin_case(item.nodeid)
+    health = getattr(item.config, "_pw_health", None)
+    if health is not None:
+        health.begin_case()
+    WaitStats.get().begin_case()
+    item._pw_budget = CaseBudget.from_config(item.config._pw_cfg, _get_sheet_name(item), item.nodeid)
+    set_current_budget(item._pw_budget)
     _cache_case_params(item)
 
 
@@ -436,10 +535,18 @@ def pytest_runtest_makereport(item, call):
     item._pw_sheet_name = sheet_name
 
     if rep.when == "setup":
+        item._pw_started_at = time.time()
         item._pw_error = False
         item._pw_error_longrepr = None
         item._pw_call_outcome = None
         item._pw_call_longrepr = None
+        emit_event(
+            "case_started",
+            sheet=sheet_name,
+            nodeid=nodeid,
+            attempt=attempt,
+            start_time=_fmt_time(item._pw_started_at),
+        )
 
     if rep.when == "call":
 
@@ -454,6 +561,7 @@ def pytest_runtest_makereport(item, call):
 
                 driver.save_screenshot(str(ss_path))
                 item._pw_call_screenshot = str(ss_path)
+                emit_event("screenshot_saved", sheet=sheet_name, nodeid=nodeid, attempt=attempt, path=str(ss_path))
 
                 log.info(
                     f"[PW][SS][CALL] browser screenshot captured | "
@@ -524,14 +632,53 @@ def pytest_runtest_makereport(item, call):
             longrepr=lr,
             screenshot_path=ss_path,
         )
-        item.config._pw_all_attempts.append(ar)
         item.config._pw_final[nodeid] = (outc, attempt, lr, ss_path, sheet_name)
+        profiler = getattr(item.config, "_pw_profiler", None)
+        command_summary = profiler.end_case() if profiler is not None else None
+        if command_summary is not None:
+            item.config._pw_case_metrics.setdefault(nodeid, {})["commands"] = {**command_summary, "attempt": attempt}
+        health = getattr(item.config, "_pw_health", None)
+        resources = health.end_case() if health is not None else None
+        if resources is not None:
+            item.config._pw_case_metrics.setdefault(nodeid, {})["resources"] = {**resources, "attempt": attempt}
+        waits = WaitStats.get().end_case()
+        if waits is not None:
+            item.config._pw_case_metrics.setdefault(nodeid, {})["waits"] = {**waits, "attempt": attempt}
+        budget = getattr(item, "_pw_budget", None)
+        set_current_budget(None)
+        if budget is not None:
+            item.config._pw_case_metrics.setdefault(nodeid, {})["budget"] = {**budget.summary(), "attempt": attempt}
+        started_at, ended_at = getattr(item, "_pw_started_at", time.time()), time.time()
+        item.config._pw_timing[nodeid] = (started_at, ended_at)
+        journal = getattr(item.config, "_pw_journal", None)
+        if journal is not None:
+            journal.append({
+                **asdict(ar),
+                "status": _normalize_status(outc),
+                "start_time": _fmt_time(started_at),
+                "end_time": _fmt_time(ended_at),
+                "duration": round(ended_at - started_at, 3),
+                "case_params": item.config._pw_case_params.get(sheet_name),
+            })
+        emit_event(
+            "attempt_finished",
+            sheet=sheet_name,
+            nodeid=nodeid,
+            attempt=attempt,
+            status=_normalize_status(outc),
+            error=lr,
+            screenshot=ss_path,
+            start_time=_fmt_time(started_at),
+            end_time=_fmt_time(ended_at),
+            duration=round(ended_at - started_at, 3),
+            case_params=item.config._pw_case_params.get(sheet_name),
+        )
 
         if outc == "ERROR":
             left = item.config._pw_rerun_left.get(nodeid)
             if left is None:
                 policy = item.config._pw_retry_policy
-                if _should_retry_error(lr, policy):
+                if should_retry_error(lr, policy):
                     item.config._pw_rerun_left[nodeid] = int(item.config._pw_default_reruns)
                 else:
                     item.config._pw_rerun_left[nodeid] = 0
@@ -547,6 +694,9 @@ def pytest_runtestloop(session):
     """
 
     config = session.config
+    if config.getoption("collectonly"):
+        # 交给 pytest 默认实现：只收集不执行（run.py 收集用例时使用）
+        return None
     items = list(session.items)
 
     i = 0
@@ -574,6 +724,7 @@ def pytest_runtestloop(session):
             )
             continue
 
+        emit_event("case_final", sheet=sheet, nodeid=nodeid, attempt=attempt, status=_normalize_status(outc))
         i += 1
 
     return True
@@ -587,6 +738,9 @@ def pytest_sessionfinish(session, exitstatus):
         exitstatus: pytest 退出状态码。
     """
 
+    if session.config.getoption("collectonly"):
+        return
+
     cfg = session.config._pw_cfg
     out_dir = Path(cfg.get("paths", {}).get("reports", "output/reports"))
     _ensure_dir(out_dir)
@@ -600,6 +754,10 @@ def pytest_sessionfinish(session, exitstatus):
 
     for nodeid, (outc, attempt, lr, ss, sheet_name) in session.config._pw_final.items():
         status = _normalize_status(outc)
+        started_at, ended_at = session.config._pw_timing.get(nodeid, (None, None))
+        start_time = _fmt_time(started_at)
+        end_time = _fmt_time(ended_at)
+        duration = round(ended_at - started_at, 3) if started_at and ended_at else None
         results.append(CaseResult(
             case_id=sheet_name,
             sheet=sheet_name,
@@ -609,8 +767,9 @@ def pytest_sessionfinish(session, exitstatus):
             error=lr,
             screenshot=ss,
             nodeid=nodeid,
-            start_time="-",
-            end_time="-",
+            start_time=start_time,
+            end_time=end_time,
+            metrics=session.config._pw_case_metrics.get(nodeid),
         ))
         results_payload.append({
             "case_id": sheet_name,
@@ -621,8 +780,9 @@ def pytest_sessionfinish(session, exitstatus):
             "error": lr,
             "screenshot": ss,
             "nodeid": nodeid,
-            "start_time": "-",
-            "end_time": "-",
+            "start_time": start_time,
+            "end_time": end_time,
+            "duration": duration,
         })
         case_params[sheet_name] = session.config._pw_case_params.get(
             sheet_name,
@@ -647,7 +807,17 @@ def pytest_sessionfinish(session, exitstatus):
         "results": results_payload,
         "case_params": case_params,
     }
-    results_path = out_dir / "results.json"
+    for key, filename in CASE_METRIC_FILES.items():
+        cases = {
+            nodeid: metrics[key]
+            for nodeid, metrics in session.config._pw_case_metrics.items()
+            if key in metrics
+        }
+        write_case_metrics(out_dir / filename, cases)
+
+    results_opt = session.config.getoption("--pw-results")
+    results_path = Path(results_opt) if results_opt else out_dir / "results.json"
+    _ensure_dir(results_path.parent)
     with results_path.open("w", encoding="utf-8") as f:
         json.dump(results_json, f, ensure_ascii=False, indent=2)
 
@@ -8,6 +8,7 @@ def test_automatic_uploading_MBOS(
     sheet_name,
     case_data,
     base_url,
+    session_cache,
 ):
     """Author: taobo.zhou
     执行自动化上传用例。
@@ -17,6 +18,7 @@ def test_automatic_uploading_MBOS(
         sheet_name: 用例数据所在的 sheet 名称。
         case_data: 用例数据字典。
         base_url: 用例对应的基础 URL。
+        session_cache: 登录态缓存，未开启时为 None。
     """
 
     data = case_data
@@ -26,14 +28,7 @@ def test_automatic_uploading_MBOS(
     password = data["login.password"]
 
     page_login = LoginPage(driver, config["locator_loader"])
-    page_login.open(url)
-    page_login.wait_page_ready()
-
-    page_login.wait_visible("next_button"), (
-        "登录页加载失败：next_button 不可见（检查 url / locator / 页面是否可访问）"
-    )
-
-    page_login.login(username, password)
+    page_login.login_with_cache(url, username, password, session_cache)
 
     page = SoftwareContainerPage(driver, config["locator_loader"])
     page.create_version(
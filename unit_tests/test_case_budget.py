@@ -0,0 +1,146 @@
+import pytest
+from selenium.common.exceptions import TimeoutException
+
+from framework.core import case_budget
+from framework.core.case_budget import CaseBudget, CaseBudgetExceeded, budgeted, set_current_budget
+
+
+class FakeTime:
+    """Author: taobo.zhou
+    可控的 time 模块替身，只提供 time()。
+    Controllable stand-in for the time module providing only time().
+    """
+
+    def __init__(self):
+        """Author: taobo.zhou
+        初始化时间。
+         无。
+        """
+
+        self.now = 1000.0
+
+    def time(self):
+        """Author: taobo.zhou
+        返回当前时间。
+         无。
+        """
+
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Author: taobo.zhou
+    将 case_budget 使用的时间替换为可控时间，并在结束时清除当前预算。
+    
+        monkeypatch: pytest monkeypatch。
+    """
+
+    fake = FakeTime()
+    monkeypatch.setattr(case_budget, "time", fake)
+    yield fake
+    set_current_budget(None)
+
+
+def test_from_config_requires_enable_and_prefers_sheet_value():
+    """Author: taobo.zhou
+    未开启或预算 <=0 时不创建预算；sheets 中的值优先于 default。
+     无。
+    """
+
+    cfg = {"runner": {"case_budget": {"enable": True, "default": 100, "sheets": {"slow": 300, "off": 0}}}}
+    assert CaseBudget.from_config({}, "a") is None
+    assert CaseBudget.from_config({"runner": {"case_budget": {"default": 100}}}, "a") is None
+    assert CaseBudget.from_config(cfg, "a").seconds == 100
+    assert CaseBudget.from_config(cfg, "slow").seconds == 300
+    assert CaseBudget.from_config(cfg, "off") is None
+
+
+def test_budgeted_without_budget_keeps_timeout(clock):
+    """Author: taobo.zhou
+    没有当前预算时步骤使用自身超时。
+    
+        clock: 可控时间。
+    """
+
+    with budgeted("Page.wait_visible(button)", 30) as timeout:
+        assert timeout == 30
+
+
+def test_step_clamps_timeout_and_records_usage(clock):
+    """Author: taobo.zhou
+    步骤超时取自身超时与剩余预算的较小值，并记录次数、耗时与是否被截断。
+    
+        clock: 可控时间。
+    """
+
+    budget = CaseBudget(100, "case")
+    set_current_budget(budget)
+    with budgeted("Page.wait_visible(a)", 30) as timeout:
+        assert timeout == 30
+        clock.now += 50
+    with budgeted("Page.wait_visible(b)", 80) as timeout:
+        assert timeout == 50
+        clock.now += 10
+
+    summary = budget.summary()
+    assert summary["used"] == 60
+    assert summary["steps"] == [
+        {"step": "Page.wait_visible(a)", "count": 1, "seconds": 50, "percent": 50.0, "clamped": False},
+        {"step": "Page.wait_visible(b)", "count": 1, "seconds": 10, "percent": 10.0, "clamped": True},
+    ]
+
+
+def test_clamped_timeout_raises_budget_exceeded(clock):
+    """Author: taobo.zhou
+    超时被预算截断且预算耗尽时，无论等待抛出 TimeoutException 还是返回 False，都抛出 CaseBudgetExceeded。
+    
+        clock: 可控时间。
+    """
+
+    budget = CaseBudget(10, "case")
+    with pytest.raises(CaseBudgetExceeded) as excinfo:
+        with budget.step("Page.wait_visible(a)", 30):
+            clock.now += 10
+            raise TimeoutException("not visible")
+    assert isinstance(excinfo.value.__cause__, TimeoutException)
+
+    budget = CaseBudget(10, "case")
+    with pytest.raises(CaseBudgetExceeded):
+        with budget.step("Page.wait_enabled(a)", 30):
+            clock.now += 10
+
+
+def test_unclamped_timeout_is_not_converted(clock):
+    """Author: taobo.zhou
+    步骤自身超时未被截断时，原始 TimeoutException 原样抛出。
+    
+        clock: 可控时间。
+    """
+
+    budget = CaseBudget(100, "case")
+    with pytest.raises(TimeoutException):
+        with budget.step("Page.wait_visible(a)", 5):
+            clock.now += 5
+            raise TimeoutException("not visible")
+    assert budget.remaining() == 95
+
+
+def test_exhausted_budget_fails_next_step_and_nested_steps_count_once(clock):
+    """Author: taobo.zhou
+    预算耗尽后下一个步骤立即失败；嵌套步骤只截断超时，耗时计入外层步骤。
+    
+        clock: 可控时间。
+    """
+
+    budget = CaseBudget(100, "case")
+    with budget.step("Page.outer", 60) as outer:
+        with budget.step("Page.inner", 200) as inner:
+            assert (outer, inner) == (60, 100)
+            clock.now += 20
+    assert [s["step"] for s in budget.summary()["steps"]] == ["Page.outer"]
+
+    clock.now += 80
+    with pytest.raises(CaseBudgetExceeded, match="exhausted before Page.next"):
+        with budget.step("Page.next", 5):
+            pass
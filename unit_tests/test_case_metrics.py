@@ -0,0 +1,52 @@
+import multiprocessing
+
+from framework.utils.case_metrics import load_case_metrics, write_case_metrics
+
+
+def _write_many(path, worker, count):
+    """Author: taobo.zhou
+    子进程入口：逐条写入本 worker 的用例指标。
+    
+        path: 指标文件路径。
+        worker: worker 序号。
+        count: 写入次数。
+    """
+
+    for i in range(count):
+        write_case_metrics(path, {f"w{worker}::case{i}": {"attempt": 1, "value": i}})
+
+
+def test_write_case_metrics_keeps_latest_attempt(tmp_path):
+    """Author: taobo.zhou
+    同一 nodeid 保留尝试序号较大的记录。
+    
+        tmp_path: 临时目录。
+    """
+
+    path = tmp_path / "wait_stats.json"
+    write_case_metrics(path, {"a": {"attempt": 2, "value": "second"}})
+    write_case_metrics(path, {"a": {"attempt": 1, "value": "first"}, "b": {"attempt": 1}})
+
+    assert load_case_metrics(tmp_path) == {
+        "a": {"waits": {"attempt": 2, "value": "second"}},
+        "b": {"waits": {"attempt": 1}},
+    }
+
+
+def test_concurrent_writers_do_not_lose_updates(tmp_path):
+    """Author: taobo.zhou
+    多个进程同时合并写入同一指标文件时不丢失更新。
+    
+        tmp_path: 临时目录。
+    """
+
+    path = tmp_path / "case_budget.json"
+    procs = [multiprocessing.Process(target=_write_many, args=(path, worker, 20)) for worker in range(4)]
+    for proc in procs:
+        proc.start()
+    for proc in procs:
+        proc.join(60)
+        assert proc.exitcode == 0
+
+    assert len(load_case_metrics(tmp_path)) == 80
+    assert not list(tmp_path.glob("*.tmp"))
@@ -0,0 +1,115 @@
+import json
+import multiprocessing
+import os
+import time
+
+import run
+from framework.runner.coordinator import Coordinator
+from framework.runner.scheduler import ItemOutcome, WorkItem
+
+
+AUTHKEY = "unit-test-coordinator-key"
+SHEETS = ["a", "b"]
+CASES = [f"tests/test_case.py::test_case_{i}" for i in range(4)]
+
+
+def _fake_run_item(item, run_root, slot, pool=None, events=None, aggregate=None, watchdog=None):
+    """Author: taobo.zhou
+    代替 _run_item：不启动 pytest，写出与 worker 相同格式的结果文件与截图，写入 agent 自己的运行目录。
+    
+        item: 工作项。
+        run_root: agent 的运行根目录。
+        slot: worker 槽位编号。
+        pool: 常驻 worker 池（不使用）。
+        events: 事件服务（不使用）。
+        aggregate: 实时汇总（不使用）。
+        watchdog: 看门狗（不使用）。
+    """
+
+    time.sleep(0.5)
+    run_dir = run_root / item.sheet
+    shot = run_dir / "screenshots" / f"{item.case.rsplit('_', 1)[1]}.png"
+    shot.write_bytes(b"png")
+    payload = {
+        "sheet": item.sheet,
+        "results": [{
+            "case_id": item.sheet,
+            "sheet": item.sheet,
+            "status": "PASS",
+            "attempt": item.attempt,
+            "error": None,
+            "screenshot": str(shot),
+            "nodeid": f"{item.case}[{item.sheet}]",
+        }],
+        "case_params": {item.sheet: {"sheet_name": item.sheet}},
+    }
+    results_path = run._item_results_path(run_dir, item)
+    results_path.parent.mkdir(parents=True, exist_ok=True)
+    results_path.write_text(json.dumps(payload), encoding="utf-8")
+    return ItemOutcome(item=item, returncode=0, status="PASS", duration=0.5)
+
+
+def _agent_main(project_root, address):
+    """Author: taobo.zhou
+    agent 进程入口。
+    
+        project_root: agent 输出目录的根目录。
+        address: 协调器地址。
+    """
+
+    cfg = {
+        "_project_root": str(project_root),
+        "runner": {"max_workers": 1, "coordinator": {"authkey": AUTHKEY}},
+    }
+    run._run_agent(cfg, address, run_item=_fake_run_item)
+
+
+def test_two_agents_run_each_item_once(tmp_path):
+    """Author: taobo.zhou
+    本机启动协调器与两个 agent 进程：每个工作项只执行一次，两个 agent 都参与，结果与截图回传后合并为各 sheet 的 results.json。
+    
+        tmp_path: 临时目录。
+    """
+
+    run_root = tmp_path / "runs" / "run1"
+    for sheet in SHEETS:
+        (run_root / sheet / "reports").mkdir(parents=True)
+    coordinator = Coordinator(
+        ("127.0.0.1", 0),
+        AUTHKEY.encode("utf-8"),
+        run_name=run_root.name,
+        heartbeat_interval=1,
+        on_result=lambda item, msg: run._save_agent_result(run_root, item, msg),
+    )
+    items = [WorkItem(sheet=sheet, case=case) for sheet in SHEETS for case in CASES]
+    for item in items:
+        coordinator.submit(item)
+
+    host, port = coordinator.address
+    ctx = multiprocessing.get_context("spawn")
+    agents = [ctx.Process(target=_agent_main, args=(tmp_path / f"agent{i}", f"{host}:{port}")) for i in range(2)]
+    try:
+        for agent in agents:
+            agent.start()
+        outcomes = coordinator.wait(poll=1.0)
+    finally:
+        coordinator.close()
+        for agent in agents:
+            agent.join(30)
+            if agent.is_alive():
+                agent.terminate()
+
+    assert all(agent.exitcode == 0 for agent in agents)
+    assert sorted((o.item.sheet, o.item.case) for o in outcomes) == sorted((i.sheet, i.case) for i in items)
+    assert {o.status for o in outcomes} == {"PASS"}
+
+    run._complete_run(run_root, {sheet: 1 for sheet in SHEETS}, outcomes, run.DurationHistory(tmp_path / "runs"))
+    for sheet in SHEETS:
+        payload = json.loads((run_root / sheet / "reports" / "results.json").read_text(encoding="utf-8"))
+        assert payload["counts"]["total"] == len(CASES)
+        assert payload["counts"]["passed"] == len(CASES)
+        for result in payload["results"]:
+            assert result["screenshot"].startswith(str(run_root / sheet / "screenshots"))
+            assert os.path.exists(result["screenshot"])
+    for i in range(2):
+        assert list((tmp_path / f"agent{i}" / "output" / "agents").glob("run1_*/*/reports/attempts/*.json"))
@@ -0,0 +1,57 @@
+from framework.runner.events import LiveAggregate
+
+
+CASE = "tests/test_automatic_uploading_MBOS.py::test_automatic_uploading_MBOS"
+
+
+def _event(kind, sheet, attempt, pid, **fields):
+    """Author: taobo.zhou
+    构造一个 worker 事件，nodeid 带参数化后缀（与 pytest 上报的一致）。
+    
+        kind: 事件类型。
+        sheet: sheet 名称。
+        attempt: 尝试序号。
+        pid: worker 进程号。
+        **fields: 其他字段。
+    """
+
+    return {"kind": kind, "sheet": sheet, "nodeid": f"{CASE}[sheet={sheet}]", "attempt": attempt, "pid": pid, **fields}
+
+
+def test_partial_payload_matches_parametrized_nodeid():
+    """Author: taobo.zhou
+    工作项的 case 不含参数化后缀，仍能匹配 worker 上报的带后缀 nodeid：已完成的尝试保留原状态，进行中的记为 ERROR。
+     无。
+    """
+
+    aggregate = LiveAggregate()
+    aggregate.handle(_event("case_started", "a", 1, 101, start_time="t0"))
+    aggregate.handle(_event("attempt_finished", "a", 1, 101, status="FAIL", error="boom"))
+    aggregate.handle(_event("case_started", "a", 2, 101, start_time="t1"))
+
+    assert aggregate.pids_for("a", 2, CASE) == [101]
+    first = aggregate.partial_payload("a", 1, "worker died", case=CASE, pid=101)
+    assert [(r["status"], r["error"]) for r in first["results"]] == [("FAIL", "boom")]
+    second = aggregate.partial_payload("a", 2, "worker died", case=CASE, pid=101)
+    assert second["counts"]["error"] == 1
+    assert second["results"][0]["nodeid"] == f"{CASE}[sheet=a]"
+    assert second["results"][0]["error"] == "worker died"
+
+
+def test_partial_payload_scoped_to_item_and_worker():
+    """Author: taobo.zhou
+    同一 sheet 中其他用例、其他尝试或其他 worker 的事件不计入该工作项。
+     无。
+    """
+
+    aggregate = LiveAggregate()
+    aggregate.handle(_event("case_started", "a", 1, 101))
+    aggregate.handle(_event("case_started", "b", 1, 102))
+    aggregate.handle({**_event("case_started", "a", 1, 103), "nodeid": "tests/test_other.py::test_other[sheet=a]"})
+
+    assert aggregate.pids_for("a", 1) == [101, 103]
+    assert aggregate.pids_for("a", 1, CASE) == [101]
+    assert aggregate.partial_payload("a", 1, "killed", case=CASE, pid=102) is None
+    assert aggregate.partial_payload("a", 2, "killed", case=CASE) is None
+    payload = aggregate.partial_payload("a", 1, "killed", case=CASE)
+    assert [r["nodeid"] for r in payload["results"]] == [f"{CASE}[sheet=a]"]
@@ -0,0 +1,122 @@
+import json
+
+import run
+from framework.runner.journal import AttemptJournal, merge_journals
+
+
+def _record(sheet, case, attempt, status):
+    """Author: taobo.zhou
+    构造一条尝试日志记录。
+    
+        sheet: sheet 名称。
+        case: 用例序号。
+        attempt: 尝试序号。
+        status: 尝试状态。
+    """
+
+    return {
+        "sheet_name": sheet,
+        "nodeid": f"tests/test_case.py::test_case[{sheet}-{case}]",
+        "attempt": attempt,
+        "status": status,
+        "case_params": {"case": case},
+    }
+
+
+def _write_journal(run_root, sheet, name, records, truncated=False):
+    """Author: taobo.zhou
+    在 sheet 的 reports/journal 下写出一个尝试日志，可选追加一行写了一半的记录。
+    
+        run_root: 运行根目录。
+        sheet: sheet 名称。
+        name: 日志文件名（不含扩展名）。
+        records: 日志记录列表。
+        truncated: 是否追加被截断的行。
+    """
+
+    path = run_root / sheet / "reports" / "journal" / f"{name}.jsonl"
+    journal = AttemptJournal(path)
+    for record in records:
+        journal.append(record)
+    journal.close()
+    if truncated:
+        with path.open("a", encoding="utf-8") as f:
+            f.write('{"nodeid": "tests/test_case.py::test_case[')
+    return path
+
+
+def test_merge_journals_keeps_latest_attempt(tmp_path):
+    """Author: taobo.zhou
+    多个日志中同一 nodeid 保留尝试序号最大的记录，跳过被截断的行。
+    
+        tmp_path: 临时目录。
+    """
+
+    first = _write_journal(tmp_path, "a", "worker1", [
+        _record("a", 1, 1, "FAIL"),
+        _record("a", 2, 1, "PASS"),
+    ])
+    second = _write_journal(tmp_path, "a", "worker2", [_record("a", 1, 2, "PASS")], truncated=True)
+
+    final, case_params = merge_journals([second, first])
+
+    assert {nodeid: (r["attempt"], r["status"]) for nodeid, r in final.items()} == {
+        "tests/test_case.py::test_case[a-1]": (2, "PASS"),
+        "tests/test_case.py::test_case[a-2]": (1, "PASS"),
+    }
+    assert case_params == {"a": {"case": 2}}
+
+
+def test_resume_plan_from_journal_only(tmp_path):
+    """Author: taobo.zhou
+    进程被杀、只有尝试日志时，续跑据日志生成 results.json：失败的 sheet 从最大尝试序号加一开始，全部通过的不重跑。
+    
+        tmp_path: 临时目录。
+    """
+
+    _write_journal(tmp_path, "failed", "worker1", [
+        _record("failed", 1, 1, "ERROR"),
+        _record("failed", 1, 2, "FAIL"),
+        _record("failed", 2, 1, "PASS"),
+    ], truncated=True)
+    _write_journal(tmp_path, "passed", "worker1", [_record("passed", 1, 1, "PASSED")])
+
+    plan = run._resume_plan(tmp_path, ["failed", "passed"])
+
+    assert plan == {"failed": 3}
+    payload = json.loads((tmp_path / "passed" / "reports" / "results.json").read_text(encoding="utf-8"))
+    assert payload["counts"] == {"total": 1, "passed": 1, "failed": 0, "error": 0, "skipped": 0}
+
+
+def test_resume_plan_reruns_missing_and_empty_sheets(tmp_path):
+    """Author: taobo.zhou
+    没有任何结果或结果为空的 sheet 从第 1 次尝试开始重跑。
+    
+        tmp_path: 临时目录。
+    """
+
+    empty = tmp_path / "empty" / "reports" / "results.json"
+    empty.parent.mkdir(parents=True)
+    empty.write_text(json.dumps({"sheet": "empty", "results": []}), encoding="utf-8")
+
+    assert run._resume_plan(tmp_path, ["never_started", "empty"]) == {"never_started": 1, "empty": 1}
+
+
+def test_resume_plan_prefers_newer_attempt_file(tmp_path):
+    """Author: taobo.zhou
+    尝试结果文件中的更新尝试覆盖日志中的旧记录，重跑通过后该 sheet 不再续跑。
+    
+        tmp_path: 临时目录。
+    """
+
+    _write_journal(tmp_path, "a", "worker1", [_record("a", 1, 1, "FAIL")])
+    attempt = tmp_path / "a" / "reports" / "attempts" / "attempt2.json"
+    attempt.parent.mkdir(parents=True)
+    attempt.write_text(json.dumps({"results": [{
+        "sheet": "a",
+        "nodeid": "tests/test_case.py::test_case[a-1]",
+        "attempt": 2,
+        "status": "PASSED",
+    }]}), encoding="utf-8")
+
+    assert run._resume_plan(tmp_path, ["a"]) == {}
@@ -0,0 +1,110 @@
+import threading
+import time
+
+from framework.runner.scheduler import ItemOutcome, WorkItem, WorkQueueScheduler
+
+
+def test_scheduler_runs_every_item_once_within_max_workers():
+    """Author: taobo.zhou
+    空闲槽位拉取工作项，每项只执行一次，同时执行的数量不超过 max_workers。
+     无。
+    """
+
+    lock = threading.Lock()
+    running = [0, 0]
+    seen = []
+
+    def run_item(item, slot):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+            seen.append((item.key, slot))
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return ItemOutcome(item=item, returncode=0, status="PASS")
+
+    scheduler = WorkQueueScheduler(run_item, max_workers=3)
+    items = [WorkItem(sheet=f"s{i}", case=None) for i in range(10)]
+    for item in items:
+        scheduler.submit(item)
+    outcomes = scheduler.run()
+
+    assert sorted(key for key, _ in seen) == sorted(item.key for item in items)
+    assert running[1] == 3
+    assert {slot for _, slot in seen} == {0, 1, 2}
+    assert all(o.slot in (0, 1, 2) for o in outcomes)
+
+
+def test_scheduler_requeues_retries_with_next_attempt():
+    """Author: taobo.zhou
+    需要重跑的结果以 attempt+1、retries+1 回到同一队列，直到 should_retry 拒绝。
+     无。
+    """
+
+    attempts = []
+
+    def run_item(item, slot):
+        attempts.append((item.sheet, item.attempt, item.retries))
+        status = "ERROR" if item.sheet == "flaky" and item.attempt < 3 else "PASS"
+        return ItemOutcome(item=item, returncode=0 if status == "PASS" else 1, status=status)
+
+    scheduler = WorkQueueScheduler(
+        run_item,
+        max_workers=2,
+        should_retry=lambda outcome: outcome.status == "ERROR" and outcome.item.retries < 5,
+    )
+    scheduler.submit(WorkItem(sheet="flaky", case=None))
+    scheduler.submit(WorkItem(sheet="stable", case=None))
+    outcomes = scheduler.run()
+
+    assert sorted(a for a in attempts if a[0] == "flaky") == [("flaky", 1, 0), ("flaky", 2, 1), ("flaky", 3, 2)]
+    assert [a for a in attempts if a[0] == "stable"] == [("stable", 1, 0)]
+    assert len(outcomes) == 4
+
+
+def test_scheduler_turns_crashes_into_error_outcomes():
+    """Author: taobo.zhou
+    执行回调抛出异常时记为 ERROR，其余工作项继续执行。
+     无。
+    """
+
+    def run_item(item, slot):
+        if item.sheet == "bad":
+            raise RuntimeError("worker exploded")
+        return ItemOutcome(item=item, returncode=0, status="PASS")
+
+    scheduler = WorkQueueScheduler(run_item, max_workers=1)
+    scheduler.submit(WorkItem(sheet="bad", case=None))
+    scheduler.submit(WorkItem(sheet="good", case=None))
+    outcomes = {o.item.sheet: o for o in scheduler.run()}
+
+    assert outcomes["bad"].status == "ERROR"
+    assert outcomes["bad"].error == "worker exploded"
+    assert outcomes["good"].status == "PASS"
+
+
+def test_scheduler_holds_dispatch_until_admitted():
+    """Author: taobo.zhou
+    admit 拒绝时不再派发新项（至少保留一个在执行），放行后继续。
+     无。
+    """
+
+    lock = threading.Lock()
+    running = [0, 0]
+
+    def run_item(item, slot):
+        with lock:
+            running[0] += 1
+            running[1] = max(running[1], running[0])
+        time.sleep(0.05)
+        with lock:
+            running[0] -= 1
+        return ItemOutcome(item=item, returncode=0, status="PASS")
+
+    scheduler = WorkQueueScheduler(run_item, max_workers=4, admit=lambda in_flight: in_flight < 1, admit_poll=0.01)
+    for i in range(4):
+        scheduler.submit(WorkItem(sheet=f"s{i}", case=None))
+
+    assert len(scheduler.run()) == 4
+    assert running[1] == 1
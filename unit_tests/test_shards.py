@@ -0,0 +1,156 @@
+import json
+
+import pytest
+
+import run
+from framework.runner.history import assign_shards
+
+
+ESTIMATES = {"a": 50.0, "b": 40.0, "c": 30.0, "d": 20.0, "e": 10.0, "f": 10.0}
+
+
+def _write_json(path, payload):
+    """Author: taobo.zhou
+    写出 JSON 文件并创建父目录。
+    
+        path: 文件路径。
+        payload: JSON 内容。
+    """
+
+    path.parent.mkdir(parents=True, exist_ok=True)
+    path.write_text(json.dumps(payload), encoding="utf-8")
+
+
+def _write_sheet(run_dir, sheet, statuses):
+    """Author: taobo.zhou
+    在运行目录下写出一个 sheet 的 results.json。
+    
+        run_dir: 分片运行目录。
+        sheet: sheet 名称。
+        statuses: 各用例状态列表。
+    """
+
+    results = [
+        {"case_id": sheet, "sheet": sheet, "status": status, "attempt": 1, "nodeid": f"{sheet}::case{i}"}
+        for i, status in enumerate(statuses)
+    ]
+    _write_json(run_dir / sheet / "reports" / "results.json", {"sheet": sheet, "results": results})
+
+
+def test_assign_shards_is_balanced_and_complete():
+    """Author: taobo.zhou
+    LPT 分配后每个 sheet 恰好出现一次，各分片负载均衡。
+     无。
+    """
+
+    buckets = assign_shards(ESTIMATES, 3)
+    assert buckets == [["a", "f"], ["b", "e"], ["c", "d"]]
+    assert sorted(sheet for bucket in buckets for sheet in bucket) == sorted(ESTIMATES)
+    loads = [sum(ESTIMATES[s] for s in bucket) for bucket in buckets]
+    assert max(loads) - min(loads) <= 10.0
+
+
+def test_assign_shards_is_deterministic():
+    """Author: taobo.zhou
+    输入顺序不同时分配结果一致，保证各主机独立计算出同一份分片。
+     无。
+    """
+
+    reordered = dict(reversed(list(ESTIMATES.items())))
+    assert assign_shards(reordered, 3) == assign_shards(ESTIMATES, 3)
+    assert assign_shards({"x": 1.0, "y": 1.0, "z": 1.0}, 2) == [["x", "z"], ["y"]]
+
+
+def test_assign_shards_edge_counts():
+    """Author: taobo.zhou
+    分片数多于 sheet 时多余分片为空；分片数不大于 0 时视为 1。
+     无。
+    """
+
+    assert assign_shards({"a": 1.0}, 3) == [["a"], [], []]
+    assert assign_shards(ESTIMATES, 0) == [["a", "b", "c", "d", "e", "f"]]
+    assert assign_shards({}, 2) == [[], []]
+
+
+def test_select_shard_keeps_excel_order(tmp_path):
+    """Author: taobo.zhou
+    按名称哈希分片时各分片不重叠、合起来覆盖全部 sheet，且保持原始顺序。
+    
+        tmp_path: 临时目录。
+    """
+
+    sheets = ["s1", "s2", "s3", "s4", "s5"]
+    parts = [run._select_shard(sheets, i, 2, "hash", tmp_path) for i in (1, 2)]
+    assert sorted(parts[0] + parts[1]) == sheets
+    assert all(part == [s for s in sheets if s in part] for part in parts)
+
+
+@pytest.fixture
+def sent(monkeypatch):
+    """Author: taobo.zhou
+    替换 send_report，记录发送内容而不真正发送邮件。
+    
+        monkeypatch: pytest monkeypatch。
+    """
+
+    calls = []
+    monkeypatch.setattr(run, "send_report", lambda **kwargs: calls.append(kwargs))
+    return calls
+
+
+def test_merge_runs_aggregates_shards(tmp_path, sent):
+    """Author: taobo.zhou
+    merge 汇总各分片的结果并发送一封邮件；同一 sheet 出现在多个分片时保留后者。
+    
+        tmp_path: 临时目录。
+        sent: send_report 调用记录。
+    """
+
+    shard1, shard2 = tmp_path / "shard1of2", tmp_path / "shard2of2"
+    _write_json(shard1 / "reports" / "shard.json", {"shard": 1, "of": 2, "sheets": ["a", "b"]})
+    _write_sheet(shard1, "a", ["PASSED", "FAILED"])
+    _write_sheet(shard1, "b", ["PASSED"])
+    (shard1 / "a" / "screenshots").mkdir()
+    (shard1 / "a" / "screenshots" / "case0.png").write_bytes(b"png")
+    # 分片 2 没有 shard.json，按 results.json 推断，且重跑了 b
+    _write_sheet(shard2, "b", ["ERROR"])
+    _write_sheet(shard2, "c", ["SKIPPED", "PASSED"])
+
+    output = tmp_path / "merged"
+    counts = run._merge_runs([shard1, shard2], output, "ts")
+
+    assert counts == {"total": 5, "passed": 2, "failed": 1, "error": 1, "skipped": 1}
+    assert (output / "reports" / "report_ts.html").exists()
+    assert len(sent) == 1
+    assert sent[0]["pytest_results"]["total"] == 5
+    assert sorted(d["sheet"] for d in sent[0]["pytest_results"]["details"]) == ["a", "a", "b", "c", "c"]
+    assert sent[0]["screenshot_zip"] == str(output / "reports" / "screenshots_ts.zip")
+
+
+def test_merge_runs_counts_missing_results_as_error(tmp_path, sent):
+    """Author: taobo.zhou
+    shard.json 中列出但没有 results.json 的 sheet 计为一个 ERROR。
+    
+        tmp_path: 临时目录。
+        sent: send_report 调用记录。
+    """
+
+    shard = tmp_path / "shard1of1"
+    _write_json(shard / "reports" / "shard.json", {"shard": 1, "of": 1, "sheets": ["a", "missing"]})
+    _write_sheet(shard, "a", ["PASSED"])
+
+    counts = run._merge_runs([shard], tmp_path / "merged", "ts")
+    assert counts == {"total": 2, "passed": 1, "failed": 0, "error": 1, "skipped": 0}
+
+
+def test_merge_runs_rejects_missing_dir(tmp_path, sent):
+    """Author: taobo.zhou
+    待合并目录不存在时报错且不发送邮件。
+    
+        tmp_path: 临时目录。
+        sent: send_report 调用记录。
+    """
+
+    with pytest.raises(RuntimeError):
+        run._merge_runs([tmp_path / "nope"], tmp_path / "merged", "ts")
+    assert sent == []
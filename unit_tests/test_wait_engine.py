@@ -0,0 +1,200 @@
+import itertools
+
+import pytest
+from selenium.common.exceptions import NoSuchElementException, TimeoutException
+
+from framework.interactions import wait_engine
+from framework.interactions.wait_engine import WaitPolicy, WaitStats, count_poll, poll_until, recorded_wait
+
+
+POLICY = WaitPolicy(timeout=1.0, initial=0.05, factor=2.0, max_interval=0.3)
+
+
+class FakeClock:
+    """Author: taobo.zhou
+    可控时钟，sleep 只推进时间不真正等待。
+    Fake clock whose sleep advances time without blocking.
+    """
+
+    def __init__(self):
+        """Author: taobo.zhou
+        初始化时钟。
+         无。
+        """
+
+        self.now = 0.0
+        self.sleeps = []
+
+    def monotonic(self):
+        """Author: taobo.zhou
+        返回当前时间。
+         无。
+        """
+
+        return self.now
+
+    def sleep(self, seconds):
+        """Author: taobo.zhou
+        记录并推进时间。
+        
+            seconds: 等待秒数。
+        """
+
+        self.sleeps.append(seconds)
+        self.now += seconds
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    """Author: taobo.zhou
+    将 wait_engine 使用的时间函数替换为可控时钟。
+    
+        monkeypatch: pytest monkeypatch。
+    """
+
+    fake = FakeClock()
+    monkeypatch.setattr(wait_engine.time, "monotonic", fake.monotonic)
+    monkeypatch.setattr(wait_engine.time, "sleep", fake.sleep)
+    return fake
+
+
+@pytest.fixture
+def stats(monkeypatch):
+    """Author: taobo.zhou
+    使用独立的 WaitStats 单例并开始一个用例。
+    
+        monkeypatch: pytest monkeypatch。
+    """
+
+    instance = WaitStats()
+    monkeypatch.setattr(WaitStats, "_instance", instance)
+    instance.begin_case()
+    return instance
+
+
+def test_merged_without_override_returns_same_policy():
+    """Author: taobo.zhou
+    未配置 wait 时返回原策略。
+     无。
+    """
+
+    assert POLICY.merged(None) is POLICY
+    assert POLICY.merged({}) is POLICY
+
+
+def test_merged_casts_known_keys_and_ignores_others():
+    """Author: taobo.zhou
+    wait 覆盖项转换为浮点数，未知键被忽略。
+     无。
+    """
+
+    merged = POLICY.merged({"timeout": "5", "max_interval": 1, "unknown": 3})
+    assert merged == WaitPolicy(timeout=5.0, initial=0.05, factor=2.0, max_interval=1.0)
+    assert isinstance(merged.timeout, float)
+
+
+def test_intervals_grow_geometrically_up_to_max():
+    """Author: taobo.zhou
+    轮询间隔从 initial 开始按 factor 增长，不超过 max_interval。
+     无。
+    """
+
+    assert list(itertools.islice(POLICY.intervals(), 5)) == pytest.approx([0.05, 0.1, 0.2, 0.3, 0.3])
+
+
+def test_intervals_start_capped_and_constant_with_factor_one():
+    """Author: taobo.zhou
+    initial 大于 max_interval 时从 max_interval 开始；factor 为 1 时间隔不变。
+     无。
+    """
+
+    capped = WaitPolicy(timeout=1.0, initial=2.0, factor=2.0, max_interval=0.5)
+    assert list(itertools.islice(capped.intervals(), 3)) == [0.5, 0.5, 0.5]
+    flat = WaitPolicy(timeout=1.0, initial=0.1, factor=1.0, max_interval=0.5)
+    assert list(itertools.islice(flat.intervals(), 3)) == [0.1, 0.1, 0.1]
+
+
+def test_poll_until_returns_first_truthy_value(clock):
+    """Author: taobo.zhou
+    条件返回真值时立即返回该值，之前按退避间隔等待。
+    
+        clock: 可控时钟。
+    """
+
+    values = iter([None, 0, "element"])
+    assert poll_until(lambda: next(values), POLICY) == "element"
+    assert clock.sleeps == pytest.approx([0.05, 0.1])
+
+
+def test_poll_until_ignores_no_such_element(clock):
+    """Author: taobo.zhou
+    条件抛出 NoSuchElementException 视为未满足，其他异常直接抛出。
+    
+        clock: 可控时钟。
+    """
+
+    calls = []
+
+    def condition():
+        calls.append(1)
+        if len(calls) < 3:
+            raise NoSuchElementException("missing")
+        return True
+
+    assert poll_until(condition, POLICY) is True
+    assert len(calls) == 3
+    with pytest.raises(ValueError):
+        poll_until(lambda: int("x"), POLICY)
+
+
+def test_poll_until_times_out_with_poll_count(clock):
+    """Author: taobo.zhou
+    超时抛出 TimeoutException 并附带轮询次数，最后一次等待不超过剩余时间。
+    
+        clock: 可控时钟。
+    """
+
+    with pytest.raises(TimeoutException) as excinfo:
+        poll_until(lambda: False, POLICY, timeout=0.5, message="button")
+    # 0.05 + 0.1 + 0.2 = 0.35，剩余 0.15 小于下一个间隔 0.3
+    assert clock.sleeps == pytest.approx([0.05, 0.1, 0.2, 0.15])
+    assert clock.now == pytest.approx(0.5)
+    assert "button (timeout 0.5s, 5 polls)" in excinfo.value.msg
+
+
+def test_recorded_wait_counts_polls_and_timeouts(clock, stats):
+    """Author: taobo.zhou
+    recorded_wait 统计轮询次数、耗时与超时次数，嵌套等待计入外层步骤。
+    
+        clock: 可控时钟。
+        stats: WaitStats 实例。
+    """
+
+    with recorded_wait("Page.click(button)") as outcome:
+        values = iter([False, True])
+        with recorded_wait("Page.find(button)") as inner:
+            outcome["ok"] = poll_until(lambda: next(values), POLICY)
+        assert inner == {}
+    with recorded_wait("Page.click(button)"):
+        count_poll()
+        clock.sleep(0.2)
+
+    summary = stats.end_case()
+    assert summary["count"] == 2
+    assert summary["polls"] == 3
+    assert summary["seconds"] == pytest.approx(0.25)
+    assert summary["steps"] == {
+        "Page.click(button)": {"count": 2, "polls": 3, "seconds": 0.25, "max": 0.2, "timeouts": 1},
+    }
+
+
+def test_wait_stats_ignores_waits_outside_case(stats):
+    """Author: taobo.zhou
+    用例之外的等待不统计，没有等待时 end_case 返回 None。
+    
+        stats: WaitStats 实例。
+    """
+
+    assert stats.end_case() is None
+    stats.record("Page.find(button)", polls=1, seconds=0.1, ok=True)
+    assert stats.end_case() is None
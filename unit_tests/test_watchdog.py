@@ -0,0 +1,86 @@
+import os
+import subprocess
+import sys
+import time
+
+from framework.runner.events import EventServer, LiveAggregate
+from framework.runner.watchdog import Watchdog
+from framework.utils.config_loader import PROJECT_ROOT
+
+
+HUNG_WORKER = """
+import sys
+import time
+from pathlib import Path
+
+from framework.runner.watchdog import HeartbeatThread, touch_progress
+
+
+def diagnostics(reason):
+    Path(sys.argv[1]).write_text(reason, encoding="utf-8")
+    return {"screenshot": sys.argv[1]}
+
+
+HeartbeatThread(0.5, diagnostics).start()
+while True:
+    if sys.argv[2] == "busy":
+        touch_progress()
+    time.sleep(0.1)
+"""
+
+
+def _run_watched(tmp_path, mode, sheet_deadline, no_progress_timeout):
+    """Author: taobo.zhou
+    启动一个发送心跳的 worker 进程并交给看门狗监控，等待其被结束，返回触发原因与诊断标记文件。
+    
+        tmp_path: 临时目录。
+        mode: busy 表示持续有进展，idle 表示心跳进度不变。
+        sheet_deadline: 工作项截止时间（秒）。
+        no_progress_timeout: 无进展超时（秒）。
+    """
+
+    aggregate = LiveAggregate()
+    events = EventServer(aggregate.handle)
+    watchdog = Watchdog(events, aggregate, sheet_deadline, no_progress_timeout, diagnostics_timeout=10)
+    marker = tmp_path / f"{mode}.diag"
+    env = {**os.environ, **events.env()}
+    proc = subprocess.Popen([sys.executable, "-c", HUNG_WORKER, str(marker), mode], env=env, cwd=str(PROJECT_ROOT))
+    try:
+        watchdog.watch(proc.pid, f"sheet::{mode}")
+        proc.wait(timeout=30)
+        reason = watchdog.unwatch(proc.pid)
+    finally:
+        if proc.poll() is None:
+            proc.kill()
+        watchdog.close()
+        events.close()
+    return reason, marker
+
+
+def test_watchdog_kills_worker_without_progress(tmp_path):
+    """Author: taobo.zhou
+    心跳仍在但进度不变的 worker 超过 no_progress_timeout 后先采集诊断再被结束。
+    
+        tmp_path: 临时目录。
+    """
+
+    started = time.time()
+    reason, marker = _run_watched(tmp_path, "idle", sheet_deadline=0, no_progress_timeout=2)
+
+    assert reason.startswith("watchdog: no progress")
+    assert "sheet::idle" in reason
+    assert marker.read_text(encoding="utf-8") == reason
+    assert time.time() - started < 20
+
+
+def test_watchdog_deadline_applies_to_busy_worker(tmp_path):
+    """Author: taobo.zhou
+    持续有进展的 worker 不会因无进展被结束，但超过 sheet_deadline 时仍被结束。
+    
+        tmp_path: 临时目录。
+    """
+
+    reason, marker = _run_watched(tmp_path, "busy", sheet_deadline=4, no_progress_timeout=2)
+
+    assert reason.startswith("watchdog: deadline 4s exceeded")
+    assert marker.exists()
@@ -0,0 +1,58 @@
+import os
+import threading
+from multiprocessing.connection import Listener
+
+from framework.runner import worker
+
+
+ENV_TEST = """
+import json
+import os
+
+
+def test_env():
+    with open(os.environ["PW_TEST_OUT"], "a", encoding="utf-8") as f:
+        f.write(json.dumps([os.environ.get("PW_ITEM_A"), os.environ.get("PW_ITEM_B")]) + "\\n")
+"""
+
+
+def test_worker_runs_items_with_isolated_env(tmp_path, monkeypatch):
+    """Author: taobo.zhou
+    常驻 worker 在同一进程内依次执行多个工作项，每项的环境变量只在本次 pytest.main 内生效。
+    
+        tmp_path: 临时目录。
+        monkeypatch: pytest monkeypatch。
+    """
+
+    (tmp_path / "test_env.py").write_text(ENV_TEST, encoding="utf-8")
+    (tmp_path / "pytest.ini").write_text("[pytest]\n", encoding="utf-8")
+    out = tmp_path / "out.jsonl"
+    authkey = os.urandom(16)
+    listener = Listener(("127.0.0.1", 0), authkey=authkey)
+    host, port = listener.address
+    monkeypatch.setattr(worker, "_prewarm", lambda: None)
+    monkeypatch.setenv("PW_WORKER_ADDR", f"{host}:{port}")
+    monkeypatch.setenv("PW_WORKER_AUTHKEY", authkey.hex())
+    monkeypatch.setenv("PW_KEEP_DRIVER", "1")
+    monkeypatch.setenv("PW_TEST_OUT", str(out))
+
+    thread = threading.Thread(target=worker.worker_main, daemon=True)
+    thread.start()
+    conn = listener.accept()
+    try:
+        assert conn.recv()["op"] == "hello"
+        args = ["-q", "-p", "no:cacheprovider", "-c", str(tmp_path / "pytest.ini"), str(tmp_path / "test_env.py")]
+        replies = []
+        for env in ({"PW_ITEM_A": "a"}, {"PW_ITEM_B": "b"}):
+            conn.send({"op": "run", "args": args, "env": env})
+            replies.append(conn.recv())
+        conn.send({"op": "stop"})
+        thread.join(30)
+    finally:
+        conn.close()
+        listener.close()
+
+    assert replies == [{"op": "done", "rc": 0}, {"op": "done", "rc": 0}]
+    assert out.read_text(encoding="utf-8").splitlines() == ['["a", null]', '[null, "b"]']
+    assert "PW_ITEM_A" not in os.environ
+    assert not thread.is_alive()